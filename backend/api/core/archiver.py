@@ -0,0 +1,47 @@
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Optional
+
+from api.core.db_conection import AsyncSessionLocal
+from api.core.settings import settings
+from api.models.base import now
+from api.repositories.task_archive import TaskArchiveRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def archive_deleted_tasks(
+    older_than_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    pause_seconds: Optional[float] = None,
+    max_batches: Optional[int] = None,
+) -> int:
+    """Arquiva as tarefas excluídas há mais de older_than_days; os parâmetros omitidos vêm das settings TASK_ARCHIVE_*"""
+    if older_than_days is None:
+        older_than_days = settings.TASK_ARCHIVE_AFTER_DAYS
+    before = now() - timedelta(days=older_than_days)
+    async with AsyncSessionLocal() as session:
+        return await TaskArchiveRepository(session).archive(
+            before,
+            batch_size or settings.TASK_ARCHIVE_BATCH_SIZE,
+            settings.TASK_ARCHIVE_PAUSE_SECONDS if pause_seconds is None else pause_seconds,
+            max_batches,
+        )
+
+
+async def archive_loop(interval_seconds: int) -> None:
+    """Roda o arquivamento a cada interval_seconds até ser cancelado (encerramento da aplicação).
+
+    Cancelar no meio de um lote desfaz só esse lote. Com vários workers cada
+    um roda o seu loop; no Postgres os lotes usam SKIP LOCKED e não disputam
+    as mesmas linhas.
+    """
+    while True:
+        try:
+            archived = await archive_deleted_tasks()
+            if archived:
+                logger.info("Arquivamento: %d tarefas movidas para tarefa_arquivo", archived)
+        except Exception:
+            logger.exception("Falha no arquivamento de tarefas; nova tentativa em %ds", interval_seconds)
+        await asyncio.sleep(interval_seconds)
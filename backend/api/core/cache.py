@@ -0,0 +1,72 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from api.core.settings import Settings
+
+settings = Settings()
+
+class TTLCache:
+    """Cache LRU limitado em tamanho, com expiração por entrada.
+
+    O cache é local ao processo: em implantações com vários workers a
+    invalidação vale apenas para o worker que executou a escrita, e o TTL
+    limita por quanto tempo os demais podem servir um valor desatualizado.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= self.timer():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (self.timer() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, predicate: Callable[[Any], bool]) -> None:
+        """Remove as entradas cujo valor satisfaz o predicado"""
+        with self._lock:
+            for key in [key for key, (_, value) in self._data.items() if predicate(value)]:
+                del self._data[key]
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+# Subject do token (email) -> UsuarioPrincipal do usuário autenticado
+user_cache = TTLCache(maxsize=settings.USER_CACHE_MAXSIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+# Id do usuário -> token_version, para as leituras no modo AUTH_CLAIMS_ONLY
+token_version_cache = TTLCache(maxsize=settings.USER_CACHE_MAXSIZE, ttl=settings.AUTH_TOKEN_VERSION_CHECK_SECONDS)
+
+def invalidate_user(user_id) -> None:
+    """Descarta o usuário do cache de autenticação após alterações ou exclusão"""
+    user_cache.invalidate(lambda usuario: str(usuario.id) == str(user_id))
+    token_version_cache.pop(str(user_id))
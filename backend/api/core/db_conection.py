@@ -1,22 +1,100 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from fastapi import Request
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from api.core import metrics
+from api.core.replicas import ReplicaRouter, RoutingSession, connect_replica
+from api.core.pool import AsyncAdaptedQueuePool, PoolGauges, instrumented_pool_class, pool_sizing
 from api.core.settings import Settings
 
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def get_async_database_url(database_url: str) -> str:
+    """Converte a URL síncrona (psycopg2) para o driver assíncrono equivalente"""
+    url = make_url(database_url)
+    drivername = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+def pool_options(settings: Settings) -> dict:
+    """Parâmetros de pool por processo; DB_MAX_CONNECTIONS é dividido entre os WEB_CONCURRENCY workers"""
+    return {
+        **pool_sizing(settings.DB_MAX_CONNECTIONS, settings.WEB_CONCURRENCY, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW),
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+settings = Settings()
+
+# Só scripts e benchmarks usam a engine síncrona: sem pool, para não reservar outra fatia de
+# DB_MAX_CONNECTIONS no primário além da engine assíncrona que atende as requisições
 engine = create_engine(
-    Settings().DATABASE_URL,
-    pool_size=10,            
-    max_overflow=40,
-    pool_timeout=360,
-    pool_recycle=3600,
-    pool_pre_ping=True,
-    connect_args={"options": "-c timezone=America/Sao_Paulo"}
+    settings.DATABASE_URL,
+    poolclass=NullPool,
+    connect_args={"options": "-c timezone=America/Sao_Paulo"},
 )
 
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, "async", settings.DB_POOL_SLOW_CHECKOUT_SECONDS),
+    connect_args={"server_settings": {"timezone": "America/Sao_Paulo"}},
+    **pool_options(settings),
+)
+
+replica_engines = [
+    create_async_engine(
+        get_async_database_url(url.strip()),
+        poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, f"replica-{index}", settings.DB_POOL_SLOW_CHECKOUT_SECONDS),
+        connect_args={"server_settings": {"timezone": "America/Sao_Paulo"}},
+        **pool_options(settings),
+    )
+    for index, url in enumerate(settings.DATABASE_REPLICA_URLS.split(","))
+    if url.strip()
+]
+
+# Engines com pool (instrumentadas em /metrics e /metrics/pool)
+ENGINES = {"async": async_engine.sync_engine}
+ENGINES.update({f"replica-{index}": replica.sync_engine for index, replica in enumerate(replica_engines)})
+
+# Métodos que só leem: com réplicas configuradas, a sessão da requisição lê de uma delas
+READ_METHODS = {"GET", "HEAD"}
+
+replica_router = None
+if replica_engines:
+    replica_router = ReplicaRouter(async_engine.sync_engine, [replica.sync_engine for replica in replica_engines], settings.DATABASE_REPLICA_RETRY_SECONDS)
+
+if settings.METRICS_ENABLED:
+    for instrumented in ENGINES.values():
+        metrics.instrument_engine(instrumented)
+    metrics.registry.register(PoolGauges(ENGINES))
+    if replica_router is not None:
+        metrics.registry.register(replica_router)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
 
+AsyncSessionLocal = async_sessionmaker(autoflush=False, bind=async_engine, expire_on_commit=False, class_=AsyncSession)
+
+ReplicaSessionLocal = async_sessionmaker(
+    autoflush=False, expire_on_commit=False, class_=AsyncSession,
+    sync_session_class=RoutingSession, router=replica_router,
+)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db(request: Request):
+    read_only = replica_router is not None and request.method in READ_METHODS
+    async with (ReplicaSessionLocal if read_only else AsyncSessionLocal)() as db:
+        if read_only:
+            await connect_replica(db)
+        yield db
@@ -1,3 +1,4 @@
+import inspect
 from functools import wraps
 from sqlalchemy.exc import (
     IntegrityError,
@@ -13,57 +14,72 @@ from sqlalchemy.exc import (
     SQLAlchemyError,
 )
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from api.core.exceptions import (
     ExceptionBadRequest,
     ExceptionConflict,
     ExceptionNotFound,
     ExceptionInternalServerError,
     ExceptionInvalidData,
-    ExceptionForbidden
+    ExceptionForbidden,
+    ExceptionTooManyRequests,
+    ExceptionUnauthorized
 )
 
+ERROS_PROPAGADOS = (ExceptionBadRequest, ExceptionNotFound, ExceptionInvalidData, ExceptionConflict, ExceptionForbidden, ExceptionTooManyRequests, ExceptionUnauthorized)
+
+def _traduz_erro(e: Exception) -> Exception:
+    """Converte exceções do SQLAlchemy nas exceções HTTP da API"""
+    if isinstance(e, ERROS_PROPAGADOS):
+        return e
+    if isinstance(e, IntegrityError):
+        return ExceptionInvalidData(detail=f"Erro de integridade: {str(e.orig)}")
+    if isinstance(e, OperationalError):
+        return ExceptionInternalServerError(detail=f"Erro de conexão com o banco de dados: {str(e)}")
+    if isinstance(e, DatabaseError):
+        return ExceptionInternalServerError(detail=f"Erro no banco de dados: {str(e)}")
+    if isinstance(e, DataError):
+        return ExceptionInvalidData(detail=f"Erro de dados: {str(e)}")
+    if isinstance(e, ProgrammingError):
+        return ExceptionInternalServerError(detail=f"Erro de sintaxe: {str(e)}")
+    if isinstance(e, InvalidRequestError):
+        return ExceptionBadRequest(detail="Erro de solicitação inválida")
+    if isinstance(e, InterfaceError):
+        return ExceptionInternalServerError(detail=f"Erro de interface: {str(e)}")
+    if isinstance(e, TimeoutError):
+        return ExceptionInternalServerError(detail=f"Erro de timeout: {str(e)}")
+    if isinstance(e, NoResultFound):
+        return ExceptionNotFound(detail="Nenhum resultado encontrado")
+    if isinstance(e, MultipleResultsFound):
+        return ExceptionBadRequest(detail=f"Múltiplos resultados encontrados: {str(e)}")
+    if isinstance(e, SQLAlchemyError):
+        return ExceptionInternalServerError(detail=f"Erro no SQLAlchemy: {str(e)}")
+    return ExceptionInternalServerError(detail=f"Erro interno: {str(e)}")
+
 def handle_sqlalchemy_errors(func):
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            try:
+                return await func(self, *args, **kwargs)
+            except Exception as e:
+                erro = _traduz_erro(e)
+                if erro is e:
+                    raise
+                db = getattr(self, "db_session", None)
+                if isinstance(db, AsyncSession):
+                    await db.rollback()
+                raise erro
+        return async_wrapper
+
     @wraps(func)
     def wrapper(self, db: Session, *args, **kwargs):
         try:
             return func(self, db, *args, **kwargs)
-        except IntegrityError as e:
-            db.rollback()
-            raise ExceptionInvalidData(detail=f"Erro de integridade: {str(e.orig)}")
-        except OperationalError as e:
-            db.rollback()
-            raise ExceptionInternalServerError(detail=f"Erro de conexão com o banco de dados: {str(e)}")
-        except DatabaseError as e:
-            db.rollback()
-            raise ExceptionInternalServerError(detail=f"Erro no banco de dados: {str(e)}")
-        except DataError as e:
-            db.rollback()
-            raise ExceptionInvalidData(detail=f"Erro de dados: {str(e)}")
-        except ProgrammingError as e:
-            db.rollback()
-            raise ExceptionInternalServerError(detail=f"Erro de sintaxe: {str(e)}")
-        except InvalidRequestError as e:
-            db.rollback()
-            raise ExceptionBadRequest(detail="Erro de solicitação inválida")
-        except InterfaceError as e:
-            db.rollback()
-            raise ExceptionInternalServerError(detail=f"Erro de interface: {str(e)}")
-        except TimeoutError as e:
-            db.rollback()
-            raise ExceptionInternalServerError(detail=f"Erro de timeout: {str(e)}")
-        except NoResultFound as e:
-            db.rollback()
-            raise ExceptionNotFound(detail="Nenhum resultado encontrado")
-        except MultipleResultsFound as e:
-            db.rollback()
-            raise ExceptionBadRequest(detail=f"Múltiplos resultados encontrados: {str(e)}")
-        except SQLAlchemyError as e:
-            db.rollback()
-            raise ExceptionInternalServerError(detail=f"Erro no SQLAlchemy: {str(e)}")
-        # Exceções personalizadas propagadas diretamente
-        except (ExceptionBadRequest, ExceptionNotFound, ExceptionInvalidData, ExceptionConflict, ExceptionForbidden) as e:
-            raise e
         except Exception as e:
+            erro = _traduz_erro(e)
+            if erro is e:
+                raise
             db.rollback()
-            raise ExceptionInternalServerError(detail=f"Erro interno: {str(e)}")
-    return wrapper
\ No newline at end of file
+            raise erro
+    return wrapper
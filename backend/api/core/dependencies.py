@@ -1,20 +1,21 @@
 from typing import Annotated
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
 
-from api.core.db_conection import get_db
+from api.core.db_conection import get_async_db
 from api.core.security import get_current_user
-from api.models.user import Usuario
+from api.schemas.usuario import UsuarioPrincipal
 from api.services.usuario import UsuarioService
 from api.repositories.usuario import UsuarioRepository
 from api.repositories.conta import ContaRepository
+from api.repositories.refresh_token import RefreshTokenRepository
 from api.services.conta import ContaService
 from api.services.task import TaskService
 from api.repositories.task import TaskRepository
 
 
-T_Session = Annotated[Session, Depends(get_db)]
-T_CurrentUser = Annotated[Usuario, Depends(get_current_user)]
+T_Session = Annotated[AsyncSession, Depends(get_async_db)]
+T_CurrentUser = Annotated[UsuarioPrincipal, Depends(get_current_user)]
 
 class UsuarioDependencies:
     def __init__(self, db: T_Session):
@@ -31,7 +32,8 @@ class ContaDependencies:
         self.conta_repository = ContaRepository(db)
         self.usuario_repository = UsuarioRepository(db)
         self.usuario_service = UsuarioService(self.usuario_repository)
-        self.conta_service = ContaService(self.conta_repository, self.usuario_service)
+        self.refresh_token_repository = RefreshTokenRepository(db)
+        self.conta_service = ContaService(self.conta_repository, self.usuario_service, self.refresh_token_repository)
         
 def get_conta_deps(db: T_Session) -> ContaDependencies:
     return ContaDependencies(db)
@@ -44,4 +44,8 @@ class ExceptionCustomNotFound(HTTPException):
         
 class ExceptionConflict(HTTPException):
     def __init__(self, detail: str = "Conflito"):
-        super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail)
\ No newline at end of file
+        super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+class ExceptionTooManyRequests(HTTPException):
+    def __init__(self, detail: str = "Muitas requisições", retry_after: int = 1):
+        super().__init__(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=detail, headers={"Retry-After": str(retry_after)})
\ No newline at end of file
@@ -0,0 +1,238 @@
+import secrets
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Annotated, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Header
+from sqlalchemy import event
+
+from api.core.exceptions import ExceptionNotFound, ExceptionUnauthorized
+from api.core.settings import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+T_Labels = Tuple[str, ...]
+
+# Qualquer outro método vira "OTHER": o método vem do cliente e não pode criar séries novas
+HTTP_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"})
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _format_labels(names: Tuple[str, ...], values: T_Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    """Contador monotônico por conjunto de labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[T_Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: T_Labels = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: T_Labels = ()) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram:
+    """Histograma com buckets fixos por conjunto de labels.
+
+    observe() só incrementa o bucket da observação; os valores cumulativos
+    exigidos pelo formato do Prometheus são montados em render().
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series: Dict[T_Labels, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: T_Labels = ()) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # [bucket_0, ..., bucket_n, +Inf, soma, contagem]
+                series = self._series[labels] = [0] * (len(self.buckets) + 3)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, labels: T_Labels = ()) -> int:
+        series = self._series.get(labels)
+        return int(series[-1]) if series else 0
+
+    def sum(self, labels: T_Labels = ()) -> float:
+        series = self._series.get(labels)
+        return series[-2] if series else 0
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in items:
+            cumulative = 0
+            for bound, observed in zip(self.buckets + (float("inf"),), series):
+                cumulative += observed
+                le = f'le="{_format_value(float(bound))}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(series[-2])}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {int(series[-1])}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = [line for metric in self._metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+class RequestStats:
+    """Acumulador de SQL da requisição corrente (mutável, compartilhado entre contextos copiados)"""
+
+    __slots__ = ("statements", "sql_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.sql_seconds = 0.0
+
+
+registry = Registry()
+
+REQUEST_LATENCY = registry.register(Histogram(
+    "http_request_duration_seconds", "Latência das requisições HTTP por rota.", ("method", "route"),
+))
+REQUESTS = registry.register(Counter(
+    "http_requests_total", "Requisições HTTP por rota e status.", ("method", "route", "status"),
+))
+REQUEST_STATEMENTS = registry.register(Histogram(
+    "http_request_sql_statements", "Comandos SQL executados por requisição.", ("method", "route"), STATEMENT_BUCKETS,
+))
+REQUEST_SQL_TIME = registry.register(Histogram(
+    "http_request_sql_duration_seconds", "Tempo gasto em SQL por requisição.", ("method", "route"),
+))
+SQL_STATEMENTS = registry.register(Counter(
+    "db_statements_total", "Comandos SQL executados (inclusive fora de requisições).",
+))
+SQL_TIME = registry.register(Counter(
+    "db_statement_duration_seconds_total", "Tempo total gasto em SQL.",
+))
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    SQL_STATEMENTS.inc()
+    SQL_TIME.inc(amount=elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.sql_seconds += elapsed
+
+def _handle_error(exception_context):
+    # after_cursor_execute não dispara quando o comando falha
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+def instrument_engine(engine) -> None:
+    """Registra os listeners de SQL na engine (síncrona; para AsyncEngine use .sync_engine)"""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que mede latência e SQL por rota.
+
+    A rota é o template (ex.: /api/v1/tarefas/{id}), não o caminho, para
+    manter a cardinalidade dos labels limitada; caminhos sem rota caem em
+    "unmatched" e métodos fora de HTTP_METHODS em "OTHER". As métricas são locais ao processo: com vários workers
+    cada um expõe as suas.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"] if scope["method"] in HTTP_METHODS else "OTHER"
+            labels = (method, route)
+            REQUEST_LATENCY.observe(elapsed, labels)
+            REQUESTS.inc(labels + (str(status),))
+            REQUEST_STATEMENTS.observe(stats.statements, labels)
+            REQUEST_SQL_TIME.observe(stats.sql_seconds, labels)
+
+
+def require_metrics_token(authorization: Annotated[Optional[str], Header()] = None) -> None:
+    """Libera /metrics e /metrics/pool só para Authorization: Bearer <METRICS_TOKEN>.
+
+    Sem METRICS_TOKEN os endpoints respondem 404: latência por rota e estado
+    dos pools não ficam expostos por padrão na API pública.
+    """
+    if not settings.METRICS_TOKEN:
+        raise ExceptionNotFound()
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise ExceptionUnauthorized()
@@ -0,0 +1,44 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Optional, Tuple
+
+from api.core.exceptions import ExceptionBadRequest
+
+T_Cursor = Tuple[Any, uuid.UUID]
+
+def encode_cursor(value: Any, id: uuid.UUID, sort: str = "created_at:desc") -> str:
+    """Gera um cursor opaco a partir da chave de ordenação (valor, id)"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, Enum):
+        value = value.value
+    payload = json.dumps([sort, value, str(id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: Optional[str], sort: str = "created_at:desc", parse: Callable[[str], Any] = datetime.fromisoformat) -> Optional[T_Cursor]:
+    """Converte o cursor opaco de volta na chave (valor, id); o cursor só vale para a ordenação que o gerou"""
+    if not cursor:
+        return None
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        # O cursor vem do cliente: qualquer outro formato seria um 500 em parse ou uuid.UUID
+        if not isinstance(payload, list) or len(payload) != 3 or not all(isinstance(item, str) for item in payload):
+            raise ValueError(payload)
+        cursor_sort, value, id = payload
+        if cursor_sort != sort:
+            raise ValueError(cursor_sort)
+        return parse(value), uuid.UUID(id)
+    except (ValueError, TypeError):
+        raise ExceptionBadRequest("Cursor inválido")
+
+def next_cursor(rows: list, limit: int, sort: str = "created_at:desc") -> Optional[str]:
+    """Retorna o cursor da próxima página quando foram lidas limit + 1 linhas"""
+    if limit <= 0 or len(rows) <= limit:
+        return None
+    last = rows[limit - 1]
+    field = sort.split(":")[0]
+    return encode_cursor(getattr(last, field), last.id, sort)
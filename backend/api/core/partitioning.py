@@ -0,0 +1,341 @@
+"""Migração online de tarefa para uma tabela particionada.
+
+Caminho (usado pela migration e por scripts/partition_tasks.py):
+
+1. prepare: cria tarefa_particionada (mesmas colunas, PK com a chave de
+   partição) com as partições e índices, e um trigger em tarefa que espelha
+   cada INSERT/UPDATE/DELETE nela.
+2. backfill: copia as linhas existentes em lotes pela PK, cada lote numa
+   única instrução (atômica), com o progresso salvo em tarefa_particionamento;
+   interrompido, continua do último lote.
+3. swap: numa transação curta, troca os nomes (tarefa vira tarefa_legado) e
+   passa a espelhar as escritas no sentido inverso, para que o downgrade
+   seja só outra troca de nomes. drop_legacy encerra o espelhamento.
+
+Todas as funções recebem uma Connection síncrona. prepare e backfill devem
+rodar em autocommit, para cada comando e cada lote confirmarem sozinhos.
+"""
+
+import logging
+import re
+import time
+from datetime import date, datetime
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from api.models.task import PARTITION_KEYS, SEARCH_CONFIG, Tarefa
+
+logger = logging.getLogger(__name__)
+
+TABLE = "tarefa"
+STAGING = "tarefa_particionada"
+LEGACY = "tarefa_legado"
+PROGRESS = "tarefa_particionamento"
+
+# Colunas copiadas; a coluna gerada "busca" é recalculada em cada tabela
+COLUMNS = [column.name for column in Tarefa.__table__.columns]
+
+COLUMN_TYPES = {
+    "titulo": "varchar NOT NULL",
+    "descricao": "varchar NOT NULL",
+    "status": "status_tarefa NOT NULL",
+    "prioridade": "prioridade_tarefa NOT NULL",
+    "data_vencimento": "timestamp NOT NULL",
+    "usuario_id": "uuid NOT NULL",
+    "id": "uuid NOT NULL",
+    "flg_ativo": "boolean NOT NULL",
+    "flg_excluido": "boolean NOT NULL",
+    "created_at": "timestamp NOT NULL",
+    "updated_at": "timestamp NOT NULL",
+    "deleted_at": "timestamp",
+}
+
+SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(titulo, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(descricao, '')), 'B')"
+)
+
+# Os mesmos índices de tarefa (model e migrations de busca), criados na tabela particionada
+INDEXES = {
+    "ix_tarefa_usuario_created_at": "(usuario_id, created_at DESC, id DESC) WHERE flg_excluido = false",
+    "ix_tarefa_usuario_updated_at": "(usuario_id, updated_at, id) WHERE flg_excluido = false",
+    "ix_tarefa_usuario_vencimento": "(usuario_id, data_vencimento, id) WHERE flg_excluido = false",
+    "ix_tarefa_usuario_prioridade": "(usuario_id, prioridade, id) WHERE flg_excluido = false",
+    "ix_tarefa_usuario_status_vencimento": "(usuario_id, status, data_vencimento, id) WHERE flg_excluido = false",
+    "ix_tarefa_excluido_updated_at": "(updated_at, id) WHERE flg_excluido = true",
+    "ix_tarefa_usuario_busca": "USING gin (usuario_id, busca) WHERE flg_excluido = false",
+}
+
+# Objetos criados fora do metadata que o autogenerate do Alembic deve ignorar
+PARTITION_OBJECTS = re.compile(rf"^({STAGING}|{LEGACY}|{PROGRESS}|{TABLE}_(p\d+|\d{{4}}_\d{{2}}|padrao))(_|$)")
+
+
+def renamed(name: str, table: str) -> str:
+    """Nome de um objeto de tarefa (índice, constraint, partição) na tabela table"""
+    if name.startswith(f"ix_{TABLE}_"):
+        return f"ix_{table}_" + name[len(f"ix_{TABLE}_"):]
+    return table + name[len(TABLE):]
+
+
+def create_table_sql(strategy: str, table: str = STAGING) -> str:
+    key = PARTITION_KEYS[strategy]
+    columns = ",\n    ".join(f"{name} {COLUMN_TYPES[name]}" for name in COLUMNS)
+    return f"""
+CREATE TABLE IF NOT EXISTS {table} (
+    {columns},
+    busca tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED,
+    CONSTRAINT {table}_pkey PRIMARY KEY (id, {key}),
+    CONSTRAINT {table}_usuario_id_fkey FOREIGN KEY (usuario_id) REFERENCES usuario (id)
+) PARTITION BY {strategy.upper()} ({key})"""
+
+
+def hash_partitions_sql(count: int, table: str = STAGING) -> List[str]:
+    return [
+        f"CREATE TABLE IF NOT EXISTS {table}_p{remainder} PARTITION OF {table} "
+        f"FOR VALUES WITH (MODULUS {count}, REMAINDER {remainder})"
+        for remainder in range(count)
+    ]
+
+
+def next_month(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def month_starts(first: date, last: date) -> List[date]:
+    """Primeiro dia de cada mês de first até last, inclusive"""
+    months = []
+    current = first.replace(day=1)
+    while current <= last:
+        months.append(current)
+        current = next_month(current)
+    return months
+
+
+def months_ahead_of(today: date, months_ahead: int) -> date:
+    last = today.replace(day=1)
+    for _ in range(months_ahead):
+        last = next_month(last)
+    return last
+
+
+def range_partitions_sql(first: date, last: date, table: str = STAGING) -> List[str]:
+    """Uma partição por mês de first a last, mais a DEFAULT para datas fora do intervalo"""
+    statements = [
+        f"CREATE TABLE IF NOT EXISTS {table}_{start:%Y_%m} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{next_month(start).isoformat()}')"
+        for start in month_starts(first, last)
+    ]
+    statements.append(f"CREATE TABLE IF NOT EXISTS {table}_padrao PARTITION OF {table} DEFAULT")
+    return statements
+
+
+def indexes_sql(table: str = STAGING) -> List[str]:
+    # A tabela está vazia ao ser criada: sem CONCURRENTLY, que nem existe em tabela particionada
+    return [f"CREATE INDEX IF NOT EXISTS {renamed(name, table)} ON {table} {definition}" for name, definition in INDEXES.items()]
+
+
+def mirror_sql(source: str, target: str, key: str, conflict: str) -> List[str]:
+    """Função e trigger que replicam em target as escritas feitas em source"""
+    function = f"{target}_espelho"
+    columns = ", ".join(COLUMNS)
+    values = ", ".join(f"NEW.{name}" for name in COLUMNS)
+    updates = ", ".join(f"{name} = EXCLUDED.{name}" for name in COLUMNS if name not in conflict.split(", "))
+    return [
+        f"""
+CREATE OR REPLACE FUNCTION {function}() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.{key} IS DISTINCT FROM NEW.{key}) THEN
+        DELETE FROM {target} WHERE id = OLD.id AND {key} = OLD.{key};
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        INSERT INTO {target} ({columns}) VALUES ({values})
+        ON CONFLICT ({conflict}) DO UPDATE SET {updates};
+    END IF;
+    RETURN NULL;
+END
+$$""",
+        f"CREATE OR REPLACE TRIGGER {function} AFTER INSERT OR UPDATE OR DELETE ON {source} "
+        f"FOR EACH ROW EXECUTE FUNCTION {function}()",
+    ]
+
+
+def backfill_batch_sql() -> str:
+    """Um lote da cópia numa instrução: lê pela PK a partir do último id, copia e avança o progresso.
+
+    FOR SHARE segura UPDATE/DELETE concorrentes nas linhas do lote até o fim
+    da instrução; sem ele, uma linha apagada depois de lida voltaria a
+    existir na cópia.
+    """
+    columns = ", ".join(COLUMNS)
+    return f"""
+WITH lote AS (
+    SELECT {columns} FROM {TABLE}
+    WHERE id > coalesce((SELECT ultimo_id FROM {PROGRESS} WHERE id = 1), '00000000-0000-0000-0000-000000000000'::uuid)
+    ORDER BY id
+    LIMIT :batch_size
+    FOR SHARE
+), inseridas AS (
+    INSERT INTO {STAGING} ({columns}) SELECT {columns} FROM lote
+    ON CONFLICT DO NOTHING
+    RETURNING 1
+), progresso AS (
+    UPDATE {PROGRESS}
+    SET ultimo_id = coalesce((SELECT id FROM lote ORDER BY id DESC LIMIT 1), ultimo_id),
+        copiadas = copiadas + (SELECT count(*) FROM inseridas),
+        concluido_em = CASE WHEN (SELECT count(*) FROM lote) < :batch_size THEN now() END,
+        updated_at = now()
+    WHERE id = 1
+)
+SELECT (SELECT count(*) FROM lote) AS lidas, (SELECT count(*) FROM inseridas) AS copiadas"""
+
+
+def _exists(conn: Connection, name: str) -> bool:
+    return conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}).scalar_one()
+
+
+def is_partitioned(conn: Connection, table: str = TABLE) -> bool:
+    return conn.execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:name))"),
+        {"name": table},
+    ).scalar_one()
+
+
+def partitions(conn: Connection, table: str) -> List[str]:
+    return list(conn.execute(
+        text("SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(:name) AND c.relkind IN ('r', 'p')"),
+        {"name": table},
+    ).scalars())
+
+
+def prepare(conn: Connection, strategy: str, count: int = 16, months_ahead: int = 3) -> None:
+    """Cria (ou completa) a tabela particionada, o progresso e o trigger de espelhamento; idempotente"""
+    key = PARTITION_KEYS[strategy]
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {PROGRESS} ("
+        "id integer PRIMARY KEY CHECK (id = 1), estrategia varchar NOT NULL, ultimo_id uuid, "
+        "copiadas bigint NOT NULL DEFAULT 0, concluido_em timestamp, updated_at timestamp NOT NULL DEFAULT now())"
+    ))
+    conn.execute(text(f"INSERT INTO {PROGRESS} (id, estrategia) VALUES (1, :estrategia) ON CONFLICT (id) DO NOTHING"), {"estrategia": strategy})
+    prepared = conn.execute(text(f"SELECT estrategia FROM {PROGRESS} WHERE id = 1")).scalar_one()
+    if prepared != strategy:
+        raise RuntimeError(f"{STAGING} já foi preparada com a estratégia {prepared!r}; desfaça com a downgrade antes de trocar")
+
+    conn.execute(text(create_table_sql(strategy)))
+    if strategy == "hash":
+        statements = hash_partitions_sql(count)
+    else:
+        # Lê o created_at mais antigo uma vez (varredura só de leitura) para cobrir todo o histórico
+        oldest: Optional[datetime] = conn.execute(text(f"SELECT min(created_at) FROM {TABLE}")).scalar_one()
+        today = date.today()
+        statements = range_partitions_sql(oldest.date() if oldest else today, months_ahead_of(today, months_ahead))
+    for statement in statements + indexes_sql():
+        conn.execute(text(statement))
+    # Por último: a partir daqui toda escrita em tarefa também vai para a cópia
+    for statement in mirror_sql(TABLE, STAGING, key, f"id, {key}"):
+        conn.execute(text(statement))
+
+
+def backfill(conn: Connection, batch_size: int = 5000, pause_seconds: float = 0.0, max_batches: Optional[int] = None) -> bool:
+    """Copia os lotes restantes; retorna True quando a cópia chegou ao fim"""
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        start = time.perf_counter()
+        lidas, copiadas = conn.execute(text(backfill_batch_sql()), {"batch_size": batch_size}).one()
+        batches += 1
+        logger.info("Particionamento: lote com %d linhas (%d novas) em %.3fs", lidas, copiadas, time.perf_counter() - start)
+        if lidas < batch_size:
+            return True
+        if pause_seconds:
+            time.sleep(pause_seconds)
+    return False
+
+
+def _rename_sql(conn: Connection, source: str, target: str) -> List[str]:
+    """Renomeia a tabela source, suas constraints, índices e partições para o prefixo target"""
+    statements = [
+        f"ALTER INDEX IF EXISTS {renamed(name, source)} RENAME TO {renamed(name, target)}" for name in INDEXES
+    ]
+    statements += [
+        f"ALTER TABLE {source} RENAME CONSTRAINT {source}_{suffix} TO {target}_{suffix}" for suffix in ("pkey", "usuario_id_fkey")
+    ]
+    statements += [
+        f"ALTER TABLE {partition} RENAME TO {target}{partition[len(source):]}"
+        for partition in partitions(conn, source) if partition.startswith(source + "_")
+    ]
+    statements.append(f"ALTER TABLE {source} RENAME TO {target}")
+    return statements
+
+
+def swap(conn: Connection, lock_timeout: str = "5s") -> None:
+    """Coloca a tabela particionada no lugar de tarefa; rodar numa transação (a da migration)"""
+    done = conn.execute(text(f"SELECT concluido_em IS NOT NULL FROM {PROGRESS} WHERE id = 1")).scalar_one_or_none()
+    if not done:
+        raise RuntimeError(f"A cópia para {STAGING} não terminou; rode scripts/partition_tasks.py backfill")
+    key = conn.execute(
+        text("SELECT a.attname FROM pg_partitioned_table p JOIN pg_attribute a ON a.attrelid = p.partrelid AND a.attnum = p.partattrs[0] WHERE p.partrelid = to_regclass(:name)"),
+        {"name": STAGING},
+    ).scalar_one()
+
+    conn.execute(text(f"SET LOCAL lock_timeout = '{lock_timeout}'"))
+    conn.execute(text(f"LOCK TABLE {TABLE}, {STAGING} IN ACCESS EXCLUSIVE MODE"))
+    statements = [f"DROP TRIGGER IF EXISTS {STAGING}_espelho ON {TABLE}", f"DROP FUNCTION IF EXISTS {STAGING}_espelho()"]
+    statements += _rename_sql(conn, TABLE, LEGACY)
+    statements += _rename_sql(conn, STAGING, TABLE)
+    # Mantém tarefa_legado em dia para permitir voltar atrás até drop_legacy
+    statements += mirror_sql(TABLE, LEGACY, key, "id")
+    statements.append(f"DROP TABLE {PROGRESS}")
+    for statement in statements:
+        conn.execute(text(statement))
+
+
+def unswap(conn: Connection, lock_timeout: str = "5s") -> None:
+    """Volta tarefa_legado para o lugar de tarefa e descarta a tabela particionada"""
+    if not _exists(conn, LEGACY):
+        raise RuntimeError(f"{LEGACY} já foi removida; não há tabela não particionada para onde voltar")
+    conn.execute(text(f"SET LOCAL lock_timeout = '{lock_timeout}'"))
+    conn.execute(text(f"LOCK TABLE {TABLE}, {LEGACY} IN ACCESS EXCLUSIVE MODE"))
+    statements = [f"DROP TRIGGER IF EXISTS {LEGACY}_espelho ON {TABLE}", f"DROP FUNCTION IF EXISTS {LEGACY}_espelho()"]
+    statements += _rename_sql(conn, TABLE, STAGING)
+    statements += _rename_sql(conn, LEGACY, TABLE)
+    statements.append(f"DROP TABLE {STAGING}")
+    for statement in statements:
+        conn.execute(text(statement))
+
+
+def discard(conn: Connection) -> None:
+    """Desfaz um prepare que ainda não passou pelo swap"""
+    for statement in (
+        f"DROP TRIGGER IF EXISTS {STAGING}_espelho ON {TABLE}",
+        f"DROP FUNCTION IF EXISTS {STAGING}_espelho()",
+        f"DROP TABLE IF EXISTS {STAGING}",
+        f"DROP TABLE IF EXISTS {PROGRESS}",
+    ):
+        conn.execute(text(statement))
+
+
+def drop_legacy(conn: Connection) -> None:
+    """Para de espelhar em tarefa_legado e a remove; depois disso a downgrade não é mais possível"""
+    for statement in (
+        f"DROP TRIGGER IF EXISTS {LEGACY}_espelho ON {TABLE}",
+        f"DROP FUNCTION IF EXISTS {LEGACY}_espelho()",
+        f"DROP TABLE IF EXISTS {LEGACY}",
+    ):
+        conn.execute(text(statement))
+
+
+def add_range_partitions(conn: Connection, months_ahead: int) -> List[str]:
+    """Cria as partições mensais que faltam até months_ahead meses à frente (rodar mensalmente)"""
+    today = date.today()
+    existing = set(partitions(conn, TABLE))
+    created = []
+    for start in month_starts(today, months_ahead_of(today, months_ahead)):
+        name = f"{TABLE}_{start:%Y_%m}"
+        if name not in existing:
+            conn.execute(text(
+                f"CREATE TABLE {name} PARTITION OF {TABLE} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{next_month(start).isoformat()}')"
+            ))
+            created.append(name)
+    return created
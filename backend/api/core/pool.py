@@ -0,0 +1,124 @@
+import logging
+import math
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from api.core import metrics
+
+logger = logging.getLogger(__name__)
+
+CHECKOUT_WAIT = metrics.registry.register(metrics.Histogram(
+    "db_pool_checkout_wait_seconds", "Tempo para obter uma conexão do pool.", ("pool",),
+))
+CHECKOUT_TIMEOUTS = metrics.registry.register(metrics.Counter(
+    "db_pool_checkout_timeouts_total", "Checkouts que estouraram pool_timeout.", ("pool",),
+))
+
+
+class PoolStats:
+    """Totais de checkout de um pool, preservados quando o pool é recriado (dispose)"""
+
+    def __init__(self, name: str, slow_checkout_seconds: float):
+        self.name = name
+        self.slow_checkout_seconds = slow_checkout_seconds
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.slow_checkouts = 0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            if timed_out:
+                self.timeouts += 1
+            elif waited >= self.slow_checkout_seconds:
+                self.slow_checkouts += 1
+        labels = (self.name,)
+        CHECKOUT_WAIT.observe(waited, labels)
+        if timed_out:
+            CHECKOUT_TIMEOUTS.inc(labels)
+            logger.warning("Pool %s: checkout estourou o timeout após %.3fs", self.name, waited)
+        elif waited >= self.slow_checkout_seconds:
+            logger.warning("Pool %s: checkout lento (%.3fs)", self.name, waited)
+
+
+class InstrumentedPoolMixin:
+    """Mede o tempo de connect() (fila, criação da conexão e pre-ping)"""
+
+    stats: PoolStats
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - start)
+        return connection
+
+
+def instrumented_pool_class(base: type, name: str, slow_checkout_seconds: float) -> type:
+    """Subclasse de base com estatísticas próprias; recreate() usa self.__class__ e as mantém"""
+    stats = PoolStats(name, slow_checkout_seconds)
+    return type(f"Instrumented{base.__name__}", (InstrumentedPoolMixin, base), {"stats": stats})
+
+
+def pool_sizing(max_connections: int, workers: int, pool_size: Optional[int] = None, max_overflow: Optional[int] = None) -> Dict[str, int]:
+    """Divide o orçamento de conexões entre os workers: metade fixa, metade overflow.
+
+    Valores explícitos de pool_size/max_overflow têm precedência.
+    """
+    per_worker = max(1, max_connections // max(1, workers))
+    if pool_size is None:
+        pool_size = max(1, math.ceil(per_worker / 2))
+    if max_overflow is None:
+        max_overflow = max(0, per_worker - pool_size)
+    return {"pool_size": pool_size, "max_overflow": max_overflow}
+
+
+def pool_status(pool) -> dict:
+    stats: Optional[PoolStats] = getattr(pool, "stats", None)
+    status = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "timeout_seconds": pool.timeout(),
+    }
+    if stats is not None:
+        status.update({
+            "checkouts": stats.checkouts,
+            "wait_seconds_total": round(stats.wait_seconds, 6),
+            "max_wait_seconds": round(stats.max_wait_seconds, 6),
+            "slow_checkouts": stats.slow_checkouts,
+            "timeouts": stats.timeouts,
+        })
+    return status
+
+
+class PoolGauges:
+    """Gauges lidos no momento da coleta a partir dos pools atuais das engines"""
+
+    FIELDS = ("size", "checked_in", "checked_out", "overflow")
+
+    def __init__(self, engines: dict):
+        self.engines = engines
+
+    def render(self):
+        snapshot = {name: pool_status(engine.pool) for name, engine in self.engines.items()}
+        for field in self.FIELDS:
+            metric = f"db_pool_{field}"
+            yield f"# HELP {metric} Conexões do pool ({field})."
+            yield f"# TYPE {metric} gauge"
+            for name, status in snapshot.items():
+                yield f'{metric}{{pool="{name}"}} {status[field]}'
+
@@ -0,0 +1,114 @@
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import exc, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.dml import UpdateBase
+
+logger = logging.getLogger(__name__)
+
+# Falhas que indicam réplica indisponível ao abrir a conexão
+CONNECT_ERRORS = (exc.DBAPIError, exc.TimeoutError, OSError)
+
+
+class ReplicaRouter:
+    """Escolhe réplicas em round-robin, pulando as marcadas como indisponíveis.
+
+    Uma réplica com falha de conexão fica fora da rotação por retry_seconds;
+    sem réplicas saudáveis as leituras voltam para o primário.
+    """
+
+    def __init__(self, primary: Engine, replicas: List[Engine], retry_seconds: float, timer: Callable[[], float] = time.monotonic):
+        self.primary = primary
+        self.replicas = replicas
+        self.retry_seconds = retry_seconds
+        self.timer = timer
+        self._next = itertools.count()
+        self._down_until: Dict[Engine, float] = {}
+        self._lock = threading.Lock()
+        for replica in replicas:
+            event.listen(replica, "handle_error", self._handle_error)
+
+    def choose(self) -> Engine:
+        now = self.timer()
+        start = next(self._next)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if self._down_until.get(replica, 0) <= now:
+                return replica
+        return self.primary
+
+    def mark_down(self, replica: Engine) -> None:
+        if replica is self.primary:
+            return
+        with self._lock:
+            was_healthy = self.healthy(replica)
+            self._down_until[replica] = self.timer() + self.retry_seconds
+        if was_healthy:
+            logger.warning("Réplica %s indisponível; fora da rotação por %.0fs", replica.url.host, self.retry_seconds)
+
+    def healthy(self, replica: Engine) -> bool:
+        return self._down_until.get(replica, 0) <= self.timer()
+
+    def _handle_error(self, context) -> None:
+        if context.is_disconnect:
+            self.mark_down(context.engine)
+
+    def render(self):
+        """Gauge db_replica_healthy para o registry de métricas"""
+        yield "# HELP db_replica_healthy Réplica em rotação (1) ou fora por falha (0)."
+        yield "# TYPE db_replica_healthy gauge"
+        for index, replica in enumerate(self.replicas):
+            yield f'db_replica_healthy{{replica="{index}"}} {int(self.healthy(replica))}'
+
+
+class RoutingSession(Session):
+    """Sessão que lê de uma réplica e escreve no primário.
+
+    A réplica é escolhida uma vez por sessão (uma requisição vê um único
+    snapshot). Qualquer escrita, flush ou SELECT ... FOR UPDATE fixa a
+    sessão no primário, e as leituras seguintes da mesma sessão também vão
+    para lá, para enxergarem o que acabou de ser escrito.
+    """
+
+    def __init__(self, *args, router: ReplicaRouter, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.router = router
+        self.replica: Optional[Engine] = None
+        self.pinned = False
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        if not self.pinned and (
+            self._flushing
+            or isinstance(clause, UpdateBase)
+            or (isinstance(clause, Select) and clause._for_update_arg is not None)
+        ):
+            self.pinned = True
+        if self.pinned:
+            return self.router.primary
+        if self.replica is None:
+            self.replica = self.router.choose()
+        return self.replica
+
+
+async def connect_replica(session: AsyncSession) -> None:
+    """Abre a conexão da sessão já na réplica, trocando de réplica enquanto houver falha"""
+    sync_session: RoutingSession = session.sync_session
+    router = sync_session.router
+    for _ in range(len(router.replicas)):
+        try:
+            await session.connection()
+            return
+        except CONNECT_ERRORS:
+            if sync_session.replica is None or sync_session.replica is router.primary:
+                raise
+            router.mark_down(sync_session.replica)
+            await session.rollback()
+            sync_session.replica = None
+    await session.connection()
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Generic, TypeVar
+from typing import List, Generic, Optional, TypeVar
 
 T = TypeVar("T")
 
@@ -14,4 +14,5 @@ class SingleResponse(BaseModel, Generic[T]):
 
 class PaginatedResponse(BaseModel, Generic[T]):
     total: int
-    data: List[T]
\ No newline at end of file
+    data: List[T]
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -2,23 +2,26 @@ from typing import Annotated
 import jwt
 import pytz
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
-from passlib.context import CryptContext
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
 from api.models.user import Usuario
+from api.schemas.usuario import UsuarioPrincipal
 
+from api.core.cache import token_version_cache, user_cache
+from api.core.hashing import pwd_context
 from api.core.settings import Settings
-from api.core.db_conection import get_db
+from api.core.db_conection import READ_METHODS, get_async_db
 
 settings = Settings()
 
 tz = pytz.timezone('America/Sao_Paulo')
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
     
 T_OAuth2Form = Annotated[OAuth2PasswordRequestForm, Depends()]    
 
@@ -35,20 +38,56 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def create_user_token(usuario) -> str:
+    """Token com as claims do usuário (id, nome, token_version) além do sub=email"""
+    return create_access_token(data={
+        "sub": usuario.email,
+        "uid": str(usuario.id),
+        "nome": usuario.nome,
+        "ver": usuario.token_version,
+    })
+
 def authenticate_user(
     db: Session, 
     email: str, senha: str):
-    usuario = db.query(Usuario).filter(Usuario.email == email).first()
+    usuario = db.query(Usuario).filter(Usuario.email_equals(email)).first()
     if not usuario:
         return False
     if not verify_password(senha, usuario.senha):
         return False
     return usuario
 
-def get_current_user(
+def principal_from_claims(payload: dict) -> UsuarioPrincipal:
+    return UsuarioPrincipal(
+        id=payload["uid"],
+        nome=payload["nome"],
+        email=payload["sub"],
+        token_version=payload["ver"],
+    )
+
+async def current_token_version(db: AsyncSession, user_id, use_cache: bool) -> int | None:
+    """token_version atual do usuário; None se ele não existe mais"""
+    key = str(user_id)
+    version = token_version_cache.get(key) if use_cache else None
+    if version is None:
+        stmt = select(Usuario.token_version).where(Usuario.id == user_id, Usuario.flg_excluido == False)
+        version = (await db.execute(stmt)).scalar_one_or_none()
+        if version is not None:
+            token_version_cache.set(key, version)
+    return version
+
+async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-):
+    db: AsyncSession = Depends(get_async_db),
+) -> UsuarioPrincipal:
+    """Autentica o portador do token.
+
+    Com AUTH_CLAIMS_ONLY, tokens emitidos com as claims do usuário dispensam
+    o banco nas leituras; escritas sempre conferem o token_version, e as
+    leituras o conferem a cada AUTH_TOKEN_VERSION_CHECK_SECONDS (0 = nunca).
+    Tokens antigos, só com sub, seguem pela busca por email.
+    """
     credentials_exception = HTTPException(
         status_code=401,
         detail="Credenciais inválidas",
@@ -62,7 +101,27 @@ def get_current_user(
     except jwt.PyJWTError:
         raise credentials_exception
     
-    usuario = db.query(Usuario).filter(Usuario.email == email).first()
-    if usuario is None:
+    if settings.AUTH_CLAIMS_ONLY and "uid" in payload:
+        try:
+            principal = principal_from_claims(payload)
+        except (KeyError, ValueError):
+            raise credentials_exception
+        write = request.method not in READ_METHODS
+        if write or settings.AUTH_TOKEN_VERSION_CHECK_SECONDS > 0:
+            version = await current_token_version(db, principal.id, use_cache=not write)
+            if version != principal.token_version:
+                raise credentials_exception
+        return principal
+    
+    cached = user_cache.get(email)
+    if cached is None:
+        result = await db.execute(select(Usuario).where(Usuario.email_equals(email)))
+        usuario = result.scalars().first()
+        if usuario is None:
+            raise credentials_exception
+        cached = UsuarioPrincipal(id=usuario.id, nome=usuario.nome, email=usuario.email, token_version=usuario.token_version)
+        user_cache.set(email, cached)
+    
+    if payload.get("ver", cached.token_version) != cached.token_version:
         raise credentials_exception
-    return usuario
\ No newline at end of file
+    return cached
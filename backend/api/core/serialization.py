@@ -0,0 +1,27 @@
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from api.core.settings import settings
+
+@lru_cache(maxsize=None)
+def get_type_adapter(response_type: Any) -> TypeAdapter:
+    """TypeAdapter por tipo de resposta; construir o schema custa mais que validar"""
+    return TypeAdapter(response_type)
+
+def render(response_type: Any, content: Any, response: Response) -> Any:
+    """Serializa a resposta de uma listagem.
+
+    Com FAST_JSON_RESPONSES, valida os objetos ORM uma única vez (from_attributes) e
+    gera os bytes direto no pydantic-core, com a mesma saída do caminho padrão; os
+    headers já definidos em `response` são mantidos. Sem a opção, devolve `content`
+    para o FastAPI validar contra o response_model como antes.
+    """
+    if not settings.FAST_JSON_RESPONSES:
+        return content
+    adapter = get_type_adapter(response_type)
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+    headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,4 +1,6 @@
 from pydantic_settings import BaseSettings
+from typing import Literal, Optional
+
 from pydantic import Field
 
 class Settings(BaseSettings):
@@ -6,6 +8,40 @@ class Settings(BaseSettings):
     SECRET_KEY: str = Field(..., env="SECRET_KEY")
     ALGORITHM: str = Field(..., env="ALGORITHM")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(..., env="ACCESS_TOKEN_EXPIRE_MINUTES")
+    REFRESH_TOKEN_EXPIRE_DAYS: int = Field(30, env="REFRESH_TOKEN_EXPIRE_DAYS")
+    AUTH_CLAIMS_ONLY: bool = Field(False, env="AUTH_CLAIMS_ONLY")
+    AUTH_TOKEN_VERSION_CHECK_SECONDS: int = Field(0, env="AUTH_TOKEN_VERSION_CHECK_SECONDS")
+    USER_CACHE_TTL_SECONDS: int = Field(60, env="USER_CACHE_TTL_SECONDS")
+    USER_CACHE_MAXSIZE: int = Field(10000, env="USER_CACHE_MAXSIZE")
+    LOGIN_THROTTLE_ENABLED: bool = Field(True, env="LOGIN_THROTTLE_ENABLED")
+    LOGIN_ATTEMPTS_PER_MINUTE_PER_IP: int = Field(30, gt=0, env="LOGIN_ATTEMPTS_PER_MINUTE_PER_IP")
+    LOGIN_ATTEMPTS_PER_MINUTE_PER_USER: int = Field(5, gt=0, env="LOGIN_ATTEMPTS_PER_MINUTE_PER_USER")
+    LOGIN_THROTTLE_REDIS_URL: str = Field("", env="LOGIN_THROTTLE_REDIS_URL")
+    BCRYPT_ROUNDS: int = Field(12, env="BCRYPT_ROUNDS")
+    PASSWORD_HASH_WORKERS: int = Field(2, env="PASSWORD_HASH_WORKERS")
+    PASSWORD_HASH_MAX_PENDING: int = Field(32, env="PASSWORD_HASH_MAX_PENDING")
+    TASK_BULK_MAX_ITEMS: int = Field(1000, env="TASK_BULK_MAX_ITEMS")
+    TASK_SEARCH_MIN_FTS_LENGTH: int = Field(3, env="TASK_SEARCH_MIN_FTS_LENGTH")
+    TASK_EXPORT_BATCH_SIZE: int = Field(1000, env="TASK_EXPORT_BATCH_SIZE")
+    TASK_PARTITION_STRATEGY: Literal["", "hash", "range"] = Field("", env="TASK_PARTITION_STRATEGY")
+    TASK_PARTITION_COUNT: int = Field(16, env="TASK_PARTITION_COUNT")
+    TASK_PARTITION_MONTHS_AHEAD: int = Field(3, env="TASK_PARTITION_MONTHS_AHEAD")
+    TASK_ARCHIVE_AFTER_DAYS: int = Field(30, env="TASK_ARCHIVE_AFTER_DAYS")
+    TASK_ARCHIVE_BATCH_SIZE: int = Field(500, env="TASK_ARCHIVE_BATCH_SIZE")
+    TASK_ARCHIVE_PAUSE_SECONDS: float = Field(0.5, env="TASK_ARCHIVE_PAUSE_SECONDS")
+    TASK_ARCHIVE_INTERVAL_SECONDS: int = Field(0, env="TASK_ARCHIVE_INTERVAL_SECONDS")
+    FAST_JSON_RESPONSES: bool = Field(False, env="FAST_JSON_RESPONSES")
+    METRICS_ENABLED: bool = Field(True, env="METRICS_ENABLED")
+    METRICS_TOKEN: str = Field("", env="METRICS_TOKEN")
+    WEB_CONCURRENCY: int = Field(1, env="WEB_CONCURRENCY")
+    DB_MAX_CONNECTIONS: int = Field(50, env="DB_MAX_CONNECTIONS")
+    DB_POOL_SIZE: Optional[int] = Field(None, env="DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: Optional[int] = Field(None, env="DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT: float = Field(10, env="DB_POOL_TIMEOUT")
+    DB_POOL_RECYCLE: int = Field(3600, env="DB_POOL_RECYCLE")
+    DB_POOL_SLOW_CHECKOUT_SECONDS: float = Field(0.5, env="DB_POOL_SLOW_CHECKOUT_SECONDS")
+    DATABASE_REPLICA_URLS: str = Field("", env="DATABASE_REPLICA_URLS")
+    DATABASE_REPLICA_RETRY_SECONDS: float = Field(30, env="DATABASE_REPLICA_RETRY_SECONDS")
 
     class Config:
         env_file = ".env"
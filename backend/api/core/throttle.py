@@ -0,0 +1,155 @@
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Sequence, Tuple
+
+from fastapi import Depends, Request
+from fastapi.security import OAuth2PasswordRequestForm
+
+from api.core import metrics
+from api.core.exceptions import ExceptionTooManyRequests
+from api.core.settings import Settings
+
+settings = Settings()
+
+logger = logging.getLogger(__name__)
+
+# (chave, tokens por segundo, capacidade do balde)
+T_Bucket = Tuple[str, float, int]
+
+ATTEMPTS = metrics.registry.register(metrics.Counter(
+    "login_throttle_attempts_total", "Tentativas de login avaliadas pelo limitador, por resultado.", ("result",),
+))
+
+
+class MemoryBuckets:
+    """Token buckets em memória, limitados a maxsize chaves (LRU).
+
+    Local ao processo: com vários workers cada um tem seus baldes, então o
+    limite efetivo é multiplicado pelo número de workers.
+    """
+
+    def __init__(self, maxsize: int = 100_000, timer: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.timer = timer
+        self._buckets: OrderedDict[str, Tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def hit(self, buckets: Sequence[T_Bucket]) -> float:
+        """Consome um token de cada balde se todos tiverem saldo; senão retorna a espera em segundos"""
+        now = self.timer()
+        with self._lock:
+            levels: List[float] = []
+            wait = 0.0
+            for key, rate, burst in buckets:
+                tokens, updated_at = self._buckets.get(key, (burst, now))
+                tokens = min(burst, tokens + (now - updated_at) * rate)
+                levels.append(tokens)
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) / rate)
+            if wait:
+                return wait
+            for (key, _, _), tokens in zip(buckets, levels):
+                self._buckets[key] = (tokens - 1, now)
+                self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return 0.0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# Mesmo algoritmo do MemoryBuckets, atômico no Redis e com o relógio do servidor
+REDIS_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local wait = 0
+local levels = {}
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i - 1])
+    local burst = tonumber(ARGV[2 * i])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or burst
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + (now - ts) * rate)
+    levels[i] = tokens
+    if tokens < 1 then
+        wait = math.max(wait, (1 - tokens) / rate)
+    end
+end
+if wait == 0 then
+    for i, key in ipairs(KEYS) do
+        local rate = tonumber(ARGV[2 * i - 1])
+        local burst = tonumber(ARGV[2 * i])
+        redis.call('HSET', key, 'tokens', levels[i] - 1, 'ts', now)
+        redis.call('EXPIRE', key, math.ceil(burst / rate))
+    end
+end
+return tostring(wait)
+"""
+
+
+class RedisBuckets:
+    """Token buckets compartilhados entre workers (requer o extra redis).
+
+    Se o Redis falhar, a tentativa é liberada: o limitador não pode
+    derrubar o login.
+    """
+
+    def __init__(self, url: str, prefix: str = "login-throttle:"):
+        import redis.asyncio as redis
+
+        self.prefix = prefix
+        self.client = redis.from_url(url)
+        self.script = self.client.register_script(REDIS_SCRIPT)
+
+    async def hit(self, buckets: Sequence[T_Bucket]) -> float:
+        keys = [self.prefix + key for key, _, _ in buckets]
+        args = [value for _, rate, burst in buckets for value in (rate, burst)]
+        try:
+            return float(await self.script(keys=keys, args=args))
+        except Exception:
+            ATTEMPTS.inc(("backend_error",))
+            logger.warning("Limitador de login indisponível; tentativa liberada", exc_info=True)
+            return 0.0
+
+
+def make_backend():
+    if settings.LOGIN_THROTTLE_REDIS_URL:
+        return RedisBuckets(settings.LOGIN_THROTTLE_REDIS_URL)
+    return MemoryBuckets()
+
+
+login_buckets = make_backend()
+
+
+def login_buckets_for(username: str, client_ip: str) -> List[T_Bucket]:
+    """Um balde por IP (credential stuffing) e um por usuário (força bruta numa conta, mesmo distribuída entre IPs)"""
+    per_ip = settings.LOGIN_ATTEMPTS_PER_MINUTE_PER_IP
+    per_user = settings.LOGIN_ATTEMPTS_PER_MINUTE_PER_USER
+    return [
+        (f"ip:{client_ip}", per_ip / 60, per_ip),
+        (f"user:{username.strip().lower()}", per_user / 60, per_user),
+    ]
+
+
+async def check_login_throttle(request: Request, form_data: OAuth2PasswordRequestForm = Depends()) -> None:
+    """Recusa com 429 tentativas de login acima do limite, antes de consultar o banco ou o bcrypt"""
+    if not settings.LOGIN_THROTTLE_ENABLED:
+        return
+    client_ip = request.client.host if request.client else "desconhecido"
+    wait = await login_buckets.hit(login_buckets_for(form_data.username, client_ip))
+    if wait:
+        ATTEMPTS.inc(("rejected",))
+        raise ExceptionTooManyRequests(
+            "Muitas tentativas de login. Tente novamente em instantes.",
+            retry_after=math.ceil(wait),
+        )
+    ATTEMPTS.inc(("allowed",))
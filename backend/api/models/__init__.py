@@ -1,4 +1,7 @@
 from .user import Usuario
 from .task import Tarefa
+from .task_counter import ContadorTarefa
+from .task_archive import TarefaArquivo
+from .refresh_token import TokenAtualizacao
 
-__all__ = ["Usuario", "Tarefa"]
\ No newline at end of file
+__all__ = ["Usuario", "Tarefa", "ContadorTarefa", "TarefaArquivo", "TokenAtualizacao"]
\ No newline at end of file
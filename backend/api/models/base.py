@@ -5,11 +5,22 @@ from typing import Optional
 from sqlalchemy.orm import Mapped, mapped_column, as_declarative
 
 tz = pytz.timezone('America/Sao_Paulo')
+
+def naive(value: datetime) -> datetime:
+    """Horário de São Paulo sem fuso, como é gravado nas colunas TIMESTAMP WITHOUT TIME ZONE"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(tz).replace(tzinfo=None)
+
+def now() -> datetime:
+    """Agora em São Paulo, sem fuso: o asyncpg recusa datetimes com fuso em colunas sem fuso"""
+    return naive(datetime.now(tz))
+
 @as_declarative()
 class Base():
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4, index=True)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     flg_ativo: Mapped[bool] = mapped_column(default=True)
     flg_excluido: Mapped[bool] = mapped_column(default=False)
-    created_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(tz), nullable=False)
-    updated_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(tz), onupdate=lambda: datetime.now(tz), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default=now, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(default=now, onupdate=now, nullable=False)
     deleted_at: Mapped[Optional[datetime]] = None
\ No newline at end of file
@@ -0,0 +1,21 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey, String
+from api.models.base import Base
+from datetime import datetime
+from typing import Optional
+import uuid
+
+class TokenAtualizacao(Base):
+    """Refresh token opaco; só o SHA-256 do token é guardado.
+
+    Cada troca marca o token como usado e emite outro da mesma família;
+    apresentar um token já usado revoga a família inteira.
+    """
+    __tablename__ = "token_atualizacao"
+
+    usuario_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("usuario.id"), index=True)
+    token_hash: Mapped[str] = mapped_column(String(64), unique=True)
+    familia: Mapped[uuid.UUID] = mapped_column(index=True)
+    expires_at: Mapped[datetime]
+    used_at: Mapped[Optional[datetime]] = mapped_column(default=None)
+    revoked_at: Mapped[Optional[datetime]] = mapped_column(default=None)
@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey, Enum as SQLAlchemyEnum
-from api.models.base import Base
+from sqlalchemy import ForeignKey, Index, PrimaryKeyConstraint, Enum as SQLAlchemyEnum, false, literal_column, true
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from api.core.settings import settings
+from api.models.base import Base, now
 from datetime import datetime
 import uuid
 from enum import Enum
@@ -14,14 +16,87 @@ class PrioridadeTarefa(str, Enum):
     MEDIA = "MEDIA"
     ALTA = "ALTA"
 
+# Particionamento declarativo opcional (só Postgres): hash por usuário ou range mensal por criação.
+# O Postgres exige a chave de partição na PK; no ORM a identidade continua sendo só o id.
+PARTITION_KEYS = {"hash": "usuario_id", "range": "created_at"}
+PARTITION_STRATEGY = settings.TASK_PARTITION_STRATEGY
+PARTITION_KEY = PARTITION_KEYS.get(PARTITION_STRATEGY)
+
+def partition_table_args(strategy: str) -> tuple:
+    if strategy not in PARTITION_KEYS:
+        return ()
+    key = PARTITION_KEYS[strategy]
+    # id primeiro: as buscas por id dentro da partição usam a PK
+    return (PrimaryKeyConstraint("id", key), {"postgresql_partition_by": f"{strategy.upper()} ({key})"})
+
 class Tarefa(Base):
     __tablename__ = "tarefa"
+    __table_args__ = partition_table_args(PARTITION_STRATEGY)
+    __mapper_args__ = {"primary_key": ["id"]}
 
     titulo: Mapped[str]
     descricao: Mapped[str]
     status: Mapped[StatusTarefa] = mapped_column(SQLAlchemyEnum(StatusTarefa, name="status_tarefa"))
     prioridade: Mapped[PrioridadeTarefa] = mapped_column(SQLAlchemyEnum(PrioridadeTarefa, name="prioridade_tarefa"))
     data_vencimento: Mapped[datetime]
-    usuario_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("usuario.id"))
+    usuario_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("usuario.id"), primary_key=PARTITION_KEY == "usuario_id")
+    created_at: Mapped[datetime] = mapped_column(default=now, nullable=False, primary_key=PARTITION_KEY == "created_at")
 
     usuario: Mapped["Usuario"] = relationship("Usuario", back_populates="tarefas")
+
+# Atende _not_excluido(usuario_id) + ORDER BY created_at DESC, id DESC (offset e cursor)
+Index(
+    "ix_tarefa_usuario_created_at",
+    Tarefa.usuario_id,
+    Tarefa.created_at.desc(),
+    Tarefa.id.desc(),
+    postgresql_where=Tarefa.flg_excluido == false(),
+)
+
+# Demais ordenações da listagem; o mesmo índice atende ASC e DESC
+Index(
+    "ix_tarefa_usuario_updated_at",
+    Tarefa.usuario_id,
+    Tarefa.updated_at,
+    Tarefa.id,
+    postgresql_where=Tarefa.flg_excluido == false(),
+)
+Index(
+    "ix_tarefa_usuario_vencimento",
+    Tarefa.usuario_id,
+    Tarefa.data_vencimento,
+    Tarefa.id,
+    postgresql_where=Tarefa.flg_excluido == false(),
+)
+Index(
+    "ix_tarefa_usuario_prioridade",
+    Tarefa.usuario_id,
+    Tarefa.prioridade,
+    Tarefa.id,
+    postgresql_where=Tarefa.flg_excluido == false(),
+)
+
+# Filtro por status (inclusive atrasadas) ordenado por vencimento
+Index(
+    "ix_tarefa_usuario_status_vencimento",
+    Tarefa.usuario_id,
+    Tarefa.status,
+    Tarefa.data_vencimento,
+    Tarefa.id,
+    postgresql_where=Tarefa.flg_excluido == false(),
+)
+
+# Seleção do arquivamento: tarefas excluídas mais antigas primeiro
+Index(
+    "ix_tarefa_excluido_updated_at",
+    Tarefa.updated_at,
+    Tarefa.id,
+    postgresql_where=Tarefa.flg_excluido == true(),
+)
+
+# Busca textual: a coluna gerada "busca" (tsvector) e os índices GIN existem só no
+# Postgres e são criados pela migration; ficam fora do metadata para que o
+# create_all dos testes (SQLite) continue funcionando.
+SEARCH_CONFIG = "portuguese"
+SEARCH_VECTOR = literal_column("tarefa.busca", TSVECTOR)
+SEARCH_OBJECTS = {"busca", "ix_tarefa_usuario_busca"}
@@ -0,0 +1,18 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey, Enum as SQLAlchemyEnum
+from api.models.base import Base, now
+from api.models.task import StatusTarefa, PrioridadeTarefa
+from datetime import datetime
+import uuid
+
+class TarefaArquivo(Base):
+    """Tarefa excluída retirada de tarefa pelo arquivamento, com o mesmo id; restaurar devolve a linha para tarefa"""
+    __tablename__ = "tarefa_arquivo"
+
+    titulo: Mapped[str]
+    descricao: Mapped[str]
+    status: Mapped[StatusTarefa] = mapped_column(SQLAlchemyEnum(StatusTarefa, name="status_tarefa"))
+    prioridade: Mapped[PrioridadeTarefa] = mapped_column(SQLAlchemyEnum(PrioridadeTarefa, name="prioridade_tarefa"))
+    data_vencimento: Mapped[datetime]
+    usuario_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("usuario.id"), index=True)
+    archived_at: Mapped[datetime] = mapped_column(default=now)
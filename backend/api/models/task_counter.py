@@ -0,0 +1,14 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey, UniqueConstraint, Enum as SQLAlchemyEnum
+from api.models.base import Base
+from api.models.task import StatusTarefa
+import uuid
+
+class ContadorTarefa(Base):
+    """Total de tarefas não excluídas por usuário e status, mantido na mesma transação das escritas em tarefa"""
+    __tablename__ = "tarefa_contador"
+    __table_args__ = (UniqueConstraint("usuario_id", "status", name="uq_tarefa_contador_usuario_status"),)
+
+    usuario_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("usuario.id"))
+    status: Mapped[StatusTarefa] = mapped_column(SQLAlchemyEnum(StatusTarefa, name="status_tarefa"))
+    total: Mapped[int] = mapped_column(default=0)
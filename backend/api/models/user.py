@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Index, func
 from typing import List
 
 from api.models.base import Base
@@ -7,7 +8,19 @@ class Usuario(Base):
     __tablename__ = "usuario"
 
     nome: Mapped[str]
-    email: Mapped[str] = mapped_column(unique=True, index=True)
+    email: Mapped[str] = mapped_column()
     senha: Mapped[str]
+    # Incrementado na troca de senha e na exclusão; tokens com versão anterior deixam de valer
+    token_version: Mapped[int] = mapped_column(default=0, server_default="0")
     
-    tarefas: Mapped[List["Tarefa"]] = relationship("Tarefa", back_populates="usuario")
\ No newline at end of file
+    tarefas: Mapped[List["Tarefa"]] = relationship("Tarefa", back_populates="usuario")
+
+    # Email é comparado sem diferenciar maiúsculas; o índice único em lower(email) atende às buscas
+    __table_args__ = (
+        Index("ix_usuario_email_lower", func.lower(email), unique=True),
+    )
+
+    @classmethod
+    def email_equals(cls, email: str):
+        """Condição por email que usa ix_usuario_email_lower"""
+        return func.lower(cls.email) == func.lower(email)
\ No newline at end of file
@@ -1,16 +1,13 @@
 from sqlalchemy import select
-from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.core.security import T_OAuth2Form, create_access_token
 from api.models.user import Usuario
 from api.repositories.usuario import UsuarioRepository
 from api.schemas.usuario import UsuarioRead
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 class ContaRepository:
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: AsyncSession):
         self.usuario_repository = UsuarioRepository(db_session)
         self.db_session = db_session
         
@@ -34,10 +31,10 @@ class ContaRepository:
             "token_type": "Bearer"
         }
         
-    def register(self, user_data: Usuario) -> UsuarioRead:
+    async def register(self, user_data: Usuario) -> UsuarioRead:
         """Registra novo usuário"""
-        return self.usuario_repository.add_user(user_data)
+        return await self.usuario_repository.add_user(user_data)
         
-    def get_me(self, user_id: int) -> UsuarioRead:
+    async def get_me(self, user_id: int) -> UsuarioRead:
         """Obtém dados do usuário logado"""
-        return self.usuario_repository.get_user_by_id(user_id)
\ No newline at end of file
+        return await self.usuario_repository.get_user_by_id(user_id)
\ No newline at end of file
@@ -0,0 +1,130 @@
+import hashlib
+import logging
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.decorators import handle_sqlalchemy_errors
+from api.core.exceptions import ExceptionUnauthorized
+from api.core.settings import Settings
+from api.models.base import now
+from api.models.refresh_token import TokenAtualizacao
+from api.models.user import Usuario
+
+settings = Settings()
+
+logger = logging.getLogger(__name__)
+
+def hash_token(token: str) -> str:
+    """SHA-256 basta: o token é aleatório (256 bits), não uma senha a proteger de dicionário"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+class RefreshTokenRepository:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    def _new(self, usuario_id: uuid.UUID, familia: Optional[uuid.UUID] = None) -> str:
+        """Adiciona um token à sessão, sem commit, e retorna o valor em claro"""
+        token = secrets.token_urlsafe(32)
+        self.db_session.add(TokenAtualizacao(
+            usuario_id=usuario_id,
+            token_hash=hash_token(token),
+            familia=familia or uuid.uuid4(),
+            expires_at=now() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        ))
+        return token
+
+    @handle_sqlalchemy_errors
+    async def issue(self, usuario_id: uuid.UUID) -> str:
+        """Emite o primeiro token de uma nova família (login)"""
+        token = self._new(usuario_id)
+        await self.db_session.commit()
+        return token
+
+    @handle_sqlalchemy_errors
+    async def rotate(self, token: str) -> Tuple[Usuario, str]:
+        """Troca um token válido por outro da mesma família.
+
+        O token é consumido por um único UPDATE condicional, então duas trocas
+        concorrentes do mesmo token não passam as duas: a segunda é tratada
+        como reuso e revoga a família.
+        """
+        token_hash = hash_token(token)
+        used_at = now()
+        stmt = (
+            update(TokenAtualizacao)
+            .where(
+                TokenAtualizacao.token_hash == token_hash,
+                TokenAtualizacao.used_at.is_(None),
+                TokenAtualizacao.revoked_at.is_(None),
+                TokenAtualizacao.expires_at > used_at,
+            )
+            .values(used_at=used_at)
+            .returning(TokenAtualizacao.usuario_id, TokenAtualizacao.familia)
+        )
+        consumed = (await self.db_session.execute(stmt)).first()
+        if consumed is None:
+            await self._revoke_reused(token_hash, used_at)
+            raise ExceptionUnauthorized("Refresh token inválido")
+
+        usuario = (await self.db_session.execute(
+            select(Usuario).where(Usuario.id == consumed.usuario_id, Usuario.flg_excluido == False)
+        )).scalar_one_or_none()
+        if usuario is None:
+            await self.db_session.rollback()
+            raise ExceptionUnauthorized("Refresh token inválido")
+
+        new_token = self._new(consumed.usuario_id, consumed.familia)
+        await self.db_session.commit()
+        return usuario, new_token
+
+    async def _revoke_reused(self, token_hash: str, revoked_at: datetime) -> None:
+        """Se o token já tinha sido trocado, alguém guardou uma cópia: revoga a família"""
+        familia = (await self.db_session.execute(
+            select(TokenAtualizacao.familia).where(
+                TokenAtualizacao.token_hash == token_hash,
+                TokenAtualizacao.used_at.is_not(None),
+            )
+        )).scalar_one_or_none()
+        if familia is None:
+            await self.db_session.rollback()
+            return
+        await self.db_session.execute(
+            update(TokenAtualizacao)
+            .where(TokenAtualizacao.familia == familia, TokenAtualizacao.revoked_at.is_(None))
+            .values(revoked_at=revoked_at)
+        )
+        await self.db_session.commit()
+        logger.warning("Refresh token reutilizado; família %s revogada", familia)
+
+    async def revoke_user(self, usuario_id: uuid.UUID) -> None:
+        """Revoga todos os tokens ativos do usuário, sem commit (usado junto de outras escritas)"""
+        await self.db_session.execute(
+            update(TokenAtualizacao)
+            .where(TokenAtualizacao.usuario_id == usuario_id, TokenAtualizacao.revoked_at.is_(None))
+            .values(revoked_at=now())
+        )
+
+    @handle_sqlalchemy_errors
+    async def revoke_all(self, usuario_id: uuid.UUID) -> None:
+        await self.revoke_user(usuario_id)
+        await self.db_session.commit()
+
+    async def purge(self, before: datetime, batch_size: int = 1000) -> int:
+        """Apaga em lotes os tokens expirados ou revogados antes de before"""
+        purged = 0
+        while True:
+            ids = select(TokenAtualizacao.id).where(
+                or_(TokenAtualizacao.expires_at < before, TokenAtualizacao.revoked_at < before)
+            ).limit(batch_size)
+            result = await self.db_session.execute(
+                delete(TokenAtualizacao).where(TokenAtualizacao.id.in_(ids.scalar_subquery()))
+            )
+            await self.db_session.commit()
+            purged += result.rowcount
+            if result.rowcount < batch_size:
+                return purged
@@ -1,18 +1,25 @@
+import re
 import uuid
+from collections import Counter
 from datetime import datetime
-from typing import List, Optional, Tuple
-from sqlalchemy import select, func, update
-from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+from typing import AsyncIterator, List, Optional, Tuple
+from sqlalchemy import select, func, update, insert, tuple_, and_, not_, or_, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.models.task import Tarefa
-from api.schemas.task import TaskCreate, TaskUpdate
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from api.core.decorators import handle_sqlalchemy_errors
+from api.core.exceptions import ExceptionNotFound
+from api.core.pagination import T_Cursor, next_cursor
+from api.models.base import now
+from api.models.task import SEARCH_CONFIG, SEARCH_VECTOR, Tarefa, StatusTarefa
+from api.repositories.task_archive import TaskArchiveRepository
+from api.repositories.task_counter import TaskCounterRepository
+from api.schemas.task import TaskCreate, TaskFilter, TaskSortField, SortOrder, TaskUpdate
 
 class TaskRepository:
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
+        self.counters = TaskCounterRepository(db_session)
+        self.archive = TaskArchiveRepository(db_session)
 
     def _not_excluido(self, usuario_id: Optional[uuid.UUID] = None):
         """Retorna a query base filtrada por tarefas não excluídas e do usuário específico"""
@@ -21,20 +28,20 @@ class TaskRepository:
             query = query.where(Tarefa.usuario_id == usuario_id)
         return query
 
-    def get_task_by_id(self, task_id: uuid.UUID, usuario_id: uuid.UUID) -> Tarefa | None:
+    async def get_task_by_id(self, task_id: uuid.UUID, usuario_id: uuid.UUID) -> Tarefa | None:
         """Busca uma tarefa pelo ID, garantindo que pertence ao usuário logado."""
         stmt = self._not_excluido(usuario_id).where(Tarefa.id == task_id)
-        result = self.db_session.execute(stmt)
+        result = await self.db_session.execute(stmt)
         return result.scalars().first()
 
-    def add_task(self, task_data: TaskCreate, usuario_id: Optional[uuid.UUID] = None) -> Tarefa:
+    async def add_task(self, task_data: TaskCreate, usuario_id: Optional[uuid.UUID] = None) -> Tarefa:
         """Adiciona uma nova tarefa ao banco de dados."""
         try:
             if not task_data.usuario_id:
                 task_data.usuario_id = usuario_id
                 
             if not task_data.data_vencimento:
-                task_data.data_vencimento = datetime.now()
+                task_data.data_vencimento = now()
             
             new_task = Tarefa(
                 titulo=task_data.titulo,
@@ -46,8 +53,9 @@ class TaskRepository:
             )
             
             self.db_session.add(new_task)
-            self.db_session.commit()
-            self.db_session.refresh(new_task)
+            await self.counters.apply(new_task.usuario_id, {new_task.status: 1})
+            await self.db_session.commit()
+            await self.db_session.refresh(new_task)
             
             # Ensure the task was created successfully
             if not new_task.id:
@@ -55,67 +63,296 @@ class TaskRepository:
                 
             return new_task
         except Exception as e:
-            self.db_session.rollback()
+            await self.db_session.rollback()
             raise Exception(f"Failed to create task: {str(e)}")
 
-    def list_tasks(self, usuario_id: uuid.UUID, skip: int = 0, limit: int = 100) -> Tuple[List[Tarefa], int]:
-        """Lista as tarefas do usuário logado com paginação."""
+    @handle_sqlalchemy_errors
+    async def add_tasks(self, tasks_data: List[TaskCreate], usuario_id: uuid.UUID) -> List[Tarefa]:
+        """Adiciona várias tarefas em uma única transação, com um INSERT ... RETURNING multi-linha."""
+        if not tasks_data:
+            return []
+        
+        created_at = now()
+        rows = [
+            {
+                "titulo": task_data.titulo,
+                "descricao": task_data.descricao,
+                "status": task_data.status,
+                "prioridade": task_data.prioridade,
+                "data_vencimento": task_data.data_vencimento or created_at,
+                "usuario_id": usuario_id,
+            }
+            for task_data in tasks_data
+        ]
+        
+        stmt = insert(Tarefa).returning(Tarefa, sort_by_parameter_order=True)
+        result = await self.db_session.scalars(stmt, rows)
+        new_tasks = result.all()
+        
+        await self.counters.apply(usuario_id, Counter(task.status for task in new_tasks))
+        await self.db_session.commit()
+        return new_tasks
+
+    def _filter_conditions(self, filtro: Optional[TaskFilter]) -> list:
+        """Converte o filtro de tarefas em condições SQL"""
+        conditions = []
+        if filtro is None:
+            return conditions
+        if filtro.status is not None:
+            conditions.append(Tarefa.status == filtro.status)
+        if filtro.prioridade is not None:
+            conditions.append(Tarefa.prioridade == filtro.prioridade)
+        if filtro.data_vencimento_de is not None:
+            conditions.append(Tarefa.data_vencimento >= filtro.data_vencimento_de)
+        if filtro.data_vencimento_ate is not None:
+            conditions.append(Tarefa.data_vencimento <= filtro.data_vencimento_ate)
+        if filtro.atrasadas is not None:
+            atrasada = and_(Tarefa.status == StatusTarefa.PENDENTE, Tarefa.data_vencimento < now())
+            conditions.append(atrasada if filtro.atrasadas else not_(atrasada))
+        return conditions
+
+    def _bulk_where(self, usuario_id: uuid.UUID, ids: Optional[List[uuid.UUID]], filtro: Optional[TaskFilter]) -> list:
+        """Condições das operações em lote: sempre restritas às tarefas não excluídas do usuário"""
+        conditions = [Tarefa.usuario_id == usuario_id, Tarefa.flg_excluido == False]
+        if ids is not None:
+            conditions.append(Tarefa.id.in_(ids))
+        return conditions + self._filter_conditions(filtro)
+
+    def _status_update_stmt(self, stmt, usuario_id: uuid.UUID, conditions: list):
+        """UPDATE do Postgres que devolve (tarefa, status anterior) em um único comando.
+
+        O FROM trava as linhas selecionadas e traz o status anterior para o RETURNING.
+        """
+        anterior = (
+            select(Tarefa.id, Tarefa.status.label("status_anterior"))
+            .where(*conditions)
+            .with_for_update()
+            .subquery("anterior")
+        )
+        # usuario_id também no UPDATE externo: com tarefa particionada por hash, o join só pelo id visitaria todas as partições
+        return stmt.where(Tarefa.id == anterior.c.id, Tarefa.usuario_id == usuario_id).returning(Tarefa, anterior.c.status_anterior)
+
+    async def _update_counted(self, usuario_id: uuid.UUID, conditions: list, values: dict) -> List[Tarefa]:
+        """UPDATE ... RETURNING das tarefas selecionadas, ajustando os contadores pela diferença de status.
+
+        Não faz commit. As condições precisam incluir flg_excluido = false, já que só
+        tarefas não excluídas entram nos contadores.
+        """
+        stmt = update(Tarefa).values(**values).execution_options(synchronize_session=False, populate_existing=True)
+        anteriores = {}
+        if "status" not in values:
+            # O status não muda: o valor retornado é também o anterior
+            stmt = stmt.where(*conditions).returning(Tarefa, Tarefa.status)
+        elif self.db_session.get_bind().dialect.name == "postgresql":
+            stmt = self._status_update_stmt(stmt, usuario_id, conditions)
+        else:
+            # SQLite não permite o FROM no RETURNING: lê o status anterior antes, na mesma transação
+            result = await self.db_session.execute(select(Tarefa.id, Tarefa.status).where(*conditions))
+            anteriores = dict(result.all())
+            stmt = stmt.where(*conditions, Tarefa.id.in_(anteriores)).returning(Tarefa, Tarefa.status)
+        
+        result = await self.db_session.execute(stmt)
+        rows = result.all()
+        
+        deltas = Counter()
+        for task, status_anterior in rows:
+            deltas[anteriores.get(task.id, status_anterior)] -= 1
+            if not task.flg_excluido:
+                deltas[task.status] += 1
+        await self.counters.apply(usuario_id, deltas)
+        return [task for task, _ in rows]
+
+    @handle_sqlalchemy_errors
+    async def update_tasks(self, usuario_id: uuid.UUID, values: dict, ids: Optional[List[uuid.UUID]] = None, filtro: Optional[TaskFilter] = None) -> List[uuid.UUID]:
+        """Atualiza em um único UPDATE as tarefas selecionadas e retorna os IDs afetados."""
+        tasks = await self._update_counted(usuario_id, self._bulk_where(usuario_id, ids, filtro), values)
+        updated_ids = [task.id for task in tasks]
+        
+        await self.db_session.commit()
+        return updated_ids
+
+    async def delete_tasks(self, usuario_id: uuid.UUID, ids: Optional[List[uuid.UUID]] = None, filtro: Optional[TaskFilter] = None) -> List[uuid.UUID]:
+        """Marca como excluídas (exclusão lógica) em um único UPDATE as tarefas selecionadas."""
+        return await self.update_tasks(usuario_id, {"flg_excluido": True}, ids, filtro)
+
+    def _list_stmt(
+        self,
+        usuario_id: uuid.UUID,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[T_Cursor] = None,
+        filtro: Optional[TaskFilter] = None,
+        sort_by: TaskSortField = TaskSortField.CREATED_AT,
+        order: SortOrder = SortOrder.DESC,
+    ):
+        """Query da listagem; lê limit + 1 linhas para saber se existe próxima página"""
+        column = getattr(Tarefa, sort_by.value)
+        if order == SortOrder.DESC:
+            order_by = (column.desc(), Tarefa.id.desc())
+        else:
+            order_by = (column.asc(), Tarefa.id.asc())
         stmt = (
             self._not_excluido(usuario_id)
-            .order_by(Tarefa.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+            .where(*self._filter_conditions(filtro))
+            .order_by(*order_by)
+            .limit(limit + 1)
+        )
+        if after:
+            key = tuple_(column, Tarefa.id)
+            return stmt.where(key < tuple_(*after) if order == SortOrder.DESC else key > tuple_(*after))
+        return stmt.offset(skip)
+
+    def _count_stmt(self, usuario_id: uuid.UUID, filtro: Optional[TaskFilter] = None):
+        """Total da listagem: lido dos contadores quando o filtro é só por status, count(*) nos demais casos."""
+        filtro_status = filtro.model_dump(exclude_none=True, exclude={"status"}) if filtro else {}
+        if not filtro_status:
+            return self.counters.total_stmt(usuario_id, filtro.status if filtro else None)
+        
+        return select(func.count()).select_from(
+            self._not_excluido(usuario_id).where(*self._filter_conditions(filtro)).subquery()
+        )
+
+    async def _count(self, usuario_id: uuid.UUID, filtro: Optional[TaskFilter] = None) -> int:
+        total_result = await self.db_session.execute(self._count_stmt(usuario_id, filtro))
+        return total_result.scalar_one()
+
+    async def list_version(self, usuario_id: uuid.UUID, filtro: Optional[TaskFilter] = None) -> Tuple[Optional[datetime], int]:
+        """max(updated_at) e total da listagem num único SELECT (usados no ETag).
+
+        O total vem de _count, então sem filtro ou só com status é lido dos
+        contadores; a listagem o reaproveita em vez de contar de novo.
+        """
+        updated_at = (
+            select(func.max(Tarefa.updated_at))
+            .where(Tarefa.usuario_id == usuario_id, Tarefa.flg_excluido == False)
+            .where(*self._filter_conditions(filtro))
         )
-        tasks_result = self.db_session.execute(stmt)
+        stmt = select(updated_at.scalar_subquery(), self._count_stmt(usuario_id, filtro).scalar_subquery())
+        result = await self.db_session.execute(stmt)
+        return tuple(result.one())
+
+    async def list_tasks(
+        self,
+        usuario_id: uuid.UUID,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[T_Cursor] = None,
+        filtro: Optional[TaskFilter] = None,
+        sort_by: TaskSortField = TaskSortField.CREATED_AT,
+        order: SortOrder = SortOrder.DESC,
+        total: Optional[int] = None,
+    ) -> Tuple[List[Tarefa], int, Optional[str]]:
+        """Lista as tarefas do usuário logado com filtros, ordenação e paginação por offset ou por cursor.
+
+        total, quando já conhecido (list_version), evita contar de novo.
+        """
+        stmt = self._list_stmt(usuario_id, skip, limit, after, filtro, sort_by, order)
+        tasks_result = await self.db_session.execute(stmt)
         tasks = tasks_result.scalars().all()
         
-        count_stmt = select(func.count()).select_from(self._not_excluido(usuario_id))
-        total_result = self.db_session.execute(count_stmt)
-        total = total_result.scalar_one()
+        if total is None:
+            total = await self._count(usuario_id, filtro)
         
-        return tasks, total
+        return tasks[:limit], total, next_cursor(tasks, limit, f"{sort_by.value}:{order.value}")
     
-    def update_task(self, task_id: uuid.UUID, task_data: TaskUpdate, usuario_id: uuid.UUID) -> Tarefa:
-        """Atualiza os dados de uma tarefa existente, garantindo que pertence ao usuário logado."""
+    async def stream_tasks(
+        self, usuario_id: uuid.UUID, filtro: Optional[TaskFilter] = None, batch_size: int = 1000
+    ) -> AsyncIterator[List[Tarefa]]:
+        """Lê as tarefas do usuário em lotes a partir de um cursor no servidor, sem carregar tudo em memória.
+
+        Consumido pelo StreamingResponse depois que a dependência da sessão já a fechou:
+        a sessão abre uma nova conexão sob demanda e é fechada ao final do stream.
+        """
+        stmt = (
+            self._not_excluido(usuario_id)
+            .where(*self._filter_conditions(filtro))
+            .order_by(Tarefa.created_at.desc(), Tarefa.id.desc())
+            .execution_options(yield_per=batch_size)
+        )
         try:
-            update_data = task_data.model_dump(exclude_unset=True)
-            
-            stmt = (
-                update(Tarefa)
-                .where(Tarefa.id == task_id)
-                .where(Tarefa.usuario_id == usuario_id)
-                .values(**update_data)
-                .returning(Tarefa)
+            result = await self.db_session.stream_scalars(stmt)
+            async for partition in result.partitions():
+                yield partition
+        finally:
+            await self.db_session.close()
+
+    def _search_stmt(self, usuario_id: uuid.UUID, q: str, dialect: str):
+        """Query da busca textual, já ordenada por relevância.
+
+        No Postgres usa a coluna tsvector "busca" (título e descrição, índice GIN),
+        com o último termo como prefixo; o serviço já recusou termos menores que
+        TASK_SEARCH_MIN_FTS_LENGTH. Em outros bancos (testes) cai para LIKE.
+        """
+        base = self._not_excluido(usuario_id)
+        if dialect != "postgresql":
+            return (
+                base.where(or_(Tarefa.titulo.icontains(q, autoescape=True), Tarefa.descricao.icontains(q, autoescape=True)))
+                .order_by(Tarefa.created_at.desc(), Tarefa.id.desc())
             )
-            
-            result = self.db_session.execute(stmt)
-            updated_task = result.scalars().first()
-            
-            if not updated_task:
-                raise Exception("Tarefa não encontrada ou não pertence ao usuário logado")
-            
-            self.db_session.commit()
-            self.db_session.refresh(updated_task)
-            return updated_task
-        except Exception as e:
-            self.db_session.rollback()
-            raise Exception(f"Failed to update task: {str(e)}")
+        
+        terms = re.findall(r"\w+", q)
+        query = func.to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), " & ".join(terms) + ":*")
+        return (
+            base.where(SEARCH_VECTOR.bool_op("@@")(query))
+            .order_by(func.ts_rank_cd(SEARCH_VECTOR, query).desc(), Tarefa.created_at.desc(), Tarefa.id.desc())
+        )
+
+    async def search_tasks(self, usuario_id: uuid.UUID, q: str, skip: int = 0, limit: int = 100) -> Tuple[List[Tarefa], int]:
+        """Busca tarefas do usuário logado por título e descrição, ordenadas por relevância."""
+        stmt = self._search_stmt(usuario_id, q, self.db_session.get_bind().dialect.name)
+        
+        tasks_result = await self.db_session.execute(stmt.offset(skip).limit(limit))
+        tasks = tasks_result.scalars().all()
+        
+        count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+        total_result = await self.db_session.execute(count_stmt)
+        total = total_result.scalar_one()
+        
+        return tasks, total
     
-    def delete_task(self, task_id: uuid.UUID, usuario_id: uuid.UUID) -> None:
-        """Marca uma tarefa como excluído (exclusão lógica), garantindo que pertence ao usuário logado."""
-        try:
-            stmt = (
-                update(Tarefa)
-                .where(Tarefa.id == task_id)
-                .where(Tarefa.usuario_id == usuario_id)
-                .values(flg_excluido=True)
-            )
-            result = self.db_session.execute(stmt)
-            
-            if result.rowcount == 0:
-                raise Exception("Tarefa não encontrada ou não pertence ao usuário logado")
-                
-            self.db_session.commit()
-        except Exception as e:
-            self.db_session.rollback()
-            raise Exception(f"Failed to delete task: {str(e)}")
\ No newline at end of file
+    def _task_where(self, task_id: uuid.UUID, usuario_id: uuid.UUID) -> list:
+        """Condições de uma tarefa não excluída do usuário logado"""
+        return [Tarefa.id == task_id, Tarefa.usuario_id == usuario_id, Tarefa.flg_excluido == False]
+
+    @handle_sqlalchemy_errors
+    async def update_task(self, task_id: uuid.UUID, task_data: TaskUpdate, usuario_id: uuid.UUID) -> Tarefa:
+        """Atualiza a tarefa em um único UPDATE ... RETURNING; tarefa inexistente, de outro usuário ou excluída gera 404."""
+        # Trocar o dono da tarefa deixaria os contadores dos dois usuários errados
+        update_data = task_data.model_dump(exclude_unset=True, exclude={"usuario_id"})
+        
+        tasks = await self._update_counted(usuario_id, self._task_where(task_id, usuario_id), update_data)
+        if not tasks:
+            raise ExceptionNotFound("Tarefa não encontrada.")
+        
+        await self.db_session.commit()
+        return tasks[0]
+    
+    @handle_sqlalchemy_errors
+    async def delete_task(self, task_id: uuid.UUID, usuario_id: uuid.UUID) -> None:
+        """Marca a tarefa como excluída (exclusão lógica) em um único UPDATE; tarefa inexistente ou já excluída gera 404."""
+        tasks = await self._update_counted(usuario_id, self._task_where(task_id, usuario_id), {"flg_excluido": True})
+        if not tasks:
+            raise ExceptionNotFound("Tarefa não encontrada.")
+        
+        await self.db_session.commit()
+
+    @handle_sqlalchemy_errors
+    async def restore_task(self, task_id: uuid.UUID, usuario_id: uuid.UUID) -> Tarefa:
+        """Desfaz a exclusão lógica; se a tarefa já foi arquivada, traz de volta de tarefa_arquivo. Senão gera 404."""
+        stmt = (
+            update(Tarefa)
+            .where(Tarefa.id == task_id, Tarefa.usuario_id == usuario_id, Tarefa.flg_excluido == True)
+            .values(flg_excluido=False)
+            .returning(Tarefa)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await self.db_session.execute(stmt)
+        task = result.scalars().first()
+        if task is None:
+            task = await self.archive.unarchive(task_id, usuario_id)
+        if task is None:
+            raise ExceptionNotFound("Tarefa não encontrada.")
+        
+        await self.counters.apply(usuario_id, {task.status: 1})
+        await self.db_session.commit()
+        return task
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.models.base import now
+from api.models.task import Tarefa
+from api.models.task_archive import TarefaArquivo
+
+logger = logging.getLogger(__name__)
+
+# Colunas de tarefa copiadas para o arquivo (a coluna gerada "busca" fica de fora e é recalculada ao restaurar)
+COLUMNS = [column.name for column in Tarefa.__table__.columns]
+
+class TaskArchiveRepository:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    def _dialect(self) -> str:
+        return self.db_session.get_bind().dialect.name
+
+    def _candidates(self, before: datetime, batch_size: int):
+        """Lote seguinte: tarefas excluídas antes de before, as mais antigas primeiro (índice ix_tarefa_excluido_updated_at)"""
+        return (
+            select(Tarefa.id)
+            .where(Tarefa.flg_excluido == True, Tarefa.updated_at < before)
+            .order_by(Tarefa.updated_at, Tarefa.id)
+            .limit(batch_size)
+        )
+
+    async def archive_batch(self, before: datetime, batch_size: int) -> int:
+        """Move para tarefa_arquivo um lote de tarefas excluídas antes de before, numa transação própria.
+
+        Cada lote é confirmado sozinho: interromper o job perde no máximo o lote
+        corrente (desfeito por inteiro), e a próxima execução continua de onde
+        parou, já que as tarefas movidas saem de tarefa.
+        """
+        archived_at = now()
+        selected = self._candidates(before, batch_size)
+        if self._dialect() == "postgresql":
+            # Um único comando: DELETE ... RETURNING numa CTE alimenta o INSERT, sem trazer as linhas para
+            # a aplicação. SKIP LOCKED deixa dois jobs simultâneos pegarem lotes diferentes.
+            moved = (
+                delete(Tarefa)
+                .where(Tarefa.id.in_(selected.with_for_update(skip_locked=True).scalar_subquery()))
+                .returning(*[Tarefa.__table__.c[name] for name in COLUMNS])
+                .cte("moved")
+            )
+            stmt = insert(TarefaArquivo).from_select(
+                COLUMNS + ["archived_at"],
+                select(*[moved.c[name] for name in COLUMNS], literal(archived_at, TarefaArquivo.archived_at.type)),
+            )
+            result = await self.db_session.execute(stmt)
+            archived = result.rowcount
+        else:
+            # SQLite não aceita DML em CTE: DELETE ... RETURNING e INSERT na mesma transação
+            result = await self.db_session.execute(
+                delete(Tarefa)
+                .where(Tarefa.id.in_(selected.scalar_subquery()))
+                .returning(*[Tarefa.__table__.c[name] for name in COLUMNS])
+                .execution_options(synchronize_session=False)
+            )
+            rows = [{**row, "archived_at": archived_at} for row in result.mappings()]
+            if rows:
+                await self.db_session.execute(insert(TarefaArquivo), rows)
+            archived = len(rows)
+
+        await self.db_session.commit()
+        return archived
+
+    async def archive(
+        self,
+        before: datetime,
+        batch_size: int = 500,
+        pause_seconds: float = 0.0,
+        max_batches: Optional[int] = None,
+    ) -> int:
+        """Arquiva em lotes até não sobrar tarefa elegível ou até max_batches.
+
+        pause_seconds entre os lotes limita a carga (WAL, réplicas, vacuum) que o
+        job impõe ao primário.
+        """
+        archived = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            start = time.perf_counter()
+            moved = await self.archive_batch(before, batch_size)
+            archived += moved
+            batches += 1
+            logger.info("Arquivamento: lote de %d tarefas em %.3fs", moved, time.perf_counter() - start)
+            if moved < batch_size:
+                break
+            if pause_seconds:
+                await asyncio.sleep(pause_seconds)
+        return archived
+
+    async def unarchive(self, task_id: uuid.UUID, usuario_id: uuid.UUID) -> Optional[Tarefa]:
+        """Tira a tarefa do arquivo e a devolve a tarefa como não excluída, sem commit"""
+        result = await self.db_session.execute(
+            delete(TarefaArquivo)
+            .where(TarefaArquivo.id == task_id, TarefaArquivo.usuario_id == usuario_id)
+            .returning(*[TarefaArquivo.__table__.c[name] for name in COLUMNS])
+            .execution_options(synchronize_session=False)
+        )
+        row = result.mappings().first()
+        if row is None:
+            return None
+
+        task = Tarefa(**{**row, "flg_excluido": False, "updated_at": now()})
+        self.db_session.add(task)
+        await self.db_session.flush()
+        return task
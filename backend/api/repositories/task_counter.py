@@ -0,0 +1,101 @@
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import select, func, delete, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.models.task import Tarefa, StatusTarefa
+from api.models.task_counter import ContadorTarefa
+
+class TaskCounterRepository:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    def _dialect(self) -> str:
+        return self.db_session.get_bind().dialect.name
+
+    def _upsert(self, rows: List[dict], set_: Callable[[Any], dict]):
+        """INSERT ... ON CONFLICT (usuario_id, status) DO UPDATE com os valores de set_(excluded)"""
+        insert = postgresql.insert if self._dialect() == "postgresql" else sqlite.insert
+        stmt = insert(ContadorTarefa).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=[ContadorTarefa.usuario_id, ContadorTarefa.status],
+            set_=set_(stmt.excluded),
+        )
+
+    async def apply(self, usuario_id: uuid.UUID, deltas: Dict[StatusTarefa, int]) -> None:
+        """Soma os deltas aos contadores do usuário sem fazer commit: roda na transação de quem alterou as tarefas."""
+        # Ordem fixa de status para que transações concorrentes travem as linhas na mesma ordem
+        rows = [
+            {"usuario_id": usuario_id, "status": status, "total": delta}
+            for status, delta in sorted(deltas.items())
+            if delta
+        ]
+        if not rows:
+            return
+        
+        await self.db_session.execute(self._upsert(
+            rows, lambda excluded: {"total": ContadorTarefa.total + excluded.total, "updated_at": excluded.updated_at},
+        ))
+
+    def total_stmt(self, usuario_id: uuid.UUID, status: Optional[StatusTarefa] = None):
+        """SELECT do total de tarefas não excluídas do usuário, opcionalmente de um status."""
+        stmt = select(func.coalesce(func.sum(ContadorTarefa.total), 0)).where(ContadorTarefa.usuario_id == usuario_id)
+        if status is not None:
+            stmt = stmt.where(ContadorTarefa.status == status)
+        return stmt
+
+    async def total(self, usuario_id: uuid.UUID, status: Optional[StatusTarefa] = None) -> int:
+        """Total de tarefas não excluídas do usuário, opcionalmente de um status."""
+        result = await self.db_session.execute(self.total_stmt(usuario_id, status))
+        return result.scalar_one()
+
+    async def rebuild(self, usuario_id: Optional[uuid.UUID] = None, batch_size: int = 1000) -> int:
+        """Recalcula os contadores a partir da tabela tarefa, de todos os usuários ou de um só."""
+        if usuario_id is not None:
+            written = await self._rebuild_user(usuario_id)
+        else:
+            written = await self._rebuild_all(batch_size)
+        await self.db_session.commit()
+        return written
+
+    async def _rebuild_user(self, usuario_id: uuid.UUID) -> int:
+        """Recalcula os contadores de um usuário travando só as linhas dele; os demais seguem escrevendo."""
+        # Upsert sem efeito só para travar uma linha por status, inclusive as que ainda não existem,
+        # na mesma ordem do apply; os incrementos do usuário esperam o commit. Escritas já em
+        # andamento terminam antes, e a contagem (novo snapshot) as inclui.
+        rows = [{"usuario_id": usuario_id, "status": status, "total": 0} for status in sorted(StatusTarefa)]
+        await self.db_session.execute(self._upsert(rows, lambda excluded: {"total": ContadorTarefa.total}))
+        
+        result = await self.db_session.execute(
+            select(Tarefa.status, func.count())
+            .where(Tarefa.usuario_id == usuario_id, Tarefa.flg_excluido == False)
+            .group_by(Tarefa.status)
+        )
+        totals = dict(result.all())
+        for row in rows:
+            row["total"] = totals.get(row["status"], 0)
+        await self.db_session.execute(self._upsert(
+            rows, lambda excluded: {"total": excluded.total, "updated_at": excluded.updated_at},
+        ))
+        return len(rows)
+
+    async def _rebuild_all(self, batch_size: int) -> int:
+        if self._dialect() == "postgresql":
+            # Bloqueia os incrementos concorrentes até o commit para não perder atualizações
+            await self.db_session.execute(text("LOCK TABLE tarefa_contador IN SHARE ROW EXCLUSIVE MODE"))
+        
+        await self.db_session.execute(delete(ContadorTarefa))
+        count_stmt = (
+            select(Tarefa.usuario_id, Tarefa.status, func.count())
+            .where(Tarefa.flg_excluido == False)
+            .group_by(Tarefa.usuario_id, Tarefa.status)
+        )
+        
+        written = 0
+        result = await self.db_session.stream(count_stmt.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            rows = [{"usuario_id": row[0], "status": row[1], "total": row[2]} for row in partition]
+            await self.db_session.execute(ContadorTarefa.__table__.insert(), rows)
+            written += len(rows)
+        return written
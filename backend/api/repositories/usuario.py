@@ -1,88 +1,110 @@
-from typing import List, Tuple
-from sqlalchemy import select, func, update
-from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+from typing import List, Optional, Tuple
+from sqlalchemy import select, func, update, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.core.cache import invalidate_user
 from api.core.decorators import handle_sqlalchemy_errors
+from api.core.pagination import T_Cursor, next_cursor
 from api.core.exceptions import ExceptionConflict
+from api.core.hashing import hash_password
 from api.models.user import Usuario
+from api.repositories.refresh_token import RefreshTokenRepository
 from api.schemas.usuario import UsuarioCreate
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 class UsuarioRepository:
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
+        self.refresh_tokens = RefreshTokenRepository(db_session)
 
     def _not_excluido(self):
         """Retorna a query base filtrada por usuários não excluídos"""
         return select(Usuario).where(Usuario.flg_excluido == False)
 
-    def get_user_by_email(self, email: str) -> Usuario | None:
-        """Busca um usuário pelo email."""
-        stmt = self._not_excluido().where(Usuario.email.ilike(email))
-        result = self.db_session.execute(stmt)
+    def _by_email(self, email: str):
+        return self._not_excluido().where(Usuario.email_equals(email))
+
+    async def get_user_by_email(self, email: str) -> Usuario | None:
+        """Busca um usuário pelo email, sem diferenciar maiúsculas."""
+        stmt = self._by_email(email)
+        result = await self.db_session.execute(stmt)
         return result.scalars().first()
 
     @handle_sqlalchemy_errors
-    def add_user(self, user_data: UsuarioCreate) -> Usuario:
+    async def add_user(self, user_data: UsuarioCreate) -> Usuario:
         """Adiciona um novo usuário ao banco de dados."""
         new_user = Usuario(
             nome=user_data.nome,
             email=user_data.email,
-            senha=pwd_context.hash(user_data.senha)
+            senha=await hash_password(user_data.senha)
         )
         
         self.db_session.add(new_user)
-        self.db_session.commit()
-        self.db_session.refresh(new_user)
+        await self.db_session.commit()
+        await self.db_session.refresh(new_user)
         return new_user
 
-    def get_user_by_id(self, user_id: int) -> Usuario | None:
+    async def get_user_by_id(self, user_id: int) -> Usuario | None:
         """Busca um usuário pelo ID."""
         stmt = self._not_excluido().where(Usuario.id == user_id)
-        result = self.db_session.execute(stmt)
+        result = await self.db_session.execute(stmt)
         return result.scalars().first()
     
-    def list_users(self, skip: int = 0, limit: int = 100) -> Tuple[List[Usuario], int]:
-        """Lista os usuários com paginação."""
+    async def list_users(self, skip: int = 0, limit: int = 100, after: Optional[T_Cursor] = None) -> Tuple[List[Usuario], int, Optional[str]]:
+        """Lista os usuários com paginação por offset ou por cursor (created_at, id)."""
         stmt = (
             self._not_excluido()
-            .order_by(Usuario.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+            .order_by(Usuario.created_at.desc(), Usuario.id.desc())
+            .limit(limit + 1)
         )
-        users_result = self.db_session.execute(stmt)
+        if after:
+            stmt = stmt.where(tuple_(Usuario.created_at, Usuario.id) < tuple_(*after))
+        else:
+            stmt = stmt.offset(skip)
+        users_result = await self.db_session.execute(stmt)
         users = users_result.scalars().all()
         
-        count_stmt = select(func.count()).select_from(self._not_excluido())
-        total_result = self.db_session.execute(count_stmt)
+        count_stmt = select(func.count()).select_from(self._not_excluido().subquery())
+        total_result = await self.db_session.execute(count_stmt)
         total = total_result.scalar_one()
         
-        return users, total
+        return users[:limit], total, next_cursor(users, limit)
     
-    def update_password(self, user_id: int, new_password: str) -> None:
+    async def update_password(self, user_id: int, new_password: str) -> None:
         """Atualiza apenas a senha do usuário"""
-        hashed_password = pwd_context.hash(new_password)
+        hashed_password = await hash_password(new_password)
+        stmt = (
+            update(Usuario)
+            .where(Usuario.id == user_id)
+            .values(senha=hashed_password, token_version=Usuario.token_version + 1)
+        )
+        await self.db_session.execute(stmt)
+        await self.refresh_tokens.revoke_user(user_id)
+        await self.db_session.commit()
+        invalidate_user(user_id)
+    
+    async def update_password_hash(self, user_id: int, hashed_password: str) -> None:
+        """Grava um hash de senha já calculado (rehash da mesma senha; não revoga tokens)"""
         stmt = (
             update(Usuario)
             .where(Usuario.id == user_id)
             .values(senha=hashed_password)
         )
-        self.db_session.execute(stmt)
-        self.db_session.commit()
+        await self.db_session.execute(stmt)
+        await self.db_session.commit()
+        invalidate_user(user_id)
     
-    def update_user(self, user_id: int, user_data: UsuarioCreate) -> Usuario:
+    async def update_user(self, user_id: int, user_data: UsuarioCreate) -> Usuario:
         """Atualiza os dados de um usuário existente."""
         if "email" in user_data.model_dump(exclude_unset=True):
-            existing_user = self.get_user_by_email(user_data.email)
+            existing_user = await self.get_user_by_email(user_data.email)
             if existing_user and existing_user.id != user_id:
                 raise ExceptionConflict("Email já cadastrado.")
         
         update_data = user_data.model_dump(exclude_unset=True)
         
         if "senha" in update_data:
-            update_data["senha"] = pwd_context.hash(update_data["senha"])
+            update_data["senha"] = await hash_password(update_data["senha"])
+            update_data["token_version"] = Usuario.token_version + 1
         
         stmt = (
             update(Usuario)
@@ -91,19 +113,24 @@ class UsuarioRepository:
             .returning(Usuario)
         )
         
-        result = self.db_session.execute(stmt)
+        result = await self.db_session.execute(stmt)
         updated_user = result.scalars().first()
+        if "senha" in update_data:
+            await self.refresh_tokens.revoke_user(user_id)
         
-        self.db_session.commit()
-        self.db_session.refresh(updated_user)
+        await self.db_session.commit()
+        invalidate_user(user_id)
+        await self.db_session.refresh(updated_user)
         return updated_user
     
-    def delete_user(self, user_id: int) -> None:
+    async def delete_user(self, user_id: int) -> None:
         """Marca um usuário como excluído (exclusão lógica)."""
         stmt = (
             update(Usuario)
             .where(Usuario.id == user_id)
-            .values(flg_excluido=True)
+            .values(flg_excluido=True, token_version=Usuario.token_version + 1)
         )
-        self.db_session.execute(stmt)
-        self.db_session.commit()
\ No newline at end of file
+        await self.db_session.execute(stmt)
+        await self.refresh_tokens.revoke_user(user_id)
+        await self.db_session.commit()
+        invalidate_user(user_id)
\ No newline at end of file
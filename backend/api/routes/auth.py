@@ -1,9 +1,11 @@
 from starlette import status
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from api.core.security import T_OAuth2Form
+from api.core.throttle import check_login_throttle
 from api.core.dependencies import T_ContaDeps, T_CurrentUser
 
+from api.schemas.conta import RefreshRequest
 from api.schemas.usuario import UsuarioCreate, UsuarioRead
 
 router = APIRouter(
@@ -13,15 +15,19 @@ router = APIRouter(
 
 @router.post('/register', status_code=status.HTTP_201_CREATED)
 async def create_user(user: UsuarioCreate, deps: T_ContaDeps):
-    return deps.conta_service.register(user)
+    return await deps.conta_service.register(user)
 
-@router.post("/login", status_code=status.HTTP_200_OK)
+@router.post("/login", status_code=status.HTTP_200_OK, dependencies=[Depends(check_login_throttle)])
 async def user_login(form_data: T_OAuth2Form, deps: T_ContaDeps):
-    return deps.conta_service.login(form_data)
+    return await deps.conta_service.login(form_data)
 
 @router.post("/refresh", status_code=status.HTTP_200_OK)
-async def refresh_token(current_user: T_CurrentUser, deps: T_ContaDeps):
-    return deps.conta_service.refresh_token(current_user)
+async def refresh_token(data: RefreshRequest, deps: T_ContaDeps):
+    return await deps.conta_service.refresh_token(data.refresh_token)
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(current_user: T_CurrentUser, deps: T_ContaDeps):
+    await deps.conta_service.logout(current_user)
 
 @router.get(
     "/me", 
@@ -29,4 +35,4 @@ async def refresh_token(current_user: T_CurrentUser, deps: T_ContaDeps):
     response_model=UsuarioRead,
 )
 async def get_me(current_user: T_CurrentUser, deps: T_ContaDeps):
-    return deps.conta_service.get_me(current_user.id)
\ No newline at end of file
+    return await deps.conta_service.get_me(current_user.id)
\ No newline at end of file
@@ -1,42 +1,129 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from typing import Annotated, Any, List, Optional
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status, HTTPException
+from fastapi.responses import StreamingResponse
 
 from api.core.dependencies import T_CurrentUser, T_Session, T_TaskDeps
+from api.core.etag import etag_matches, not_modified
+from api.core.serialization import render
 from api.core.response_model import SingleResponse, PaginatedResponse
 from api.core.security import get_current_user
 
-from api.schemas.task import TaskCreate, TaskRead, TaskUpdate
+from api.schemas.task import ExportFormat, TaskBulkCreateResponse, TaskBulkResult, TaskBulkSelection, TaskBulkUpdate, TaskCreate, TaskFilter, TaskRead, TaskSortField, SortOrder, TaskUpdate
 
 router = APIRouter(prefix="/tarefas", tags=["Tarefas"], dependencies=[Depends(get_current_user)])
 
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
 @router.get("/", response_model=PaginatedResponse[TaskRead])
-async def get_all(db: T_Session, current_user: T_CurrentUser, deps: T_TaskDeps, skip: int = 0, limit: int = 100):
-    items, total = deps.task_service.list_tasks(current_user.id, skip, limit)
-    return {"total": total, "data": items}
+async def get_all(
+    request: Request,
+    response: Response,
+    db: T_Session,
+    current_user: T_CurrentUser,
+    deps: T_TaskDeps,
+    filtro: Annotated[TaskFilter, Depends()],
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    ordenar_por: TaskSortField = TaskSortField.CREATED_AT,
+    ordem: SortOrder = SortOrder.DESC,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    etag, total = await deps.task_service.list_etag(current_user.id, filtro, sorted(request.query_params.multi_items()))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    
+    items, total, next_cursor = await deps.task_service.list_tasks(current_user.id, skip, limit, cursor, filtro, ordenar_por, ordem, total)
+    return render(PaginatedResponse[TaskRead], {"total": total, "data": items, "next_cursor": next_cursor}, response)
+
+@router.get("/export")
+async def export(
+    current_user: T_CurrentUser,
+    deps: T_TaskDeps,
+    filtro: Annotated[TaskFilter, Depends()],
+    formato: Annotated[ExportFormat, Query(alias="format")] = ExportFormat.NDJSON,
+):
+    return StreamingResponse(
+        deps.task_service.export_tasks(current_user.id, formato, filtro),
+        media_type=EXPORT_MEDIA_TYPES[formato],
+        headers={"Content-Disposition": f'attachment; filename="tarefas.{formato.value}"'},
+    )
+
+@router.get("/search", response_model=PaginatedResponse[TaskRead])
+async def search(
+    response: Response,
+    db: T_Session,
+    current_user: T_CurrentUser,
+    deps: T_TaskDeps,
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    skip: int = 0,
+    limit: int = 100,
+):
+    items, total = await deps.task_service.search_tasks(current_user.id, q, skip, limit)
+    return render(PaginatedResponse[TaskRead], {"total": total, "data": items}, response)
 
 @router.get("/{id}", response_model=SingleResponse[TaskRead])
-async def get_by_id(id: str, db: T_Session, deps: T_TaskDeps, current_user: T_CurrentUser):
-    item = deps.task_service.get_task_by_id(id, current_user.id)
+async def get_by_id(
+    id: str,
+    response: Response,
+    db: T_Session,
+    deps: T_TaskDeps,
+    current_user: T_CurrentUser,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    item = await deps.task_service.get_task_by_id(id, current_user.id)
     if not item:
         raise HTTPException(status_code=404, detail="Tarefa não encontrada")
+    
+    etag = deps.task_service.task_etag(item)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     return {"data": [item]}
 
 @router.post("/", response_model=SingleResponse[TaskRead], status_code=status.HTTP_201_CREATED)
 async def create(data: TaskCreate, db: T_Session, deps: T_TaskDeps, current_user: T_CurrentUser):
     try:
-        task = deps.task_service.create_task(data, current_user.id)
+        task = await deps.task_service.create_task(data, current_user.id)
         if not task:
             raise HTTPException(status_code=500, detail="Falha ao criar tarefa")
         return {"data": [task]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
 
+@router.post("/bulk", response_model=TaskBulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_bulk(data: List[Any], db: T_Session, deps: T_TaskDeps, current_user: T_CurrentUser):
+    tasks, errors = await deps.task_service.create_tasks(data, current_user.id)
+    if not tasks and errors:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=errors)
+    return {"data": tasks, "errors": errors}
+
+@router.patch("/bulk", response_model=TaskBulkResult)
+async def update_bulk(data: TaskBulkUpdate, db: T_Session, deps: T_TaskDeps, current_user: T_CurrentUser):
+    ids = await deps.task_service.update_tasks(data, current_user.id)
+    return {"total": len(ids), "ids": ids}
+
+@router.delete("/bulk", response_model=TaskBulkResult)
+async def delete_bulk(data: TaskBulkSelection, db: T_Session, deps: T_TaskDeps, current_user: T_CurrentUser):
+    ids = await deps.task_service.delete_tasks(data, current_user.id)
+    return {"total": len(ids), "ids": ids}
+
 @router.patch("/{id}", response_model=SingleResponse[TaskRead])
 async def update(id: str, data: TaskUpdate, db: T_Session, deps: T_TaskDeps, current_user: T_CurrentUser):
-    task = deps.task_service.update_task(id, data, current_user.id)
+    task = await deps.task_service.update_task(id, data, current_user.id)
     if not task:
         raise HTTPException(status_code=404, detail="Tarefa não encontrada")
     return {"data": [task]}
 
+@router.post("/{id}/restaurar", response_model=SingleResponse[TaskRead])
+async def restore(id: str, db: T_Session, deps: T_TaskDeps, current_user: T_CurrentUser):
+    task = await deps.task_service.restore_task(id, current_user.id)
+    return {"data": [task]}
+
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete(id: str, db: T_Session, deps: T_TaskDeps, current_user: T_CurrentUser):
-    deps.task_service.delete_task(id, current_user.id)
\ No newline at end of file
+    await deps.task_service.delete_task(id, current_user.id)
\ No newline at end of file
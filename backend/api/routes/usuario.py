@@ -1,3 +1,5 @@
+import uuid
+from typing import Optional
 from fastapi import APIRouter, Depends, status
 
 from api.core.dependencies import T_CurrentUser, T_Session, T_UsuarioDeps
@@ -9,23 +11,25 @@ from api.schemas.usuario import UsuarioCreate, UsuarioRead, UsuarioUpdate
 router = APIRouter(prefix="/usuarios", tags=["Usuarios"], dependencies=[Depends(get_current_user)])
 
 @router.get("/", response_model=PaginatedResponse[UsuarioRead])
-async def get_all(db: T_Session, current_user: T_CurrentUser, deps: T_UsuarioDeps, skip: int = 0, limit: int = 100):
-    items, total = deps.service.list_users(skip, limit)
-    return {"total": total, "data": items}
+async def get_all(db: T_Session, current_user: T_CurrentUser, deps: T_UsuarioDeps, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    items, total, next_cursor = await deps.service.list_users(skip, limit, cursor)
+    return {"total": total, "data": items, "next_cursor": next_cursor}
 
 @router.get("/{id}", response_model=SingleResponse[UsuarioRead])
-async def get_by_id(id: str, db: T_Session, deps: T_UsuarioDeps, current_user: T_CurrentUser):
-    item = deps.service.get_user_by_id(id)
+async def get_by_id(id: uuid.UUID, db: T_Session, deps: T_UsuarioDeps, current_user: T_CurrentUser):
+    item = await deps.service.get_user_by_id(id)
     return {"data": [item]}
 
 @router.post("/", response_model=SingleResponse[UsuarioRead], status_code=status.HTTP_201_CREATED)
 async def create(data: UsuarioCreate, db: T_Session, deps: T_UsuarioDeps, current_user: T_CurrentUser):
-    return deps.service.create_user(data)
+    item = await deps.service.create_user(data)
+    return {"data": [item]}
 
 @router.patch("/{id}", response_model=SingleResponse[UsuarioRead])
-async def update(id: str, data: UsuarioUpdate, db: T_Session, deps: T_UsuarioDeps, current_user: T_CurrentUser):
-    return deps.service.update_user(id, data)
+async def update(id: uuid.UUID, data: UsuarioUpdate, db: T_Session, deps: T_UsuarioDeps, current_user: T_CurrentUser):
+    item = await deps.service.update_user(id, data)
+    return {"data": [item]}
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete(id: str, db: T_Session, deps: T_UsuarioDeps, current_user: T_CurrentUser):
-    deps.service.delete_user(id)
\ No newline at end of file
+async def delete(id: uuid.UUID, db: T_Session, deps: T_UsuarioDeps, current_user: T_CurrentUser):
+    await deps.service.delete_user(id)
\ No newline at end of file
@@ -1,14 +1,19 @@
-from typing import Optional
+from typing import Annotated, Any, Dict, List, Optional
 from datetime import datetime
-from pydantic import BaseModel, UUID4
+from enum import Enum
+from pydantic import AfterValidator, BaseModel, UUID4, model_validator
+from api.models.base import naive
 from api.models.task import StatusTarefa, PrioridadeTarefa
 
+# Datas enviadas pelo cliente com fuso são convertidas para o horário de São Paulo sem fuso, como são gravadas
+LocalDatetime = Annotated[datetime, AfterValidator(naive)]
+
 class TaskCreate(BaseModel):
     titulo: str
     descricao: str
     status: StatusTarefa
     prioridade: PrioridadeTarefa
-    data_vencimento: Optional[datetime] = None
+    data_vencimento: Optional[LocalDatetime] = None
     usuario_id: Optional[UUID4] = None
     
     class Config:
@@ -19,7 +24,7 @@ class TaskUpdate(BaseModel):
     descricao: Optional[str] = None
     status: Optional[StatusTarefa] = None
     prioridade: Optional[PrioridadeTarefa] = None
-    data_vencimento: Optional[datetime] = None
+    data_vencimento: Optional[LocalDatetime] = None
     usuario_id: Optional[UUID4] = None
     
     class Config:
@@ -34,4 +39,52 @@ class TaskRead(BaseModel):
     data_vencimento: datetime
     created_at: datetime
     updated_at: datetime
-    usuario_id: UUID4
\ No newline at end of file
+    usuario_id: UUID4
+
+class TaskFilter(BaseModel):
+    status: Optional[StatusTarefa] = None
+    prioridade: Optional[PrioridadeTarefa] = None
+    data_vencimento_de: Optional[LocalDatetime] = None
+    data_vencimento_ate: Optional[LocalDatetime] = None
+    atrasadas: Optional[bool] = None
+
+class TaskSortField(str, Enum):
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+    DATA_VENCIMENTO = "data_vencimento"
+    PRIORIDADE = "prioridade"
+
+class SortOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+class TaskBulkError(BaseModel):
+    index: int
+    errors: List[Dict[str, Any]]
+
+class TaskBulkCreateResponse(BaseModel):
+    data: List[TaskRead]
+    errors: List[TaskBulkError]
+
+class TaskBulkSelection(BaseModel):
+    ids: Optional[List[UUID4]] = None
+    filtro: Optional[TaskFilter] = None
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        if (self.ids is None) == (self.filtro is None):
+            raise ValueError("Informe apenas um entre 'ids' e 'filtro'.")
+        if self.filtro is not None and not self.filtro.model_dump(exclude_none=True):
+            raise ValueError("O filtro precisa de ao menos um critério.")
+        return self
+
+class TaskBulkUpdate(TaskBulkSelection):
+    dados: TaskUpdate
+
+class TaskBulkResult(BaseModel):
+    total: int
+    ids: List[UUID4]
\ No newline at end of file
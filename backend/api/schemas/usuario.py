@@ -20,4 +20,8 @@ class UsuarioUpdate(BaseModel):
 class UsuarioRead(BaseModel):
     id: UUID4
     nome: str
-    email: str
\ No newline at end of file
+    email: str
+
+class UsuarioPrincipal(UsuarioRead):
+    """Usuário autenticado; token_version identifica a geração do token"""
+    token_version: int = 0
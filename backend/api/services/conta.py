@@ -1,42 +1,51 @@
-from passlib.context import CryptContext
-
-from api.core.security import create_access_token
+from api.core.security import create_user_token
+from api.core.hashing import verify_and_update_password
 from api.core.exceptions import ExceptionBadRequest
 from api.core.decorators import handle_sqlalchemy_errors
 
 from api.models.user import Usuario
+from api.repositories.refresh_token import RefreshTokenRepository
 from api.repositories.usuario import UsuarioRepository
 from api.services.usuario import UsuarioService
 
 from api.schemas.conta import UsuarioLogin, Token
-from api.schemas.usuario import UsuarioCreate
-
+from api.schemas.usuario import UsuarioCreate, UsuarioPrincipal
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 class ContaService:
-    def __init__(self, user_repository: UsuarioRepository, user_services: UsuarioService):
+    def __init__(self, user_repository: UsuarioRepository, user_services: UsuarioService, refresh_tokens: RefreshTokenRepository):
         self.user_repository = user_repository
         self.user_services = user_services
+        self.refresh_tokens = refresh_tokens
 
     @handle_sqlalchemy_errors   
-    def register(self, obj: UsuarioCreate) -> Usuario:
-        return self.user_services.create_user(obj)
+    async def register(self, obj: UsuarioCreate) -> Usuario:
+        return await self.user_services.create_user(obj)
 
     @handle_sqlalchemy_errors
-    def login(self, obj: UsuarioLogin):
-        usuario = self.user_services.get_user_by_email(obj.username)
+    async def login(self, obj: UsuarioLogin):
+        usuario = await self.user_services.get_user_by_email(obj.username)
         if not usuario:
             raise ExceptionBadRequest("Credenciais inválidas")
-        if not pwd_context.verify(obj.password, usuario.senha):
+        valido, novo_hash = await verify_and_update_password(obj.password, usuario.senha)
+        if not valido:
             raise ExceptionBadRequest("Credenciais inválidas")
-        access_token = create_access_token(data={"sub": usuario.email})
-        return Token(access_token=access_token, token_type="Bearer")
+        if novo_hash:
+            await self.user_services.update_password_hash(usuario.id, novo_hash)
+        access_token = create_user_token(usuario)
+        refresh_token = await self.refresh_tokens.issue(usuario.id)
+        return Token(access_token=access_token, token_type="Bearer", refresh_token=refresh_token)
+    
+    async def refresh_token(self, refresh_token: str):
+        """Troca o refresh token por um novo par de tokens, sem verificar senha"""
+        usuario, new_refresh_token = await self.refresh_tokens.rotate(refresh_token)
+        access_token = create_user_token(usuario)
+        return Token(access_token=access_token, token_type="Bearer", refresh_token=new_refresh_token)
     
-    def refresh_token(self, current_user: Usuario):
-        access_token = create_access_token(data={"sub": current_user.email})
-        return Token(access_token=access_token, token_type="Bearer")
+    async def logout(self, current_user: UsuarioPrincipal) -> None:
+        """Revoga todos os refresh tokens do usuário (todas as sessões)"""
+        await self.refresh_tokens.revoke_all(current_user.id)
     
     @handle_sqlalchemy_errors
-    def get_me(self, id: str) -> Usuario:
-        return self.user_services.get_user_by_id(id)
\ No newline at end of file
+    async def get_me(self, id: str) -> Usuario:
+        return await self.user_services.get_user_by_id(id)
\ No newline at end of file
@@ -1,34 +1,115 @@
-from api.models.task import Tarefa
-from api.schemas.task import TaskCreate, TaskUpdate
+from api.models.task import Tarefa, PrioridadeTarefa
+from api.schemas.task import ExportFormat, TaskBulkSelection, TaskBulkUpdate, TaskCreate, TaskFilter, TaskRead, TaskSortField, SortOrder, TaskUpdate
 from api.repositories.task import TaskRepository
-from api.core.exceptions import ExceptionNotFound
+from api.core.etag import make_etag
+from api.core.exceptions import ExceptionBadRequest
+from api.core.pagination import decode_cursor
+from api.models.base import naive
+from api.core.settings import settings
+from pydantic import ValidationError
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional
+import csv
+import io
+import re
 import uuid
 
 class TaskService:
     def __init__(self, task_repository: TaskRepository): 
         self.task_repository = task_repository
 
-    def create_task(self, task_data: TaskCreate, user_id: str) -> Tarefa:
-        new_task = self.task_repository.add_task(task_data, user_id)
+    async def create_task(self, task_data: TaskCreate, user_id: str) -> Tarefa:
+        new_task = await self.task_repository.add_task(task_data, user_id)
         return new_task
 
-    def get_task_by_id(self, task_id: str, user_id: str) -> Tarefa:
-        return self.task_repository.get_task_by_id(uuid.UUID(task_id), user_id)
+    async def create_tasks(self, items: list[Any], user_id: str) -> tuple[list[Tarefa], list[dict]]:
+        if not items:
+            raise ExceptionBadRequest("Nenhuma tarefa informada.")
+        if len(items) > settings.TASK_BULK_MAX_ITEMS:
+            raise ExceptionBadRequest(f"Máximo de {settings.TASK_BULK_MAX_ITEMS} tarefas por requisição.")
+        
+        valid, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                valid.append(TaskCreate.model_validate(item))
+            except ValidationError as e:
+                errors.append({"index": index, "errors": e.errors(include_url=False, include_context=False, include_input=False)})
+        
+        new_tasks = await self.task_repository.add_tasks(valid, user_id)
+        return new_tasks, errors
+
+    async def update_tasks(self, selection: TaskBulkUpdate, user_id: str) -> list[uuid.UUID]:
+        values = selection.dados.model_dump(exclude_unset=True, exclude={"usuario_id"})
+        if not values:
+            raise ExceptionBadRequest("Nenhum campo para atualizar.")
+        return await self.task_repository.update_tasks(user_id, values, selection.ids, selection.filtro)
+
+    async def delete_tasks(self, selection: TaskBulkSelection, user_id: str) -> list[uuid.UUID]:
+        return await self.task_repository.delete_tasks(user_id, selection.ids, selection.filtro)
+
+    async def get_task_by_id(self, task_id: str, user_id: str) -> Tarefa:
+        return await self.task_repository.get_task_by_id(uuid.UUID(task_id), user_id)
+    
+    async def list_etag(self, user_id: str, filtro: Optional[TaskFilter] = None, query: Any = None) -> tuple[str, int]:
+        """ETag da listagem (versão dos dados filtrados + parâmetros da página pedida) e o total, reaproveitado por list_tasks"""
+        updated_at, total = await self.task_repository.list_version(user_id, filtro)
+        return make_etag(user_id, query, updated_at, total), total
+
+    def task_etag(self, task: Tarefa) -> str:
+        """ETag da tarefa: o 304 evita serializar e enviar o corpo"""
+        return make_etag(task.id, task.updated_at)
+    
+    async def list_tasks(
+        self,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filtro: Optional[TaskFilter] = None,
+        sort_by: TaskSortField = TaskSortField.CREATED_AT,
+        order: SortOrder = SortOrder.DESC,
+        total: Optional[int] = None,
+    ) -> tuple[list[Tarefa], int, Optional[str]]:
+        parse = PrioridadeTarefa if sort_by == TaskSortField.PRIORIDADE else lambda value: naive(datetime.fromisoformat(value))
+        after = decode_cursor(cursor, f"{sort_by.value}:{order.value}", parse)
+        return await self.task_repository.list_tasks(user_id, skip, limit, after, filtro, sort_by, order, total)
+    
+    async def export_tasks(self, user_id: str, formato: ExportFormat, filtro: Optional[TaskFilter] = None) -> AsyncIterator[str]:
+        """Serializa as tarefas em NDJSON ou CSV, um bloco de texto por lote lido do banco"""
+        fields = list(TaskRead.model_fields)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if formato == ExportFormat.CSV:
+            writer.writerow(fields)
+            yield buffer.getvalue()
+        
+        async for batch in self.task_repository.stream_tasks(user_id, filtro, settings.TASK_EXPORT_BATCH_SIZE):
+            buffer.seek(0)
+            buffer.truncate()
+            for task in batch:
+                item = TaskRead.model_validate(task, from_attributes=True)
+                if formato == ExportFormat.CSV:
+                    row = item.model_dump(mode="json")
+                    writer.writerow([row[field] for field in fields])
+                else:
+                    buffer.write(item.model_dump_json())
+                    buffer.write("\n")
+            yield buffer.getvalue()
+    
+    async def search_tasks(self, user_id: str, q: str, skip: int = 0, limit: int = 100) -> tuple[list[Tarefa], int]:
+        q = q.strip()
+        if not q:
+            raise ExceptionBadRequest("Informe o termo de busca")
+        # Termos curtos demais viram um prefixo que casa com quase tudo e nenhum índice atende bem
+        if len(q) < settings.TASK_SEARCH_MIN_FTS_LENGTH or not re.search(r"\w", q):
+            raise ExceptionBadRequest(f"O termo de busca precisa de ao menos {settings.TASK_SEARCH_MIN_FTS_LENGTH} caracteres, com letras ou números")
+        return await self.task_repository.search_tasks(user_id, q, skip, limit)
     
-    def list_tasks(self, user_id: str, skip: int = 0, limit: int = 100) -> tuple[list[Tarefa], int]:
-        tasks, total = self.task_repository.list_tasks(user_id, skip, limit)
-        return tasks, total
+    async def update_task(self, task_id: str, task_data: TaskUpdate, user_id: str) -> Tarefa:
+        return await self.task_repository.update_task(uuid.UUID(task_id), task_data, user_id)
     
-    def update_task(self, task_id: str, task_data: TaskUpdate, user_id: str) -> Tarefa:
-        task = self.task_repository.get_task_by_id(uuid.UUID(task_id), user_id)
-        if not task:
-            raise ExceptionNotFound("Tarefa não encontrada.")
-        updated_task = self.task_repository.update_task(uuid.UUID(task_id), task_data, user_id)
-        return updated_task
+    async def delete_task(self, task_id: str, user_id: str) -> None:
+        await self.task_repository.delete_task(uuid.UUID(task_id), user_id)
     
-    def delete_task(self, task_id: str, user_id: str) -> None:
-        task = self.task_repository.get_task_by_id(uuid.UUID(task_id), user_id)
-        if not task:
-            raise ExceptionNotFound("Tarefa não encontrada.")
-        self.task_repository.delete_task(uuid.UUID(task_id), user_id)
-        return None
\ No newline at end of file
+    async def restore_task(self, task_id: str, user_id: str) -> Tarefa:
+        return await self.task_repository.restore_task(uuid.UUID(task_id), user_id)
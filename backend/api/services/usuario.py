@@ -1,4 +1,6 @@
+from typing import Optional
 from api.core.exceptions import ExceptionBadRequest, ExceptionConflict, ExceptionNotFound
+from api.core.pagination import decode_cursor
 from api.models.user import Usuario
 from api.schemas.usuario import UsuarioCreate, UsuarioRead
 from api.repositories.usuario import UsuarioRepository
@@ -11,36 +13,38 @@ class UsuarioService:
         if not user_data.email or not user_data.senha:
             raise ExceptionBadRequest("Email e senha são obrigatórios.")
 
-    def check_user_exists(self, email: str) -> None:
-        existing_user = self.user_repository.get_user_by_email(email)
+    async def check_user_exists(self, email: str) -> None:
+        existing_user = await self.user_repository.get_user_by_email(email)
         if existing_user:
             raise ExceptionConflict("Email já cadastrado.")
 
-    def create_user(self, user_data: UsuarioCreate) -> Usuario:
+    async def create_user(self, user_data: UsuarioCreate) -> Usuario:
         self.validate_user_data(user_data)
-        self.check_user_exists(user_data.email)
-        new_user = self.user_repository.add_user(user_data)
+        await self.check_user_exists(user_data.email)
+        new_user = await self.user_repository.add_user(user_data)
         return new_user
     
-    def get_user_by_id(self, user_id: int) -> Usuario:
-        user = self.user_repository.get_user_by_id(user_id)
+    async def get_user_by_id(self, user_id: int) -> Usuario:
+        user = await self.user_repository.get_user_by_id(user_id)
         if not user:
             raise ExceptionNotFound("Usuário não encontrado.")
         return user
     
-    def get_user_by_email(self, email: str) -> Usuario:
-        return self.user_repository.get_user_by_email(email)
+    async def get_user_by_email(self, email: str) -> Usuario:
+        return await self.user_repository.get_user_by_email(email)
     
-    def list_users(self, skip: int = 0, limit: int = 100) -> tuple[list[UsuarioRead], int]:
-        users, total = self.user_repository.list_users(skip, limit)
-        return users, total
+    async def list_users(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> tuple[list[UsuarioRead], int, Optional[str]]:
+        return await self.user_repository.list_users(skip, limit, decode_cursor(cursor))
     
-    def update_user(self, user_id: int, user_data: UsuarioCreate) -> Usuario:
-        self.get_user_by_id(user_id)
-        updated_user = self.user_repository.update_user(user_id, user_data)
+    async def update_user(self, user_id: int, user_data: UsuarioCreate) -> Usuario:
+        await self.get_user_by_id(user_id)
+        updated_user = await self.user_repository.update_user(user_id, user_data)
         return updated_user
     
-    def delete_user(self, user_id: int) -> None:
-        self.get_user_by_id(user_id)
-        self.user_repository.delete_user(user_id)
+    async def update_password_hash(self, user_id: int, hashed_password: str) -> None:
+        await self.user_repository.update_password_hash(user_id, hashed_password)
+    
+    async def delete_user(self, user_id: int) -> None:
+        await self.get_user_by_id(user_id)
+        await self.user_repository.delete_user(user_id)
         return None
\ No newline at end of file
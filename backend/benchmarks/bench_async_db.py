@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark de concorrência: sessão síncrona vs. sessão assíncrona.
+
+Simula N requisições simultâneas dentro de um único event loop (como um
+worker do uvicorn). Cada requisição executa uma consulta com latência
+artificial (pg_sleep). Com a sessão síncrona o event loop fica bloqueado
+e as requisições são serializadas; com a AsyncSession elas se sobrepõem.
+
+Uso (no diretório backend/, com DATABASE_URL apontando para o Postgres):
+    python benchmarks/bench_async_db.py --requests 200 --concurrency 50 --latency 0.02
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from api.core.db_conection import AsyncSessionLocal, async_engine, pool_options, settings
+
+# A engine síncrona da aplicação não tem pool (só atende scripts); aqui os dois modos usam o mesmo pool
+engine = create_engine(settings.DATABASE_URL, **pool_options(settings))
+SessionLocal = sessionmaker(bind=engine)
+
+
+QUERY = text("SELECT pg_sleep(:latency)")
+
+
+async def sync_request(latency: float) -> None:
+    """Rota async que usa a sessão síncrona (comportamento anterior)."""
+    with SessionLocal() as db:
+        db.execute(QUERY, {"latency": latency})
+
+
+async def async_request(latency: float) -> None:
+    """Rota async que usa a AsyncSession."""
+    async with AsyncSessionLocal() as db:
+        await db.execute(QUERY, {"latency": latency})
+
+
+async def run(handler, total: int, concurrency: int, latency: float) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await handler(latency)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - start
+
+
+async def main(args) -> None:
+    # Aquece os pools para não medir o custo de abrir conexões
+    await run(sync_request, args.concurrency, args.concurrency, 0)
+    await run(async_request, args.concurrency, args.concurrency, 0)
+
+    print(f"{'modo':<8} {'tempo (s)':>10} {'req/s':>10}")
+    for name, handler in (("sync", sync_request), ("async", async_request)):
+        elapsed = await run(handler, args.requests, args.concurrency, args.latency)
+        print(f"{name:<8} {elapsed:>10.2f} {args.requests / elapsed:>10.1f}")
+
+    engine.dispose()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02, help="latência simulada por consulta (s)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark de criação de tarefas: add_task em laço vs. add_tasks em lote.
+
+Cria um usuário temporário, insere N tarefas das duas formas e mostra o
+tempo total e a vazão (tarefas/s) de cada uma. Os dados criados são
+removidos ao final.
+
+Uso (no diretório backend/, com DATABASE_URL apontando para o Postgres):
+    python benchmarks/bench_bulk_insert.py --tasks 100 500 1000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete
+
+from api.core.db_conection import AsyncSessionLocal, async_engine
+from api.models.task import Tarefa, StatusTarefa, PrioridadeTarefa
+from api.models.task_counter import ContadorTarefa
+from api.models.user import Usuario
+from api.repositories.task import TaskRepository
+from api.schemas.task import TaskCreate
+
+
+def make_tasks(n: int) -> list[TaskCreate]:
+    return [
+        TaskCreate(titulo=f"Tarefa {i}", descricao="benchmark", status=StatusTarefa.PENDENTE, prioridade=PrioridadeTarefa.MEDIA)
+        for i in range(n)
+    ]
+
+
+async def one_by_one(repository: TaskRepository, usuario_id: uuid.UUID, n: int) -> float:
+    tasks = make_tasks(n)
+    start = time.perf_counter()
+    for task in tasks:
+        await repository.add_task(task, usuario_id)
+    return time.perf_counter() - start
+
+
+async def bulk(repository: TaskRepository, usuario_id: uuid.UUID, n: int) -> float:
+    tasks = make_tasks(n)
+    start = time.perf_counter()
+    await repository.add_tasks(tasks, usuario_id)
+    return time.perf_counter() - start
+
+
+async def main(args) -> None:
+    async with AsyncSessionLocal() as db:
+        usuario = Usuario(nome="benchmark", email=f"bench-{uuid.uuid4()}@example.com", senha="-")
+        db.add(usuario)
+        await db.commit()
+        repository = TaskRepository(db)
+
+        try:
+            print(f"{'tarefas':>8} {'modo':<8} {'tempo (s)':>10} {'tarefas/s':>10}")
+            for n in args.tasks:
+                for name, func in (("add_task", one_by_one), ("bulk", bulk)):
+                    elapsed = await func(repository, usuario.id, n)
+                    print(f"{n:>8} {name:<8} {elapsed:>10.3f} {n / elapsed:>10.0f}")
+        finally:
+            await db.execute(delete(Tarefa).where(Tarefa.usuario_id == usuario.id))
+            await db.execute(delete(ContadorTarefa).where(ContadorTarefa.usuario_id == usuario.id))
+            await db.execute(delete(Usuario).where(Usuario.id == usuario.id))
+            await db.commit()
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, nargs="+", default=[100, 500, 1000])
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark de serialização da listagem de tarefas.
+
+Compara, para páginas de N tarefas, o caminho padrão do FastAPI
+(response_model + jsonable_encoder + json.dumps, e também com
+ORJSONResponse) com o caminho rápido de api.core.serialization.render
+(TypeAdapter em cache, uma validação e dump_json no pydantic-core).
+Não usa banco: as tarefas são objetos ORM montados em memória. Antes de
+medir, verifica se os bytes gerados são idênticos.
+
+Uso (no diretório backend/):
+    python benchmarks/bench_json_responses.py --limit 100 1000 --repeat 200
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from api.core import serialization
+from api.core.response_model import PaginatedResponse
+from api.models.task import Tarefa, StatusTarefa, PrioridadeTarefa
+from api.schemas.task import TaskRead
+
+RESPONSE_TYPE = PaginatedResponse[TaskRead]
+RESPONSE_FIELD = create_model_field(name="Response_bench", type_=RESPONSE_TYPE, mode="serialization")
+LOOP = asyncio.new_event_loop()
+
+
+def make_page(n: int) -> dict:
+    now = datetime.now()
+    usuario_id = uuid.uuid4()
+    tasks = [
+        Tarefa(
+            id=uuid.uuid4(),
+            titulo=f"Tarefa {i} – revisão",
+            descricao="Descrição com acentuação: ação, atenção",
+            status=StatusTarefa.PENDENTE,
+            prioridade=PrioridadeTarefa.MEDIA,
+            data_vencimento=now + timedelta(days=i),
+            usuario_id=usuario_id,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(n)
+    ]
+    return {"total": n, "data": tasks, "next_cursor": None}
+
+
+def default_path(content: dict, response_class=JSONResponse) -> bytes:
+    value = LOOP.run_until_complete(serialize_response(field=RESPONSE_FIELD, response_content=content))
+    return response_class(value).body
+
+
+def fast_path(content: dict) -> bytes:
+    return serialization.render(RESPONSE_TYPE, content, Response()).body
+
+
+def measure(func, content: dict, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(content)
+    return (time.perf_counter() - start) / repeat
+
+
+def main(limits: list[int], repeat: int) -> int:
+    serialization.settings.FAST_JSON_RESPONSES = True
+    paths = {
+        "padrão (json)": default_path,
+        "padrão (orjson)": lambda content: default_path(content, ORJSONResponse),
+        "TypeAdapter": fast_path,
+    }
+    print(f"{'limit':>6} {'caminho':<16} {'ms/resposta':>12} {'ganho':>8}")
+    for n in limits:
+        content = make_page(n)
+        expected = default_path(content)
+        for name, func in paths.items():
+            if func(content) != expected:
+                print(f"ERRO {name}: saída diferente do caminho padrão")
+                return 1
+        baseline = None
+        for name, func in paths.items():
+            elapsed = measure(func, content, repeat)
+            baseline = baseline or elapsed
+            print(f"{n:>6} {name:<16} {elapsed * 1000:>12.3f} {baseline / elapsed:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+    sys.exit(main(args.limit, args.repeat))
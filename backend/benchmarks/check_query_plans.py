@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Verificação de planos de execução das consultas quentes de tarefas.
+
+Executa EXPLAIN nas consultas de listagem do TaskRepository (primeira
+página, offset, cursor e cada combinação de filtro e ordenação suportada)
+e falha se alguma delas não usar o índice parcial esperado ou precisar de
+um Sort explícito. A busca textual ordena por relevância, então nela só o
+uso dos índices GIN é verificado. A busca de usuário por email (login e
+cadastro) precisa usar o índice único em lower(email), e a seleção dos
+lotes do arquivamento, o índice parcial das tarefas excluídas. O seq scan
+é desabilitado na sessão para que o resultado não dependa do volume de
+dados da base.
+
+Com tarefa particionada por hash (TASK_PARTITION_STRATEGY=hash), cada
+consulta do TaskRepository também precisa ler uma única partição; só a
+seleção do arquivamento, que não filtra por usuário, percorre todas. Os
+índices das partições são reportados pelo nome do índice da tabela
+particionada.
+
+Uso (no diretório backend/, com DATABASE_URL apontando para o Postgres
+já migrado):
+    python benchmarks/check_query_plans.py
+"""
+
+import json
+import os
+import sys
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from api.core.db_conection import engine
+from api.core.partitioning import partitions
+from api.models.task import PrioridadeTarefa, StatusTarefa, Tarefa
+from api.repositories.task import TaskRepository
+from api.repositories.usuario import UsuarioRepository
+from api.schemas.task import SortOrder, TaskFilter, TaskSortField
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+class Layout:
+    """Partições de tarefa e o índice pai de cada índice de partição"""
+
+    def __init__(self, conn):
+        self.partitions = set(partitions(conn, "tarefa"))
+        self.strategy = conn.execute(
+            text("SELECT partstrat FROM pg_partitioned_table WHERE partrelid = to_regclass('tarefa')")
+        ).scalar_one_or_none()
+        self.parent_index = dict(conn.execute(text(
+            "SELECT c.relname, p.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent WHERE c.relkind = 'i'"
+        )).all())
+
+
+def check(conn, layout: Layout, name: str, stmt, index_name: str, allow_sort: bool = False, all_partitions: bool = False) -> bool:
+    sql = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    nodes = list(plan_nodes(plan[0]["Plan"]))
+    indexes = {layout.parent_index.get(node.get("Index Name"), node.get("Index Name")) for node in nodes}
+    uses_index = index_name in indexes
+    has_sort = any(node["Node Type"] == "Sort" for node in nodes)
+    scanned = {node["Relation Name"] for node in nodes if node.get("Relation Name") in layout.partitions}
+    pruned = all_partitions or layout.strategy != "h" or len(scanned) <= 1
+    ok = uses_index and (allow_sort or not has_sort) and pruned
+    print(
+        f"{'OK ' if ok else 'ERRO'} {name}: {index_name}={'sim' if uses_index else 'não'} "
+        f"sort={'sim' if has_sort else 'não'} partições={len(scanned)}"
+    )
+    return ok
+
+
+def main() -> int:
+    repository = TaskRepository(None)
+    usuario_id = uuid.uuid4()
+    pendentes = TaskFilter(status=StatusTarefa.PENDENTE)
+    queries = {
+        "get_task_by_id": (
+            repository._not_excluido(usuario_id).where(Tarefa.id == uuid.uuid4()),
+            "tarefa_pkey",
+        ),
+        "list_tasks (primeira página)": (repository._list_stmt(usuario_id), "ix_tarefa_usuario_created_at"),
+        "list_tasks (offset)": (repository._list_stmt(usuario_id, skip=1000), "ix_tarefa_usuario_created_at"),
+        "list_tasks (cursor)": (
+            repository._list_stmt(usuario_id, after=(datetime.now(), uuid.uuid4())),
+            "ix_tarefa_usuario_created_at",
+        ),
+        "list_tasks (created_at asc)": (
+            repository._list_stmt(usuario_id, order=SortOrder.ASC),
+            "ix_tarefa_usuario_created_at",
+        ),
+        "list_tasks (updated_at desc)": (
+            repository._list_stmt(usuario_id, sort_by=TaskSortField.UPDATED_AT),
+            "ix_tarefa_usuario_updated_at",
+        ),
+        "list_tasks (data_vencimento asc, cursor)": (
+            repository._list_stmt(
+                usuario_id,
+                after=(datetime.now(), uuid.uuid4()),
+                sort_by=TaskSortField.DATA_VENCIMENTO,
+                order=SortOrder.ASC,
+            ),
+            "ix_tarefa_usuario_vencimento",
+        ),
+        "list_tasks (prioridade desc)": (
+            repository._list_stmt(usuario_id, sort_by=TaskSortField.PRIORIDADE),
+            "ix_tarefa_usuario_prioridade",
+        ),
+        "list_tasks (prioridade = ALTA, created_at desc)": (
+            repository._list_stmt(usuario_id, filtro=TaskFilter(prioridade=PrioridadeTarefa.ALTA)),
+            "ix_tarefa_usuario_created_at",
+        ),
+        "list_tasks (status, data_vencimento asc)": (
+            repository._list_stmt(
+                usuario_id, filtro=pendentes, sort_by=TaskSortField.DATA_VENCIMENTO, order=SortOrder.ASC
+            ),
+            "ix_tarefa_usuario_status_vencimento",
+        ),
+        "list_tasks (atrasadas, data_vencimento asc)": (
+            repository._list_stmt(
+                usuario_id,
+                filtro=TaskFilter(atrasadas=True),
+                sort_by=TaskSortField.DATA_VENCIMENTO,
+                order=SortOrder.ASC,
+            ),
+            "ix_tarefa_usuario_status_vencimento",
+        ),
+        "list_tasks (intervalo de vencimento)": (
+            repository._list_stmt(
+                usuario_id,
+                filtro=TaskFilter(data_vencimento_de=datetime(2026, 1, 1), data_vencimento_ate=datetime(2026, 2, 1)),
+                sort_by=TaskSortField.DATA_VENCIMENTO,
+            ),
+            "ix_tarefa_usuario_vencimento",
+        ),
+    }
+    search_queries = {
+        "search_tasks (full-text)": (
+            repository._search_stmt(usuario_id, "reunião cliente", "postgresql"),
+            "ix_tarefa_usuario_busca",
+        ),
+        "search_tasks (prefixo)": (
+            repository._search_stmt(usuario_id, "reu", "postgresql"),
+            "ix_tarefa_usuario_busca",
+        ),
+    }
+    user_queries = {
+        "get_user_by_email (login/cadastro)": (
+            UsuarioRepository(None)._by_email("Fulano@Example.com"),
+            "ix_usuario_email_lower",
+        ),
+    }
+    with engine.connect() as conn:
+        conn.execute(text("SET enable_seqscan = off"))
+        layout = Layout(conn)
+        results = [check(conn, layout, name, stmt, index_name) for name, (stmt, index_name) in queries.items()]
+        results += [
+            check(conn, layout, name, stmt, index_name, allow_sort=True)
+            for name, (stmt, index_name) in search_queries.items()
+        ]
+        results += [check(conn, layout, name, stmt, index_name) for name, (stmt, index_name) in user_queries.items()]
+        results.append(check(
+            conn, layout, "archive_batch (seleção do lote)",
+            repository.archive._candidates(datetime.now(), 500), "ix_tarefa_excluido_updated_at",
+            all_partitions=True,
+        ))
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,36 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
 from api.routes import router
+from api.core.archiver import archive_loop
+from api.core.hashing import shutdown_executor
+from api.core import metrics
+from api.core.db_conection import ENGINES
+from api.core.pool import pool_status
+from api.core.settings import settings
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    archiver = None
+    if settings.TASK_ARCHIVE_INTERVAL_SECONDS > 0:
+        archiver = asyncio.create_task(archive_loop(settings.TASK_ARCHIVE_INTERVAL_SECONDS))
+    yield
+    if archiver is not None:
+        archiver.cancel()
+        with suppress(asyncio.CancelledError):
+            await archiver
+    shutdown_executor()
+
+def default_response_class() -> type[JSONResponse]:
+    """ORJSONResponse quando FAST_JSON_RESPONSES está ativo (requer o extra fast-json)"""
+    if not settings.FAST_JSON_RESPONSES:
+        return JSONResponse
+    import orjson  # noqa: F401 - falha na inicialização, não na primeira resposta
+    return ORJSONResponse
+
+app = FastAPI(lifespan=lifespan, default_response_class=default_response_class())
 
 app.include_router(router, prefix="/api/v1")
 
@@ -15,13 +42,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False, dependencies=[Depends(metrics.require_metrics_token)])
+    def read_metrics():
+        return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+    @app.get("/metrics/pool", include_in_schema=False, dependencies=[Depends(metrics.require_metrics_token)])
+    def read_pool_metrics():
+        return {name: pool_status(engine.pool) for name, engine in ENGINES.items()}
+
 @app.exception_handler(HTTPException)
 async def custom_http_exception_handler(request, exc: HTTPException):
     return JSONResponse(
         status_code=exc.status_code,
         content={"error": exc.detail},
+        headers=exc.headers,
     )
 
 @app.get("/")
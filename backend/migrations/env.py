@@ -23,6 +23,14 @@ if config.config_file_name is not None:
 from api.models.base import Base
 target_metadata = Base.metadata
 
+from api.core.partitioning import PARTITION_OBJECTS
+from api.models.task import SEARCH_OBJECTS
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Ignora no autogenerate os objetos de busca textual e de particionamento criados só pelas migrations"""
+    return not (reflected and compare_to is None and (name in SEARCH_OBJECTS or PARTITION_OBJECTS.match(name)))
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -47,6 +55,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -68,7 +77,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
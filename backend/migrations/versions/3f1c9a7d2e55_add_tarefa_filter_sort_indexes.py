@@ -0,0 +1,46 @@
+"""add tarefa filter and sort indexes
+
+Revision ID: 3f1c9a7d2e55
+Revises: b958f04be931
+Create Date: 2026-10-18 11:02:17.530941
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2e55'
+down_revision: Union[str, None] = 'b958f04be931'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    'ix_tarefa_usuario_updated_at': ['usuario_id', 'updated_at', 'id'],
+    'ix_tarefa_usuario_vencimento': ['usuario_id', 'data_vencimento', 'id'],
+    'ix_tarefa_usuario_prioridade': ['usuario_id', 'prioridade', 'id'],
+    'ix_tarefa_usuario_status_vencimento': ['usuario_id', 'status', 'data_vencimento', 'id'],
+}
+
+
+def upgrade() -> None:
+    # CREATE/DROP INDEX CONCURRENTLY não pode rodar dentro de uma transação
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(
+                name,
+                'tarefa',
+                columns,
+                unique=False,
+                postgresql_where=sa.text('flg_excluido = false'),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in reversed(list(INDEXES)):
+            op.drop_index(name, table_name='tarefa', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,60 @@
+"""add usuario lower(email) unique index
+
+Revision ID: 4b7e2c9d1f63
+Revises: e7a3d9c5b214
+Create Date: 2026-10-18 15:58:40.227914
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2c9d1f63'
+down_revision: Union[str, None] = 'e7a3d9c5b214'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def check_case_duplicates() -> None:
+    """Falha antes de criar o índice se houver emails que só diferem em maiúsculas"""
+    if context.is_offline_mode():
+        return
+    duplicados = op.get_bind().execute(sa.text(
+        "SELECT lower(email) FROM usuario GROUP BY lower(email) HAVING count(*) > 1 LIMIT 10"
+    )).scalars().all()
+    if duplicados:
+        raise RuntimeError(
+            "Emails duplicados ignorando maiúsculas; unifique as contas antes de migrar: " + ", ".join(duplicados)
+        )
+
+
+def upgrade() -> None:
+    check_case_duplicates()
+    # O índice é funcional: não há coluna nova para preencher, e o CONCURRENTLY
+    # constrói o índice sem bloquear escritas em usuario
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_usuario_email_lower',
+            'usuario',
+            [sa.text('lower(email)')],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index('ix_usuario_email', table_name='usuario', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_usuario_email',
+            'usuario',
+            ['email'],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index('ix_usuario_email_lower', table_name='usuario', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,51 @@
+"""drop tarefa titulo trgm
+
+Revision ID: 7c2b9e4d1a58
+Revises: f5c3b8e1a7d6
+Create Date: 2026-10-18 19:21:37.506182
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from api.core import partitioning
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2b9e4d1a58'
+down_revision: Union[str, None] = 'f5c3b8e1a7d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _partitioned() -> bool:
+    # Offline não há como ler o banco; sem TASK_PARTITION_STRATEGY a tabela não é particionada
+    return not context.is_offline_mode() and partitioning.is_partitioned(op.get_bind())
+
+
+def upgrade() -> None:
+    # Termos menores que TASK_SEARCH_MIN_FTS_LENGTH agora respondem 400: toda busca usa o
+    # full-text (ix_tarefa_usuario_busca) e o índice de trigramas do título ficou sem uso
+    if _partitioned():
+        # Índice de tabela particionada não aceita CONCURRENTLY
+        op.drop_index('ix_tarefa_usuario_titulo_trgm', table_name='tarefa', if_exists=True)
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tarefa_usuario_titulo_trgm', table_name='tarefa', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    options = dict(
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'titulo': 'gin_trgm_ops'},
+        postgresql_where=sa.text('flg_excluido = false'),
+        if_not_exists=True,
+    )
+    if _partitioned():
+        op.create_index('ix_tarefa_usuario_titulo_trgm', 'tarefa', ['usuario_id', 'titulo'], **options)
+        return
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tarefa_usuario_titulo_trgm', 'tarefa', ['usuario_id', 'titulo'], postgresql_concurrently=True, **options)
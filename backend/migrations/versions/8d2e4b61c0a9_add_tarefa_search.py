@@ -0,0 +1,66 @@
+"""add tarefa search
+
+Revision ID: 8d2e4b61c0a9
+Revises: 3f1c9a7d2e55
+Create Date: 2026-10-18 11:47:05.318244
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e4b61c0a9'
+down_revision: Union[str, None] = '3f1c9a7d2e55'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Título pesa mais que a descrição no ts_rank_cd
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('portuguese'::regconfig, coalesce(titulo, '')), 'A') || "
+    "setweight(to_tsvector('portuguese'::regconfig, coalesce(descricao, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    # btree_gin permite usuario_id no mesmo índice GIN; pg_trgm atende os prefixos curtos
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Coluna gerada STORED reescreve a tabela: rodar em janela de manutenção
+    op.add_column(
+        'tarefa',
+        sa.Column('busca', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True), nullable=True),
+    )
+    # CREATE INDEX CONCURRENTLY não pode rodar dentro de uma transação
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tarefa_usuario_busca',
+            'tarefa',
+            ['usuario_id', 'busca'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_where=sa.text('flg_excluido = false'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_tarefa_usuario_titulo_trgm',
+            'tarefa',
+            ['usuario_id', 'titulo'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'titulo': 'gin_trgm_ops'},
+            postgresql_where=sa.text('flg_excluido = false'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tarefa_usuario_titulo_trgm', table_name='tarefa', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_tarefa_usuario_busca', table_name='tarefa', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('tarefa', 'busca')
@@ -0,0 +1,46 @@
+"""add token_atualizacao
+
+Revision ID: 9a1d5f3b7e20
+Revises: 4b7e2c9d1f63
+Create Date: 2026-10-18 16:42:10.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a1d5f3b7e20'
+down_revision: Union[str, None] = '4b7e2c9d1f63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('token_atualizacao',
+    sa.Column('usuario_id', sa.Uuid(), nullable=False),
+    sa.Column('token_hash', sa.String(length=64), nullable=False),
+    sa.Column('familia', sa.Uuid(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('used_at', sa.DateTime(), nullable=True),
+    sa.Column('revoked_at', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('flg_ativo', sa.Boolean(), nullable=False),
+    sa.Column('flg_excluido', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['usuario_id'], ['usuario.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('token_hash')
+    )
+    op.create_index(op.f('ix_token_atualizacao_usuario_id'), 'token_atualizacao', ['usuario_id'], unique=False)
+    op.create_index(op.f('ix_token_atualizacao_familia'), 'token_atualizacao', ['familia'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_token_atualizacao_familia'), table_name='token_atualizacao')
+    op.drop_index(op.f('ix_token_atualizacao_usuario_id'), table_name='token_atualizacao')
+    op.drop_table('token_atualizacao')
@@ -0,0 +1,42 @@
+"""add tarefa hot path indexes
+
+Revision ID: b958f04be931
+Revises: 178250264463
+Create Date: 2026-10-18 10:12:41.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b958f04be931'
+down_revision: Union[str, None] = '178250264463'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE/DROP INDEX CONCURRENTLY não pode rodar dentro de uma transação
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tarefa_usuario_created_at',
+            'tarefa',
+            ['usuario_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_where=sa.text('flg_excluido = false'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Duplicam os índices das chaves primárias
+        op.drop_index('ix_tarefa_id', table_name='tarefa', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_usuario_id', table_name='usuario', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_usuario_id', 'usuario', ['id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_tarefa_id', 'tarefa', ['id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_tarefa_usuario_created_at', table_name='tarefa', postgresql_concurrently=True, if_exists=True)
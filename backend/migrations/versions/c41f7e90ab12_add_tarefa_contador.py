@@ -0,0 +1,50 @@
+"""add tarefa_contador
+
+Revision ID: c41f7e90ab12
+Revises: 8d2e4b61c0a9
+Create Date: 2026-10-18 13:05:48.702615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f7e90ab12'
+down_revision: Union[str, None] = '8d2e4b61c0a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('tarefa_contador',
+    sa.Column('usuario_id', sa.Uuid(), nullable=False),
+    sa.Column('status', postgresql.ENUM('PENDENTE', 'CONCLUIDA', name='status_tarefa', create_type=False), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('flg_ativo', sa.Boolean(), nullable=False),
+    sa.Column('flg_excluido', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['usuario_id'], ['usuario.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('usuario_id', 'status', name='uq_tarefa_contador_usuario_status')
+    )
+    # Carga inicial; depois disso use scripts/rebuild_task_counters.py para reparar
+    op.execute(
+        """
+        INSERT INTO tarefa_contador (id, usuario_id, status, total, flg_ativo, flg_excluido, created_at, updated_at)
+        SELECT gen_random_uuid(), usuario_id, status, count(*), true, false, now(), now()
+        FROM tarefa
+        WHERE flg_excluido = false
+        GROUP BY usuario_id, status
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('tarefa_contador')
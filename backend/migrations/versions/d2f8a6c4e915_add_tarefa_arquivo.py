@@ -0,0 +1,68 @@
+"""add tarefa_arquivo
+
+Revision ID: d2f8a6c4e915
+Revises: 9a1d5f3b7e20
+Create Date: 2026-10-18 17:20:31.904127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f8a6c4e915'
+down_revision: Union[str, None] = '9a1d5f3b7e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('tarefa_arquivo',
+    sa.Column('titulo', sa.String(), nullable=False),
+    sa.Column('descricao', sa.String(), nullable=False),
+    sa.Column('status', postgresql.ENUM('PENDENTE', 'CONCLUIDA', name='status_tarefa', create_type=False), nullable=False),
+    sa.Column('prioridade', postgresql.ENUM('BAIXA', 'MEDIA', 'ALTA', name='prioridade_tarefa', create_type=False), nullable=False),
+    sa.Column('data_vencimento', sa.DateTime(), nullable=False),
+    sa.Column('usuario_id', sa.Uuid(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('flg_ativo', sa.Boolean(), nullable=False),
+    sa.Column('flg_excluido', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['usuario_id'], ['usuario.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tarefa_arquivo_usuario_id'), 'tarefa_arquivo', ['usuario_id'], unique=False)
+    # Lotes do arquivamento; parcial, então só cresce com as tarefas excluídas ainda não arquivadas
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tarefa_excluido_updated_at',
+            'tarefa',
+            ['updated_at', 'id'],
+            unique=False,
+            postgresql_where=sa.text('flg_excluido = true'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tarefa_excluido_updated_at', table_name='tarefa', postgresql_concurrently=True, if_exists=True)
+    # Tarefas arquivadas voltam para tarefa como excluídas antes de apagar o arquivo
+    op.execute(
+        """
+        INSERT INTO tarefa (id, titulo, descricao, status, prioridade, data_vencimento, usuario_id,
+                            flg_ativo, flg_excluido, created_at, updated_at, deleted_at)
+        SELECT id, titulo, descricao, status, prioridade, data_vencimento, usuario_id,
+               flg_ativo, true, created_at, updated_at, deleted_at
+        FROM tarefa_arquivo
+        """
+    )
+    op.drop_index(op.f('ix_tarefa_arquivo_usuario_id'), table_name='tarefa_arquivo')
+    op.drop_table('tarefa_arquivo')
@@ -0,0 +1,27 @@
+"""add usuario token_version
+
+Revision ID: e7a3d9c5b214
+Revises: c41f7e90ab12
+Create Date: 2026-10-18 15:20:11.418032
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3d9c5b214'
+down_revision: Union[str, None] = 'c41f7e90ab12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Default constante: no PostgreSQL 11+ não reescreve a tabela
+    op.add_column('usuario', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('usuario', 'token_version')
@@ -0,0 +1,59 @@
+"""partition tarefa
+
+Revision ID: f5c3b8e1a7d6
+Revises: d2f8a6c4e915
+Create Date: 2026-10-18 16:02:41.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+
+from api.core import partitioning
+from api.core.settings import Settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c3b8e1a7d6'
+down_revision: Union[str, None] = 'd2f8a6c4e915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+settings = Settings()
+
+
+def _online() -> bool:
+    """O particionamento lê o estado do banco; sem estratégia não há nada a gerar em SQL offline"""
+    if not context.is_offline_mode():
+        return True
+    if settings.TASK_PARTITION_STRATEGY:
+        raise RuntimeError("O particionamento de tarefa lê o banco e não pode gerar SQL offline")
+    return False
+
+
+def upgrade() -> None:
+    # Sem TASK_PARTITION_STRATEGY a tabela continua como está; para particionar
+    # depois, use scripts/partition_tasks.py (backfill e swap)
+    strategy = settings.TASK_PARTITION_STRATEGY
+    if not strategy or not _online():
+        return
+    conn = op.get_bind()
+    if partitioning.is_partitioned(conn):
+        return
+    # A cópia roda fora da transação, em lotes confirmados um a um, com a aplicação no ar.
+    # Se scripts/partition_tasks.py backfill já rodou, só os lotes restantes são copiados.
+    with op.get_context().autocommit_block():
+        partitioning.prepare(conn, strategy, settings.TASK_PARTITION_COUNT, settings.TASK_PARTITION_MONTHS_AHEAD)
+        partitioning.backfill(conn)
+    # Troca de nomes: única etapa com lock exclusivo, curta
+    partitioning.swap(conn)
+
+
+def downgrade() -> None:
+    if not _online():
+        return
+    conn = op.get_bind()
+    if partitioning.is_partitioned(conn):
+        partitioning.unswap(conn)
+    else:
+        partitioning.discard(conn)
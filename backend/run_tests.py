@@ -24,8 +24,21 @@ def run_command(command, description):
         return False
 
 
+def run_load(args):
+    """Executa o teste de carga (tests/load) repassando os argumentos restantes."""
+    print("🏋️ Executando Teste de Carga da API")
+    print("=" * 60)
+    command = [sys.executable, "-m", "tests.load.harness", *args]
+    sys.exit(subprocess.run(command).returncode)
+
+
 def main():
     """Função principal para executar os testes."""
+    if "--load" in sys.argv[1:]:
+        args = sys.argv[1:]
+        args.remove("--load")
+        run_load(args)
+
     print("🧪 Executando Testes Automatizados do Backend")
     print("=" * 60)
     
@@ -69,6 +82,7 @@ def main():
     print("   - Testes de integração: poetry run pytest tests/integration/")
     print("   - Testes com cobertura: poetry run pytest --cov=api")
     print("   - Testes específicos: poetry run pytest -k 'test_name'")
+    print("   - Teste de carga: python run_tests.py --load --help")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Move as tarefas excluídas há mais de N dias de tarefa para tarefa_arquivo.
+
+Roda em lotes, cada um na sua transação, com uma pausa entre eles para
+limitar a carga no primário. Pode ser interrompido a qualquer momento: a
+próxima execução continua de onde parou. Tarefas arquivadas voltam com
+POST /api/v1/tarefas/{id}/restaurar.
+
+Uso (no diretório backend/, com DATABASE_URL apontando para o Postgres):
+    python scripts/archive_deleted_tasks.py
+    python scripts/archive_deleted_tasks.py --older-than-days 90 --max-batches 100
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.core.archiver import archive_deleted_tasks
+from api.core.db_conection import async_engine
+from api.core.settings import settings
+
+
+async def main(older_than_days: int, batch_size: int, pause_seconds: float, max_batches: int | None) -> None:
+    try:
+        archived = await archive_deleted_tasks(older_than_days, batch_size, pause_seconds, max_batches)
+        print(f"{archived} tarefas arquivadas")
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--older-than-days", type=int, default=settings.TASK_ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.TASK_ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--pause", type=float, default=settings.TASK_ARCHIVE_PAUSE_SECONDS, help="Segundos de pausa entre lotes")
+    parser.add_argument("--max-batches", type=int, default=None, help="Para depois de N lotes (o restante fica para a próxima execução)")
+    args = parser.parse_args()
+    asyncio.run(main(args.older_than_days, args.batch_size, args.pause, args.max_batches))
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Particiona a tabela tarefa sem parar a aplicação (TASK_PARTITION_STRATEGY).
+
+Etapas:
+    backfill        cria tarefa_particionada e copia as tarefas em lotes; rode
+                    antes do deploy com a migration, que então só troca as tabelas
+    swap            coloca tarefa_particionada no lugar de tarefa (para bancos
+                    em que a migration já rodou sem estratégia configurada)
+    add-partitions  cria as partições mensais à frente (range; agendar mensalmente)
+    drop-legacy     remove tarefa_legado depois de validar a troca; sem ela a
+                    downgrade da migration não é mais possível
+
+Uso (no diretório backend/, com DATABASE_URL apontando para o Postgres):
+    TASK_PARTITION_STRATEGY=hash python scripts/partition_tasks.py backfill --pause-seconds 0.2
+    python scripts/partition_tasks.py swap
+    python scripts/partition_tasks.py add-partitions
+    python scripts/partition_tasks.py drop-legacy
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.core import partitioning
+from api.core.db_conection import engine
+from api.core.settings import Settings
+
+settings = Settings()
+
+
+def main(command: str, batch_size: int, pause_seconds: float, max_batches: int | None) -> None:
+    strategy = settings.TASK_PARTITION_STRATEGY
+    if command in ("backfill", "swap") and not strategy:
+        raise SystemExit("Defina TASK_PARTITION_STRATEGY (hash ou range)")
+    try:
+        with engine.connect() as conn:
+            if command == "swap":
+                if partitioning.is_partitioned(conn):
+                    raise SystemExit("tarefa já é particionada")
+                with conn.begin():
+                    partitioning.swap(conn)
+                print("tarefa particionada")
+                return
+
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+            if command == "backfill":
+                if partitioning.is_partitioned(conn):
+                    raise SystemExit("tarefa já é particionada")
+                partitioning.prepare(conn, strategy, settings.TASK_PARTITION_COUNT, settings.TASK_PARTITION_MONTHS_AHEAD)
+                done = partitioning.backfill(conn, batch_size, pause_seconds, max_batches)
+                print("cópia concluída" if done else "cópia interrompida; rode de novo para continuar")
+            elif command == "add-partitions":
+                created = partitioning.add_range_partitions(conn, settings.TASK_PARTITION_MONTHS_AHEAD)
+                print(f"{len(created)} partições criadas")
+            elif command == "drop-legacy":
+                partitioning.drop_legacy(conn)
+                print(f"{partitioning.LEGACY} removida")
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["backfill", "swap", "add-partitions", "drop-legacy"])
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--pause-seconds", type=float, default=0.0, help="Pausa entre os lotes da cópia")
+    parser.add_argument("--max-batches", type=int, default=None, help="Para depois de N lotes (continua na próxima execução)")
+    args = parser.parse_args()
+    main(args.command, args.batch_size, args.pause_seconds, args.max_batches)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Apaga da tabela token_atualizacao os refresh tokens expirados ou revogados.
+
+Tokens já trocados ficam guardados até expirar para que um reuso seja
+detectado (e revogue a família); depois disso não servem para mais nada.
+Rode periodicamente (cron) para manter a tabela pequena.
+
+Uso (no diretório backend/, com DATABASE_URL apontando para o Postgres):
+    python scripts/purge_refresh_tokens.py
+    python scripts/purge_refresh_tokens.py --older-than-days 7
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.core.db_conection import AsyncSessionLocal, async_engine
+from api.models.base import now
+from api.repositories.refresh_token import RefreshTokenRepository
+
+
+async def main(older_than_days: int, batch_size: int) -> None:
+    before = now() - timedelta(days=older_than_days)
+    try:
+        async with AsyncSessionLocal() as session:
+            purged = await RefreshTokenRepository(session).purge(before, batch_size)
+        print(f"{purged} refresh tokens apagados")
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--older-than-days", type=int, default=0, help="Mantém os tokens expirados/revogados há menos de N dias")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.older_than_days, args.batch_size))
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Reconstrói a tabela tarefa_contador a partir da tabela tarefa.
+
+Os contadores são mantidos pelas escritas do TaskRepository; use este
+comando depois de alterar tarefas por fora da aplicação (SQL manual,
+restauração de backup) ou se algum total da listagem parecer errado.
+Durante a reconstrução completa os incrementos concorrentes ficam bloqueados;
+com --usuario-id só as escritas daquele usuário esperam.
+
+Uso (no diretório backend/, com DATABASE_URL apontando para o Postgres):
+    python scripts/rebuild_task_counters.py
+    python scripts/rebuild_task_counters.py --usuario-id <uuid>
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.core.db_conection import AsyncSessionLocal, async_engine
+from api.repositories.task_counter import TaskCounterRepository
+
+
+async def main(usuario_id: uuid.UUID | None, batch_size: int) -> None:
+    try:
+        async with AsyncSessionLocal() as session:
+            written = await TaskCounterRepository(session).rebuild(usuario_id, batch_size)
+        print(f"{written} contadores gravados")
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--usuario-id", type=uuid.UUID, default=None, help="Reconstrói só os contadores deste usuário")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.usuario_id, args.batch_size))
@@ -1,27 +1,52 @@
+import os
 import pytest
 import asyncio
+from contextlib import contextmanager
+from datetime import datetime
 from typing import Generator
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
 from main import app
-from api.core.db_conection import get_db
+from api.core.db_conection import get_async_db
+from api.core.cache import token_version_cache, user_cache
+from api.core.throttle import login_buckets
 from api.models.base import Base
 
-# Test database URL - use in-memory database
-TEST_DATABASE_URL = "sqlite:///:memory:"
+# Test database URL - file database shared by the sync fixtures and the async app
+TEST_DATABASE_FILE = "test.db"
+TEST_DATABASE_URL = f"sqlite:///./{TEST_DATABASE_FILE}"
+TEST_ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///./{TEST_DATABASE_FILE}"
 
 # Create test database engine
 test_engine = create_engine(
     TEST_DATABASE_URL,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
 )
 
+# Async engine used by the app; NullPool because each TestClient runs its own event loop
+test_async_engine = create_async_engine(TEST_ASYNC_DATABASE_URL, poolclass=NullPool)
+
+
+@event.listens_for(test_async_engine.sync_engine, "before_cursor_execute")
+def reject_aware_datetimes(conn, cursor, statement, parameters, context, executemany):
+    """Fail like asyncpg on tz-aware datetimes bound to TIMESTAMP WITHOUT TIME ZONE columns.
+
+    SQLite's DateTime type drops the offset, so the check looks at the values
+    before the type conversion (defaults included).
+    """
+    for group in getattr(context, "compiled_parameters", None) or []:
+        for name, value in group.items():
+            if isinstance(value, datetime) and value.tzinfo is not None:
+                raise TypeError(f"tz-aware datetime bound to {name!r}: {statement}")
+
+
 # Create test session
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+TestingAsyncSessionLocal = async_sessionmaker(autoflush=False, bind=test_async_engine, expire_on_commit=False, class_=AsyncSession)
 
 
 @pytest.fixture(scope="session")
@@ -40,6 +65,9 @@ def db_engine():
     yield test_engine
     # Drop tables at the end of session
     Base.metadata.drop_all(bind=test_engine)
+    test_engine.dispose()
+    if os.path.exists(TEST_DATABASE_FILE):
+        os.remove(TEST_DATABASE_FILE)
 
 
 @pytest.fixture(scope="function")
@@ -53,24 +81,65 @@ def db_session(db_engine):
         session.close()
 
 
+@contextmanager
+def capture_statements():
+    """Collect the SQL statements the app sends to the test database."""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(test_async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(test_async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def enforce_query_budget(test_client: TestClient, max_queries: int) -> None:
+    """Fail any request made through test_client that issues more than max_queries statements."""
+    send = test_client.request
+    
+    def request(method, url, *args, **kwargs):
+        with capture_statements() as statements:
+            response = send(method, url, *args, **kwargs)
+        if len(statements) > max_queries:
+            listing = "\n".join(f"  {i}. {sql}" for i, sql in enumerate(statements, 1))
+            pytest.fail(
+                f"{method} {url} issued {len(statements)} SQL statements (max_queries={max_queries}):\n{listing}",
+                pytrace=False,
+            )
+        return response
+    
+    test_client.request = request
+
+
 @pytest.fixture(scope="function")
-def client(db_session) -> Generator:
-    """Create a test client with a fresh database."""
+def client(request, db_session) -> Generator:
+    """Create a test client with a fresh database.
     
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+    Tests marked with @pytest.mark.max_queries(n) fail when any single
+    request issues more than n SQL statements.
+    """
+    
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
     
     # Override the database dependency
-    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     
     with TestClient(app) as test_client:
+        budget = request.node.get_closest_marker("max_queries")
+        if budget is not None:
+            enforce_query_budget(test_client, *budget.args)
         yield test_client
     
-    # Clear overrides
+    # Clear overrides and cached authenticated users
     app.dependency_overrides.clear()
+    user_cache.clear()
+    token_version_cache.clear()
+    login_buckets.clear()
 
 
 @pytest.fixture(scope="function")
@@ -98,7 +167,35 @@ def test_user(db_session):
 
 
 @pytest.fixture(scope="function")
-def test_task(db_session, test_user):
+def rebuild_task_counters(db_engine):
+    """Rebuild the task counters for tasks seeded directly through db_session."""
+    from api.repositories.task_counter import TaskCounterRepository
+    
+    def rebuild(usuario_id=None):
+        async def run():
+            async with TestingAsyncSessionLocal() as session:
+                return await TaskCounterRepository(session).rebuild(usuario_id)
+        return asyncio.run(run())
+    
+    return rebuild
+
+
+@pytest.fixture(scope="function")
+def archive_tasks(db_engine):
+    """Run the archival job against the test database."""
+    from api.repositories.task_archive import TaskArchiveRepository
+    
+    def archive(before, batch_size=500, max_batches=None):
+        async def run():
+            async with TestingAsyncSessionLocal() as session:
+                return await TaskArchiveRepository(session).archive(before, batch_size, max_batches=max_batches)
+        return asyncio.run(run())
+    
+    return archive
+
+
+@pytest.fixture(scope="function")
+def test_task(db_session, test_user, rebuild_task_counters):
     """Create a test task for testing."""
     from tests.factories.task_factory import TaskFactory
     
@@ -106,5 +203,6 @@ def test_task(db_session, test_user):
     db_session.add(task)
     db_session.commit()
     db_session.refresh(task)
+    rebuild_task_counters(test_user.id)
     
     return task 
\ No newline at end of file
@@ -1,9 +1,11 @@
+import pytest
 from fastapi import status
 
 
 class TestAuthRoutes:
     """Test authentication API routes."""
     
+    @pytest.mark.max_queries(3)
     def test_register_user_success(self, client):
         """Test successful user registration."""
         user_data = {
@@ -23,6 +25,7 @@ class TestAuthRoutes:
         assert data["email"] == user_data["email"]
         # Note: The API currently returns the password, which should be fixed in production
     
+    @pytest.mark.max_queries(1)
     def test_register_user_duplicate_email(self, client, test_user):
         """Test user registration with duplicate email."""
         user_data = {
@@ -38,6 +41,20 @@ class TestAuthRoutes:
         # The API returns error message in Portuguese
         assert "já cadastrado" in response.json()["error"].lower()
     
+    @pytest.mark.max_queries(1)
+    def test_register_user_duplicate_email_other_case(self, client, test_user):
+        """Test emails that differ only in case are treated as the same account."""
+        user_data = {
+            "nome": "Another User",
+            "email": test_user.email.upper(),
+            "senha": "anotherpassword123"
+        }
+        
+        response = client.post("/api/v1/auth/register", json=user_data)
+        
+        assert response.status_code == status.HTTP_409_CONFLICT
+    
+    @pytest.mark.max_queries(0)
     def test_register_user_invalid_data(self, client):
         """Test user registration with invalid data."""
         # Missing required fields
@@ -50,6 +67,7 @@ class TestAuthRoutes:
         
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
     
+    @pytest.mark.max_queries(2)
     def test_login_success(self, client, test_user):
         """Test successful user login."""
         # The API expects form data with username and password fields
@@ -68,6 +86,59 @@ class TestAuthRoutes:
         assert "token_type" in data
         assert data["token_type"] == "Bearer"  # API returns "Bearer" with capital B
     
+    @pytest.mark.max_queries(2)
+    def test_login_email_is_case_insensitive(self, client, test_user):
+        """Test login finds the user regardless of the email case, and the token authenticates."""
+        response = client.post("/api/v1/auth/login", data={"username": test_user.email.upper(), "password": "testpassword123"})
+        
+        assert response.status_code == status.HTTP_200_OK
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        assert client.get("/api/v1/auth/me", headers=headers).json()["id"] == str(test_user.id)
+    
+    @pytest.mark.max_queries(1)
+    def test_login_throttled_before_database(self, client, test_user):
+        """Test attempts over the per-user limit get 429 without touching the database."""
+        from tests.conftest import capture_statements
+        login_data = {"username": test_user.email, "password": "wrongpassword"}
+        for _ in range(5):
+            assert client.post("/api/v1/auth/login", data=login_data).status_code == status.HTTP_400_BAD_REQUEST
+        
+        with capture_statements() as statements:
+            response = client.post("/api/v1/auth/login", data={**login_data, "password": "testpassword123"})
+        
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response.headers["Retry-After"]) > 0
+        assert statements == []
+        from api.core.throttle import ATTEMPTS
+        assert ATTEMPTS.value(("rejected",)) >= 1
+    
+    @pytest.mark.max_queries(1)
+    def test_login_email_wildcards_do_not_match(self, client, test_user):
+        """Test LIKE wildcards in the username are matched literally."""
+        response = client.post("/api/v1/auth/login", data={"username": "%", "password": "testpassword123"})
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    @pytest.mark.max_queries(3)
+    def test_login_rehashes_outdated_password(self, client, db_session):
+        """Test a successful login transparently upgrades an outdated hash."""
+        from api.core.hashing import pwd_context
+        from tests.factories.user_factory import UserFactory
+        
+        user = UserFactory(senha=pwd_context.hash("testpassword123", rounds=4))
+        db_session.add(user)
+        db_session.commit()
+        old_hash = user.senha
+        
+        response = client.post("/api/v1/auth/login", data={"username": user.email, "password": "testpassword123"})
+        
+        assert response.status_code == status.HTTP_200_OK
+        db_session.refresh(user)
+        assert user.senha != old_hash
+        assert pwd_context.verify("testpassword123", user.senha)
+        assert not pwd_context.needs_update(user.senha)
+    
+    @pytest.mark.max_queries(1)
     def test_login_invalid_credentials(self, client):
         """Test login with invalid credentials."""
         login_data = {
@@ -80,6 +151,7 @@ class TestAuthRoutes:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "credenciais inválidas" in response.json()["error"].lower()
     
+    @pytest.mark.max_queries(2)
     def test_get_user_info_authenticated(self, client, auth_headers):
         """Test getting user info with valid authentication."""
         # Use the correct endpoint: /api/v1/auth/me
@@ -94,24 +166,198 @@ class TestAuthRoutes:
         assert "email" in data
         # Note: created_at and updated_at are not returned by this endpoint
     
+    @pytest.mark.max_queries(3)
+    def test_get_user_info_caches_current_user(self, client, auth_headers, test_user):
+        """Test the authenticated user is cached and invalidated on delete."""
+        from api.core.cache import user_cache
+        
+        response = client.get("/api/v1/auth/me", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert user_cache.get(test_user.email).id == test_user.id
+        
+        response = client.delete(f"/api/v1/usuarios/{test_user.id}", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert user_cache.get(test_user.email) is None
+    
+    @pytest.mark.max_queries(0)
     def test_get_user_info_unauthenticated(self, client):
         """Test getting user info without authentication."""
         response = client.get("/api/v1/auth/me")
         
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
     
+    @pytest.mark.max_queries(2)
     def test_logout_success(self, client, auth_headers):
-        """Test successful logout."""
-        # Note: The API doesn't have a logout endpoint yet
-        # This test should be updated when logout is implemented
+        """Test logout revokes the user's refresh tokens."""
         response = client.post("/api/v1/auth/logout", headers=auth_headers)
         
-        # For now, expect 404 since logout endpoint doesn't exist
-        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.status_code == status.HTTP_204_NO_CONTENT
     
+    @pytest.mark.max_queries(0)
     def test_logout_unauthenticated(self, client):
         """Test logout without authentication."""
         response = client.post("/api/v1/auth/logout")
         
-        # For now, expect 404 since logout endpoint doesn't exist
-        assert response.status_code == status.HTTP_404_NOT_FOUND 
\ No newline at end of file
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+class TestRefreshTokens:
+    """Test rotating opaque refresh tokens."""
+    
+    def login(self, client, user, password="testpassword123"):
+        response = client.post("/api/v1/auth/login", data={"username": user.email, "password": password})
+        assert response.status_code == status.HTTP_200_OK
+        return response.json()
+    
+    def refresh(self, client, refresh_token):
+        return client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+    
+    @pytest.mark.max_queries(3)
+    def test_login_returns_refresh_token(self, client, test_user, db_session):
+        """Test login issues an opaque refresh token stored only as a hash."""
+        from api.models.refresh_token import TokenAtualizacao
+        from api.repositories.refresh_token import hash_token
+        
+        tokens = self.login(client, test_user)
+        
+        assert tokens["refresh_token"]
+        stored = db_session.query(TokenAtualizacao).filter_by(usuario_id=test_user.id).one()
+        assert stored.token_hash == hash_token(tokens["refresh_token"])
+        assert stored.token_hash != tokens["refresh_token"]
+    
+    @pytest.mark.max_queries(3)
+    def test_refresh_rotates_token(self, client, test_user):
+        """Test refresh returns a new pair without a password check and the access token works."""
+        tokens = self.login(client, test_user)
+        
+        response = self.refresh(client, tokens["refresh_token"])
+        
+        assert response.status_code == status.HTTP_200_OK
+        rotated = response.json()
+        assert rotated["refresh_token"] != tokens["refresh_token"]
+        headers = {"Authorization": f"Bearer {rotated['access_token']}"}
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == status.HTTP_200_OK
+    
+    @pytest.mark.max_queries(3)
+    def test_refresh_reuse_revokes_family(self, client, test_user):
+        """Test presenting a rotated token again revokes the token that replaced it."""
+        tokens = self.login(client, test_user)
+        rotated = self.refresh(client, tokens["refresh_token"]).json()
+        
+        reused = self.refresh(client, tokens["refresh_token"])
+        
+        assert reused.status_code == status.HTTP_401_UNAUTHORIZED
+        assert self.refresh(client, rotated["refresh_token"]).status_code == status.HTTP_401_UNAUTHORIZED
+    
+    @pytest.mark.max_queries(3)
+    def test_refresh_rejects_unknown_and_expired_tokens(self, client, test_user, db_session):
+        """Test unknown and expired refresh tokens are rejected."""
+        from datetime import datetime, timedelta
+        from api.models.refresh_token import TokenAtualizacao
+        
+        assert self.refresh(client, "nao-existe").status_code == status.HTTP_401_UNAUTHORIZED
+        
+        tokens = self.login(client, test_user)
+        stored = db_session.query(TokenAtualizacao).filter_by(usuario_id=test_user.id).one()
+        stored.expires_at = datetime.now() - timedelta(days=1)
+        db_session.commit()
+        
+        assert self.refresh(client, tokens["refresh_token"]).status_code == status.HTTP_401_UNAUTHORIZED
+    
+    @pytest.mark.max_queries(5)
+    def test_password_change_revokes_refresh_tokens(self, client, test_user):
+        """Test changing the password revokes every refresh token of the user."""
+        tokens = self.login(client, test_user)
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+        
+        client.patch(f"/api/v1/usuarios/{test_user.id}", json={"senha": "novasenha123"}, headers=headers)
+        
+        assert self.refresh(client, tokens["refresh_token"]).status_code == status.HTTP_401_UNAUTHORIZED
+    
+    @pytest.mark.max_queries(3)
+    def test_logout_revokes_refresh_tokens(self, client, test_user):
+        """Test logout ends every session of the user."""
+        first = self.login(client, test_user)
+        second = self.login(client, test_user)
+        headers = {"Authorization": f"Bearer {first['access_token']}"}
+        
+        assert client.post("/api/v1/auth/logout", headers=headers).status_code == status.HTTP_204_NO_CONTENT
+        
+        assert self.refresh(client, first["refresh_token"]).status_code == status.HTTP_401_UNAUTHORIZED
+        assert self.refresh(client, second["refresh_token"]).status_code == status.HTTP_401_UNAUTHORIZED
+
+class TestClaimsOnlyAuth:
+    """Test the AUTH_CLAIMS_ONLY mode and token_version revocation."""
+    
+    @pytest.fixture
+    def claims_only(self, monkeypatch):
+        from api.core import security
+        monkeypatch.setattr(security.settings, "AUTH_CLAIMS_ONLY", True)
+        return security
+    
+    def login(self, client, user, password="testpassword123"):
+        response = client.post("/api/v1/auth/login", data={"username": user.email, "password": password})
+        assert response.status_code == status.HTTP_200_OK
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    
+    @pytest.mark.max_queries(3)
+    def test_login_token_carries_claims(self, client, test_user):
+        """Test the access token carries the user id, name and token_version."""
+        import jwt
+        headers = self.login(client, test_user)
+        
+        payload = jwt.decode(headers["Authorization"].split()[1], options={"verify_signature": False})
+        
+        assert payload["sub"] == test_user.email
+        assert payload["uid"] == str(test_user.id)
+        assert payload["nome"] == test_user.nome
+        assert payload["ver"] == 0
+    
+    @pytest.mark.max_queries(3)
+    def test_reads_skip_user_lookup(self, client, test_user, claims_only):
+        """Test read endpoints authenticate from the claims without querying usuario."""
+        from tests.conftest import capture_statements
+        headers = self.login(client, test_user)
+        
+        with capture_statements() as statements:
+            response = client.get("/api/v1/tarefas/", headers=headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert not any("FROM usuario" in sql for sql in statements)
+    
+    @pytest.mark.max_queries(5)
+    def test_password_change_revokes_tokens_on_writes(self, client, test_user, claims_only):
+        """Test bumping token_version rejects old tokens on writes while reads keep trusting claims."""
+        headers = self.login(client, test_user)
+        
+        response = client.patch(f"/api/v1/usuarios/{test_user.id}", json={"senha": "novasenha123"}, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        
+        assert client.get("/api/v1/tarefas/", headers=headers).status_code == status.HTTP_200_OK
+        task = {"titulo": "Depois da troca", "descricao": "x", "status": "PENDENTE", "prioridade": "MEDIA"}
+        assert client.post("/api/v1/tarefas/", json=task, headers=headers).status_code == status.HTTP_401_UNAUTHORIZED
+        
+        new_headers = self.login(client, test_user, password="novasenha123")
+        assert client.post("/api/v1/tarefas/", json=task, headers=new_headers).status_code == status.HTTP_201_CREATED
+    
+    @pytest.mark.max_queries(4)
+    def test_reads_recheck_version_at_interval(self, client, test_user, claims_only, monkeypatch):
+        """Test AUTH_TOKEN_VERSION_CHECK_SECONDS makes reads verify token_version too."""
+        from api.core.cache import token_version_cache
+        monkeypatch.setattr(claims_only.settings, "AUTH_TOKEN_VERSION_CHECK_SECONDS", 60)
+        monkeypatch.setattr(token_version_cache, "ttl", 60)
+        headers = self.login(client, test_user)
+        
+        client.delete(f"/api/v1/usuarios/{test_user.id}", headers=headers)
+        
+        assert client.get("/api/v1/tarefas/", headers=headers).status_code == status.HTTP_401_UNAUTHORIZED
+    
+    @pytest.mark.max_queries(5)
+    def test_password_change_revokes_tokens_by_default(self, client, test_user):
+        """Test the default mode also rejects tokens issued before a password change."""
+        headers = self.login(client, test_user)
+        
+        client.patch(f"/api/v1/usuarios/{test_user.id}", json={"senha": "novasenha123"}, headers=headers)
+        
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == status.HTTP_401_UNAUTHORIZED
@@ -1,11 +1,17 @@
+import pytest
+import csv
+import io
+import json
 from fastapi import status
 from datetime import datetime, timedelta
 from api.models.task import StatusTarefa, PrioridadeTarefa
+from tests.conftest import capture_statements
 
 
 class TestTaskRoutes:
     """Test task management API routes."""
     
+    @pytest.mark.max_queries(4)
     def test_create_task_success(self, client, auth_headers):
         """Test successful task creation."""
         task_data = {
@@ -37,6 +43,7 @@ class TestTaskRoutes:
         assert "created_at" in task
         assert "updated_at" in task
     
+    @pytest.mark.max_queries(0)
     def test_create_task_unauthenticated(self, client):
         """Test task creation without authentication."""
         task_data = {
@@ -51,6 +58,7 @@ class TestTaskRoutes:
         
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
     
+    @pytest.mark.max_queries(1)
     def test_create_task_invalid_data(self, client, auth_headers):
         """Test task creation with invalid data."""
         # Missing required fields
@@ -63,6 +71,7 @@ class TestTaskRoutes:
         
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
     
+    @pytest.mark.max_queries(4)
     def test_get_user_tasks(self, client, auth_headers, test_task):
         """Test getting tasks for authenticated user."""
         response = client.get("/api/v1/tarefas/", headers=auth_headers)
@@ -87,12 +96,14 @@ class TestTaskRoutes:
             assert "data_vencimento" in task
             assert "usuario_id" in task
     
+    @pytest.mark.max_queries(0)
     def test_get_user_tasks_unauthenticated(self, client):
         """Test getting tasks without authentication."""
         response = client.get("/api/v1/tarefas/")
         
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
     
+    @pytest.mark.max_queries(2)
     def test_get_task_by_id(self, client, auth_headers, test_task):
         """Test getting a specific task by ID."""
         response = client.get(f"/api/v1/tarefas/{test_task.id}", headers=auth_headers)
@@ -113,6 +124,64 @@ class TestTaskRoutes:
         assert task["status"] == test_task.status
         assert task["prioridade"] == test_task.prioridade
     
+    @pytest.mark.max_queries(3)
+    def test_get_user_tasks_etag(self, client, auth_headers, test_task):
+        """Test conditional listing with If-None-Match."""
+        with capture_statements() as statements:
+            response = client.get("/api/v1/tarefas/", headers=auth_headers)
+        etag = response.headers["ETag"]
+        assert etag.startswith('W/"')
+        # The ETag version reads the total from the counters and the listing reuses it
+        assert response.json()["total"] >= 1
+        assert not any("count(" in sql for sql in statements)
+
+        with capture_statements() as statements:
+            not_modified = client.get("/api/v1/tarefas/", headers={**auth_headers, "If-None-Match": etag})
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not_modified.content == b""
+        assert len(statements) == 1
+
+        # Another page of the same data has its own ETag
+        other_page = client.get("/api/v1/tarefas/", params={"limit": 1}, headers={**auth_headers, "If-None-Match": etag})
+        assert other_page.status_code == status.HTTP_200_OK
+
+        client.patch(f"/api/v1/tarefas/{test_task.id}", json={"titulo": "Changed"}, headers=auth_headers)
+        changed = client.get("/api/v1/tarefas/", headers={**auth_headers, "If-None-Match": etag})
+        assert changed.status_code == status.HTTP_200_OK
+        assert changed.headers["ETag"] != etag
+
+    @pytest.mark.max_queries(4)
+    def test_get_user_tasks_fast_json_identical(self, client, auth_headers, db_session, test_user, monkeypatch):
+        """Test the TypeAdapter fast path produces the same bytes and headers as the default path."""
+        from api.core.settings import settings
+        from tests.factories.task_factory import TaskFactory
+
+        db_session.add_all([TaskFactory(usuario_id=test_user.id, titulo=f"Revisão nº {i}") for i in range(3)])
+        db_session.commit()
+
+        default = client.get("/api/v1/tarefas/", params={"limit": 2}, headers=auth_headers)
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+        fast = client.get("/api/v1/tarefas/", params={"limit": 2}, headers=auth_headers)
+
+        assert fast.status_code == default.status_code == status.HTTP_200_OK
+        assert fast.content == default.content
+        assert fast.headers["content-type"] == default.headers["content-type"]
+        assert fast.headers["ETag"] == default.headers["ETag"]
+
+    @pytest.mark.max_queries(3)
+    def test_get_task_by_id_etag(self, client, auth_headers, test_task):
+        """Test conditional read of a single task with If-None-Match."""
+        etag = client.get(f"/api/v1/tarefas/{test_task.id}", headers=auth_headers).headers["ETag"]
+
+        response = client.get(f"/api/v1/tarefas/{test_task.id}", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        client.patch(f"/api/v1/tarefas/{test_task.id}", json={"status": StatusTarefa.CONCLUIDA}, headers=auth_headers)
+        response = client.get(f"/api/v1/tarefas/{test_task.id}", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+
+    @pytest.mark.max_queries(2)
     def test_get_task_by_id_not_found(self, client, auth_headers):
         """Test getting a non-existent task."""
         # Use a valid UUID format instead of "99999"
@@ -120,12 +189,14 @@ class TestTaskRoutes:
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
     
+    @pytest.mark.max_queries(0)
     def test_get_task_by_id_unauthenticated(self, client, test_task):
         """Test getting a task without authentication."""
         response = client.get(f"/api/v1/tarefas/{test_task.id}")
         
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
     
+    @pytest.mark.max_queries(4)
     def test_update_task_success(self, client, auth_headers, test_task):
         """Test successful task update."""
         update_data = {
@@ -153,6 +224,7 @@ class TestTaskRoutes:
         assert task["prioridade"] == update_data["prioridade"]
         assert task["id"] == str(test_task.id)  # Convert UUID to string for comparison
     
+    @pytest.mark.max_queries(3)
     def test_update_task_not_found(self, client, auth_headers):
         """Test updating a non-existent task."""
         update_data = {
@@ -167,6 +239,7 @@ class TestTaskRoutes:
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
     
+    @pytest.mark.max_queries(0)
     def test_update_task_unauthenticated(self, client, test_task):
         """Test updating a task without authentication."""
         update_data = {
@@ -178,6 +251,7 @@ class TestTaskRoutes:
         
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
     
+    @pytest.mark.max_queries(3)
     def test_delete_task_success(self, client, auth_headers, test_task):
         """Test successful task deletion."""
         task_id = test_task.id
@@ -191,6 +265,32 @@ class TestTaskRoutes:
         get_response = client.get(f"/api/v1/tarefas/{task_id}", headers=auth_headers)
         assert get_response.status_code == status.HTTP_404_NOT_FOUND
     
+    @pytest.mark.max_queries(2)
+    def test_update_and_delete_single_statement(self, client, auth_headers, test_task):
+        """Test update and delete hit the tarefa table with a single UPDATE ... RETURNING."""
+        # Warm up the authenticated user cache so only task statements are captured
+        client.get(f"/api/v1/tarefas/{test_task.id}", headers=auth_headers)
+        
+        with capture_statements() as statements:
+            response = client.patch(f"/api/v1/tarefas/{test_task.id}", json={"titulo": "Single"}, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"][0]["titulo"] == "Single"
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE tarefa") and "RETURNING" in statements[0]
+        
+        with capture_statements() as statements:
+            response = client.delete(f"/api/v1/tarefas/{test_task.id}", headers=auth_headers)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        task_statements = [sql for sql in statements if not sql.startswith("INSERT INTO tarefa_contador")]
+        assert len(task_statements) == 1
+        assert task_statements[0].startswith("UPDATE tarefa") and "RETURNING" in task_statements[0]
+        
+        with capture_statements() as statements:
+            response = client.delete(f"/api/v1/tarefas/{test_task.id}", headers=auth_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert len(statements) == 1
+    
+    @pytest.mark.max_queries(2)
     def test_delete_task_not_found(self, client, auth_headers):
         """Test deleting a non-existent task."""
         # Use a valid UUID format instead of "99999"
@@ -198,12 +298,14 @@ class TestTaskRoutes:
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
     
+    @pytest.mark.max_queries(0)
     def test_delete_task_unauthenticated(self, client, test_task):
         """Test deleting a task without authentication."""
         response = client.delete(f"/api/v1/tarefas/{test_task.id}")
         
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
     
+    @pytest.mark.max_queries(4)
     def test_update_task_status(self, client, auth_headers, test_task):
         """Test updating task status."""
         status_data = {"status": StatusTarefa.CONCLUIDA}
@@ -223,10 +325,419 @@ class TestTaskRoutes:
         assert task["status"] == StatusTarefa.CONCLUIDA
         assert task["id"] == str(test_task.id)  # Convert UUID to string for comparison
     
+    @pytest.mark.max_queries(1)
     def test_update_task_status_invalid(self, client, auth_headers, test_task):
         """Test updating task status with invalid value."""
         status_data = {"status": "INVALID_STATUS"}
         
         response = client.patch(f"/api/v1/tarefas/{test_task.id}", json=status_data, headers=auth_headers)
         
-        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY 
\ No newline at end of file
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    @pytest.mark.max_queries(4)
+    def test_get_user_tasks_cursor_pagination(self, client, auth_headers, db_session, test_user, rebuild_task_counters):
+        """Test keyset pagination through next_cursor."""
+        from tests.factories.task_factory import TaskFactory
+        
+        tasks = [TaskFactory(usuario_id=test_user.id) for _ in range(3)]
+        db_session.add_all(tasks)
+        db_session.commit()
+        rebuild_task_counters(test_user.id)
+        
+        first = client.get("/api/v1/tarefas/", params={"limit": 2}, headers=auth_headers).json()
+        assert first["total"] == 3
+        assert len(first["data"]) == 2
+        assert first["next_cursor"] is not None
+        
+        second = client.get("/api/v1/tarefas/", params={"limit": 2, "cursor": first["next_cursor"]}, headers=auth_headers).json()
+        assert len(second["data"]) == 1
+        assert second["next_cursor"] is None
+        
+        ids = [task["id"] for task in first["data"] + second["data"]]
+        assert sorted(ids) == sorted(str(task.id) for task in tasks)
+    
+    @pytest.mark.max_queries(2)
+    def test_get_user_tasks_invalid_cursor(self, client, auth_headers):
+        """Test listing tasks with a malformed cursor."""
+        response = client.get("/api/v1/tarefas/", params={"cursor": "invalid"}, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.max_queries(2)
+    def test_get_user_tasks_cursor_with_wrong_payload(self, client, auth_headers):
+        """Test well-encoded cursors whose payload is not [sort, value, id] strings are rejected."""
+        import base64
+        
+        payloads = [
+            ["created_at:desc", "2024-01-01T00:00:00", 1],
+            ["created_at:desc", 1704067200, "00000000-0000-0000-0000-000000000000"],
+            ["created_at:desc", "2024-01-01T00:00:00"],
+            {"sort": "created_at:desc"},
+            "created_at:desc",
+        ]
+        for payload in payloads:
+            cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+            response = client.get("/api/v1/tarefas/", params={"cursor": cursor}, headers=auth_headers)
+            
+            assert response.status_code == status.HTTP_400_BAD_REQUEST, payload
+            assert response.json() == {"error": "Cursor inválido"}
+
+    @pytest.mark.max_queries(4)
+    def test_get_user_tasks_filtered(self, client, auth_headers, db_session, test_user, rebuild_task_counters):
+        """Test server-side filtering by status, priority and overdue flag."""
+        from tests.factories.task_factory import TaskFactory
+
+        overdue = TaskFactory(
+            usuario_id=test_user.id,
+            status=StatusTarefa.PENDENTE,
+            prioridade=PrioridadeTarefa.ALTA,
+            data_vencimento=datetime.now() - timedelta(days=1),
+        )
+        pending = TaskFactory(usuario_id=test_user.id, status=StatusTarefa.PENDENTE, prioridade=PrioridadeTarefa.BAIXA)
+        done = TaskFactory(
+            usuario_id=test_user.id,
+            status=StatusTarefa.CONCLUIDA,
+            prioridade=PrioridadeTarefa.ALTA,
+            data_vencimento=datetime.now() - timedelta(days=2),
+        )
+        db_session.add_all([overdue, pending, done])
+        db_session.commit()
+        rebuild_task_counters(test_user.id)
+
+        def ids(params):
+            response = client.get("/api/v1/tarefas/", params=params, headers=auth_headers)
+            assert response.status_code == status.HTTP_200_OK
+            data = response.json()
+            assert data["total"] == len(data["data"])
+            return {task["id"] for task in data["data"]}
+
+        assert ids({"status": "PENDENTE"}) == {str(overdue.id), str(pending.id)}
+        assert ids({"prioridade": "ALTA"}) == {str(overdue.id), str(done.id)}
+        assert ids({"atrasadas": True}) == {str(overdue.id)}
+        assert ids({"atrasadas": False}) == {str(pending.id), str(done.id)}
+        assert ids({"data_vencimento_ate": datetime.now().isoformat()}) == {str(overdue.id), str(done.id)}
+
+    @pytest.mark.max_queries(4)
+    def test_get_user_tasks_sorted_with_cursor(self, client, auth_headers, db_session, test_user):
+        """Test sorting by due date ascending while paginating with a cursor."""
+        from tests.factories.task_factory import TaskFactory
+
+        now = datetime.now()
+        tasks = [TaskFactory(usuario_id=test_user.id, data_vencimento=now + timedelta(days=days)) for days in (3, 1, 2)]
+        db_session.add_all(tasks)
+        db_session.commit()
+
+        params = {"limit": 2, "ordenar_por": "data_vencimento", "ordem": "asc"}
+        first = client.get("/api/v1/tarefas/", params=params, headers=auth_headers).json()
+        second = client.get("/api/v1/tarefas/", params={**params, "cursor": first["next_cursor"]}, headers=auth_headers).json()
+
+        ids = [task["id"] for task in first["data"] + second["data"]]
+        assert ids == [str(tasks[1].id), str(tasks[2].id), str(tasks[0].id)]
+        assert second["next_cursor"] is None
+
+        # O cursor só vale para a ordenação que o gerou
+        response = client.get("/api/v1/tarefas/", params={"limit": 2, "cursor": first["next_cursor"]}, headers=auth_headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.max_queries(3)
+    def test_search_tasks(self, client, auth_headers, db_session, test_user):
+        """Test searching tasks by title and description, ignoring deleted tasks."""
+        from tests.factories.task_factory import TaskFactory
+
+        by_title = TaskFactory(usuario_id=test_user.id, titulo="Reunião com cliente", descricao="Pauta")
+        by_description = TaskFactory(usuario_id=test_user.id, titulo="Ligar", descricao="Confirmar reunião")
+        deleted = TaskFactory(usuario_id=test_user.id, titulo="Reunião antiga", flg_excluido=True)
+        other = TaskFactory(usuario_id=test_user.id, titulo="Comprar pão", descricao="Padaria")
+        db_session.add_all([by_title, by_description, deleted, other])
+        db_session.commit()
+
+        response = client.get("/api/v1/tarefas/search", params={"q": "reunião"}, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 2
+        assert {task["id"] for task in data["data"]} == {str(by_title.id), str(by_description.id)}
+
+    @pytest.mark.max_queries(2)
+    def test_export_tasks_ndjson(self, client, auth_headers, db_session, test_user):
+        """Test streaming export as NDJSON, one task per line."""
+        from tests.factories.task_factory import TaskFactory
+
+        tasks = [TaskFactory(usuario_id=test_user.id) for _ in range(3)]
+        deleted = TaskFactory(usuario_id=test_user.id, flg_excluido=True)
+        db_session.add_all(tasks + [deleted])
+        db_session.commit()
+
+        response = client.get("/api/v1/tarefas/export", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert {line["id"] for line in lines} == {str(task.id) for task in tasks}
+
+    @pytest.mark.max_queries(2)
+    def test_export_tasks_csv(self, client, auth_headers, db_session, test_user):
+        """Test streaming export as CSV with a header row."""
+        from tests.factories.task_factory import TaskFactory
+
+        pending = TaskFactory(usuario_id=test_user.id, status=StatusTarefa.PENDENTE, titulo="Título, com vírgula")
+        done = TaskFactory(usuario_id=test_user.id, status=StatusTarefa.CONCLUIDA)
+        db_session.add_all([pending, done])
+        db_session.commit()
+
+        response = client.get("/api/v1/tarefas/export", params={"format": "csv", "status": "PENDENTE"}, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 1
+        assert rows[0]["id"] == str(pending.id)
+        assert rows[0]["titulo"] == "Título, com vírgula"
+        assert rows[0]["status"] == "PENDENTE"
+
+    @pytest.mark.max_queries(4)
+    def test_task_counters_follow_writes(self, client, auth_headers):
+        """Test the listing total tracks creates, status changes and deletes."""
+        task_data = {
+            "titulo": "Counted Task",
+            "descricao": "Counted",
+            "status": StatusTarefa.PENDENTE,
+            "prioridade": PrioridadeTarefa.MEDIA,
+        }
+        first = client.post("/api/v1/tarefas/", json=task_data, headers=auth_headers).json()["data"][0]
+        second = client.post("/api/v1/tarefas/", json=task_data, headers=auth_headers).json()["data"][0]
+        client.post("/api/v1/tarefas/bulk", json=[task_data, {**task_data, "status": StatusTarefa.CONCLUIDA}], headers=auth_headers)
+
+        def total(**params):
+            return client.get("/api/v1/tarefas/", params=params, headers=auth_headers).json()["total"]
+
+        assert (total(), total(status="PENDENTE"), total(status="CONCLUIDA")) == (4, 3, 1)
+
+        client.patch(f"/api/v1/tarefas/{first['id']}", json={"status": StatusTarefa.CONCLUIDA}, headers=auth_headers)
+        assert (total(), total(status="PENDENTE"), total(status="CONCLUIDA")) == (4, 2, 2)
+
+        assert client.delete(f"/api/v1/tarefas/{second['id']}", headers=auth_headers).status_code == status.HTTP_204_NO_CONTENT
+        assert client.delete(f"/api/v1/tarefas/{second['id']}", headers=auth_headers).status_code == status.HTTP_404_NOT_FOUND
+        assert (total(), total(status="PENDENTE"), total(status="CONCLUIDA")) == (3, 1, 2)
+
+        client.request("DELETE", "/api/v1/tarefas/bulk", json={"filtro": {"status": "CONCLUIDA"}}, headers=auth_headers)
+        assert (total(), total(status="PENDENTE"), total(status="CONCLUIDA")) == (1, 1, 0)
+
+    @pytest.mark.max_queries(4)
+    def test_rebuild_task_counters(self, client, auth_headers, db_session, test_user, rebuild_task_counters):
+        """Test the repair command rebuilds counters for tasks written outside the repository."""
+        from tests.factories.task_factory import TaskFactory
+
+        db_session.add_all([TaskFactory(usuario_id=test_user.id) for _ in range(4)])
+        db_session.add(TaskFactory(usuario_id=test_user.id, flg_excluido=True))
+        db_session.commit()
+        assert client.get("/api/v1/tarefas/", headers=auth_headers).json()["total"] == 0
+
+        rebuild_task_counters(test_user.id)
+
+        assert client.get("/api/v1/tarefas/", headers=auth_headers).json()["total"] == 4
+
+    @pytest.mark.max_queries(1)
+    def test_search_tasks_blank_query(self, client, auth_headers):
+        """Test searching with a blank query."""
+        response = client.get("/api/v1/tarefas/search", params={"q": "  "}, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.max_queries(1)
+    def test_search_tasks_too_short_query(self, client, auth_headers):
+        """Test queries below the full-text minimum or without letters and digits are rejected."""
+        for q in ("re", " a ", "!!!"):
+            response = client.get("/api/v1/tarefas/search", params={"q": q}, headers=auth_headers)
+
+            assert response.status_code == status.HTTP_400_BAD_REQUEST, q
+
+    @pytest.mark.max_queries(3)
+    def test_create_tasks_bulk(self, client, auth_headers, test_user):
+        """Test bulk creation reports invalid items and inserts the rest."""
+        valid_task = {
+            "titulo": "Bulk Task",
+            "descricao": "Created in bulk",
+            "status": StatusTarefa.PENDENTE,
+            "prioridade": PrioridadeTarefa.MEDIA,
+            "data_vencimento": (datetime.now() + timedelta(days=7)).isoformat()
+        }
+        payload = [valid_task, {"titulo": "Missing fields"}, {**valid_task, "titulo": "Bulk Task 2"}]
+        
+        response = client.post("/api/v1/tarefas/bulk", json=payload, headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert [task["titulo"] for task in data["data"]] == ["Bulk Task", "Bulk Task 2"]
+        assert all(task["usuario_id"] == str(test_user.id) for task in data["data"])
+        assert len(data["errors"]) == 1
+        assert data["errors"][0]["index"] == 1
+        
+        listing = client.get("/api/v1/tarefas/", headers=auth_headers).json()
+        assert listing["total"] == 2
+    
+    @pytest.mark.max_queries(1)
+    def test_create_tasks_bulk_all_invalid(self, client, auth_headers):
+        """Test bulk creation with no valid item."""
+        response = client.post("/api/v1/tarefas/bulk", json=[{"titulo": "Missing fields"}], headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    @pytest.mark.max_queries(1)
+    def test_create_tasks_bulk_too_many(self, client, auth_headers, monkeypatch):
+        """Test bulk creation above the configured batch size."""
+        from api.core.settings import settings
+        
+        monkeypatch.setattr(settings, "TASK_BULK_MAX_ITEMS", 1)
+        response = client.post("/api/v1/tarefas/bulk", json=[{}, {}], headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    @pytest.mark.max_queries(4)
+    def test_update_tasks_bulk_by_ids(self, client, auth_headers, db_session, test_user):
+        """Test bulk update of a list of task ids."""
+        from tests.factories.task_factory import TaskFactory
+        
+        tasks = [TaskFactory(usuario_id=test_user.id, status=StatusTarefa.PENDENTE) for _ in range(3)]
+        db_session.add_all(tasks)
+        db_session.commit()
+        selected = [str(task.id) for task in tasks[:2]]
+        
+        response = client.patch("/api/v1/tarefas/bulk", json={"ids": selected, "dados": {"status": StatusTarefa.CONCLUIDA}}, headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 2
+        assert sorted(data["ids"]) == sorted(selected)
+        
+        for task in tasks:
+            db_session.refresh(task)
+        assert [task.status for task in tasks] == [StatusTarefa.CONCLUIDA, StatusTarefa.CONCLUIDA, StatusTarefa.PENDENTE]
+    
+    @pytest.mark.max_queries(2)
+    def test_update_tasks_bulk_ignores_other_users(self, client, auth_headers, db_session):
+        """Test bulk update never touches tasks of another user."""
+        from tests.factories.task_factory import TaskFactory
+        from tests.factories.user_factory import UserFactory
+        
+        other_user = UserFactory()
+        db_session.add(other_user)
+        db_session.commit()
+        other_task = TaskFactory(usuario_id=other_user.id)
+        db_session.add(other_task)
+        db_session.commit()
+        
+        response = client.patch("/api/v1/tarefas/bulk", json={"ids": [str(other_task.id)], "dados": {"titulo": "Hijacked"}}, headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["total"] == 0
+    
+    @pytest.mark.max_queries(3)
+    def test_delete_tasks_bulk_by_filter(self, client, auth_headers, db_session, test_user):
+        """Test bulk soft-delete of the tasks matching a filter."""
+        from tests.factories.task_factory import TaskFactory
+        
+        high = TaskFactory(usuario_id=test_user.id, prioridade=PrioridadeTarefa.ALTA)
+        low = TaskFactory(usuario_id=test_user.id, prioridade=PrioridadeTarefa.BAIXA)
+        db_session.add_all([high, low])
+        db_session.commit()
+        
+        response = client.request("DELETE", "/api/v1/tarefas/bulk", json={"filtro": {"prioridade": PrioridadeTarefa.ALTA}}, headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["ids"] == [str(high.id)]
+        
+        listing = client.get("/api/v1/tarefas/", headers=auth_headers).json()
+        assert [task["id"] for task in listing["data"]] == [str(low.id)]
+    
+    @pytest.mark.max_queries(1)
+    def test_bulk_requires_ids_or_filter(self, client, auth_headers):
+        """Test bulk operations reject an empty or ambiguous selection."""
+        response = client.request("DELETE", "/api/v1/tarefas/bulk", json={}, headers=auth_headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        
+        response = client.request("DELETE", "/api/v1/tarefas/bulk", json={"filtro": {}}, headers=auth_headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestTaskArchive:
+    """Test archival of soft-deleted tasks and their restore."""
+    
+    def seed_deleted(self, db_session, user, count=1, days_ago=60):
+        from tests.factories.task_factory import TaskFactory
+        
+        deleted_at = datetime.now() - timedelta(days=days_ago)
+        tasks = [TaskFactory(usuario_id=user.id, flg_excluido=True, updated_at=deleted_at) for _ in range(count)]
+        db_session.add_all(tasks)
+        db_session.commit()
+        return tasks
+    
+    def test_archive_moves_only_old_deleted_tasks(self, db_session, test_user, test_task, archive_tasks):
+        """Test the job moves deleted tasks older than the cutoff and leaves the rest in tarefa."""
+        from api.models.task import Tarefa
+        from api.models.task_archive import TarefaArquivo
+        
+        old = self.seed_deleted(db_session, test_user)[0]
+        old_id, old_titulo = old.id, old.titulo
+        recent = self.seed_deleted(db_session, test_user, days_ago=1)[0]
+        
+        assert archive_tasks(datetime.now() - timedelta(days=30)) >= 1
+        
+        db_session.expire_all()
+        remaining = db_session.query(Tarefa.id).filter_by(usuario_id=test_user.id)
+        assert {task_id for task_id, in remaining} == {test_task.id, recent.id}
+        archived = db_session.query(TarefaArquivo).filter_by(usuario_id=test_user.id).one()
+        assert (archived.id, archived.titulo, archived.flg_excluido) == (old_id, old_titulo, True)
+    
+    def test_archive_resumes_in_batches(self, db_session, test_user, archive_tasks):
+        """Test a run stopped after max_batches leaves the remainder for the next run."""
+        from api.models.task_archive import TarefaArquivo
+        
+        # A cutoff this old only matches the tasks seeded here
+        self.seed_deleted(db_session, test_user, count=5, days_ago=10000)
+        before = datetime.now() - timedelta(days=9999)
+        
+        assert archive_tasks(before, batch_size=2, max_batches=1) == 2
+        assert archive_tasks(before, batch_size=2) == 3
+        assert archive_tasks(before, batch_size=2) == 0
+        assert db_session.query(TarefaArquivo).filter_by(usuario_id=test_user.id).count() == 5
+    
+    @pytest.mark.max_queries(5)
+    def test_restore_archived_task(self, client, auth_headers, db_session, test_user, archive_tasks, rebuild_task_counters):
+        """Test an archived task comes back to tarefa, in the listing and its total."""
+        task_id = self.seed_deleted(db_session, test_user)[0].id
+        rebuild_task_counters(test_user.id)
+        archive_tasks(datetime.now() - timedelta(days=30))
+        
+        response = client.post(f"/api/v1/tarefas/{task_id}/restaurar", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"][0]["id"] == str(task_id)
+        listing = client.get("/api/v1/tarefas/", headers=auth_headers).json()
+        assert [item["id"] for item in listing["data"]] == [str(task_id)]
+        assert listing["total"] == 1
+    
+    @pytest.mark.max_queries(4)
+    def test_restore_deleted_task_not_yet_archived(self, client, auth_headers, test_task):
+        """Test restore also undoes a soft delete the job has not archived yet."""
+        client.delete(f"/api/v1/tarefas/{test_task.id}", headers=auth_headers)
+        
+        response = client.post(f"/api/v1/tarefas/{test_task.id}/restaurar", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert client.get(f"/api/v1/tarefas/{test_task.id}", headers=auth_headers).status_code == status.HTTP_200_OK
+        assert client.get("/api/v1/tarefas/", headers=auth_headers).json()["total"] == 1
+    
+    @pytest.mark.max_queries(3)
+    def test_restore_requires_deleted_task_of_the_user(self, client, auth_headers, db_session, test_task, archive_tasks):
+        """Test restoring an active task or another user's archived task returns 404."""
+        from tests.factories.user_factory import UserFactory
+        
+        other_user = UserFactory()
+        db_session.add(other_user)
+        db_session.commit()
+        other_task_id = self.seed_deleted(db_session, other_user)[0].id
+        archive_tasks(datetime.now() - timedelta(days=30))
+        
+        assert client.post(f"/api/v1/tarefas/{test_task.id}/restaurar", headers=auth_headers).status_code == status.HTTP_404_NOT_FOUND
+        assert client.post(f"/api/v1/tarefas/{other_task_id}/restaurar", headers=auth_headers).status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1 @@
+# Load-test harness (run via run_tests.py --load)
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Teste de carga da API de tarefas.
+
+Popula N usuários × M tarefas com as factories de tests/factories, sobe a
+aplicação com uvicorn (ou usa --base-url de uma instância já rodando) e
+dispara uma mistura concorrente de login, listagem, criação, atualização
+e exclusão. Ao final grava um relatório JSON com vazão e latências
+p50/p95/p99 por endpoint, para comparar versões, e remove os dados
+criados (a menos que --keep seja informado).
+
+Requer DATABASE_URL apontando para um Postgres local já migrado.
+
+Uso (no diretório backend/):
+    python run_tests.py --load --users 50 --tasks 200 --concurrency 32 --duration 60
+    python -m tests.load.harness --output load-report.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import httpx
+from sqlalchemy import delete, select
+
+from api.core.db_conection import AsyncSessionLocal, SessionLocal, async_engine
+from api.core.security import get_password_hash
+from api.models.refresh_token import TokenAtualizacao
+from api.models.task import Tarefa, StatusTarefa, PrioridadeTarefa
+from api.models.task_archive import TarefaArquivo
+from api.models.task_counter import ContadorTarefa
+from api.models.user import Usuario
+from api.repositories.task_counter import TaskCounterRepository
+from tests.factories.task_factory import TaskFactory
+from tests.factories.user_factory import UserFactory
+
+PASSWORD = "loadtest123"
+API = "/api/v1"
+DEFAULT_MIX = "login=5,list=50,create=20,update=15,delete=10"
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    weights = {}
+    for item in mix.split(","):
+        name, weight = item.split("=")
+        weights[name.strip()] = int(weight)
+    unknown = set(weights) - {"login", "list", "create", "update", "delete"}
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Operações desconhecidas: {', '.join(sorted(unknown))}")
+    return weights
+
+
+def seed(run_id: str, users: int, tasks: int) -> list[str]:
+    """Cria os usuários e tarefas com as factories e retorna os e-mails para login"""
+    senha = get_password_hash(PASSWORD)  # um bcrypt só para todos os usuários
+    emails = []
+    with SessionLocal() as db:
+        for i in range(users):
+            usuario = UserFactory(email=f"load-{run_id}-{i}@example.com", senha=senha)
+            db.add(usuario)
+            db.flush()
+            db.add_all([TaskFactory(usuario_id=usuario.id) for _ in range(tasks)])
+            emails.append(usuario.email)
+        db.commit()
+    return emails
+
+
+async def rebuild_counters(usuario_ids: list[uuid.UUID]) -> None:
+    async with AsyncSessionLocal() as db:
+        repository = TaskCounterRepository(db)
+        for usuario_id in usuario_ids:
+            await repository.rebuild(usuario_id)
+
+
+def cleanup(run_id: str) -> None:
+    with SessionLocal() as db:
+        ids = db.scalars(select(Usuario.id).where(Usuario.email.like(f"load-{run_id}-%"))).all()
+        if ids:
+            db.execute(delete(Tarefa).where(Tarefa.usuario_id.in_(ids)))
+            db.execute(delete(TarefaArquivo).where(TarefaArquivo.usuario_id.in_(ids)))
+            db.execute(delete(ContadorTarefa).where(ContadorTarefa.usuario_id.in_(ids)))
+            db.execute(delete(TokenAtualizacao).where(TokenAtualizacao.usuario_id.in_(ids)))
+            db.execute(delete(Usuario).where(Usuario.id.in_(ids)))
+        db.commit()
+
+
+def start_app(port: int, workers: int) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning",
+    ]
+    # Todos os clientes saem do mesmo IP; o limitador de login distorceria o resultado
+    env = {**os.environ, "LOGIN_THROTTLE_ENABLED": os.environ.get("LOGIN_THROTTLE_ENABLED", "false")}
+    return subprocess.Popen(command, env=env, cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+async def wait_ready(base_url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"A aplicação não respondeu em {timeout:.0f}s")
+
+
+class Recorder:
+    """Latências (s) e erros por endpoint"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, name: str, method: str, url: str, expected: int, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.latencies[name].append(time.perf_counter() - start)
+            self.errors[name] += 1
+            return None
+        self.latencies[name].append(time.perf_counter() - start)
+        if response.status_code != expected:
+            self.errors[name] += 1
+            return None
+        return response
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Percentil pelo método nearest-rank"""
+    index = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    endpoints = {}
+    for name, values in sorted(recorder.latencies.items()):
+        values = sorted(values)
+        endpoints[name] = {
+            "requests": len(values),
+            "errors": recorder.errors[name],
+            "throughput_rps": round(len(values) / elapsed, 2),
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2),
+        }
+    total = sum(item["requests"] for item in endpoints.values())
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "requests": total,
+        "errors": sum(recorder.errors.values()),
+        "throughput_rps": round(total / elapsed, 2),
+        "endpoints": endpoints,
+    }
+
+
+async def virtual_user(client: httpx.AsyncClient, recorder: Recorder, email: str, weights: dict[str, int], deadline: float, rng: random.Random):
+    headers = {}
+    task_ids: list[str] = []
+
+    async def login():
+        response = await recorder.call(
+            client, "POST /auth/login", "POST", f"{API}/auth/login", 200,
+            data={"username": email, "password": PASSWORD},
+        )
+        if response is not None:
+            headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+    await login()
+    operations, cumulative = list(weights), list(weights.values())
+    while time.monotonic() < deadline:
+        operation = rng.choices(operations, cumulative)[0]
+        if operation == "login" or "Authorization" not in headers:
+            await login()
+        elif operation == "list" or not task_ids:
+            response = await recorder.call(client, "GET /tarefas", "GET", f"{API}/tarefas/", 200, params={"limit": 50}, headers=headers)
+            if response is not None:
+                task_ids = [task["id"] for task in response.json()["data"]]
+        elif operation == "create":
+            task = {
+                "titulo": f"Carga {rng.randrange(1_000_000)}",
+                "descricao": "Criada pelo teste de carga",
+                "status": rng.choice(list(StatusTarefa)).value,
+                "prioridade": rng.choice(list(PrioridadeTarefa)).value,
+                "data_vencimento": datetime.now().isoformat(),
+            }
+            response = await recorder.call(client, "POST /tarefas", "POST", f"{API}/tarefas/", 201, json=task, headers=headers)
+            if response is not None:
+                task_ids.append(response.json()["data"][0]["id"])
+        elif operation == "update":
+            task_id = rng.choice(task_ids)
+            await recorder.call(
+                client, "PATCH /tarefas/{id}", "PATCH", f"{API}/tarefas/{task_id}", 200,
+                json={"status": rng.choice(list(StatusTarefa)).value}, headers=headers,
+            )
+        elif operation == "delete":
+            task_id = task_ids.pop(rng.randrange(len(task_ids)))
+            await recorder.call(client, "DELETE /tarefas/{id}", "DELETE", f"{API}/tarefas/{task_id}", 204, headers=headers)
+
+
+async def drive(base_url: str, emails: list[str], concurrency: int, duration: float, weights: dict[str, int], seed_value: int) -> dict:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        start = time.monotonic()
+        deadline = start + duration
+        await asyncio.gather(*(
+            virtual_user(client, recorder, emails[i % len(emails)], weights, deadline, random.Random(seed_value + i))
+            for i in range(concurrency)
+        ))
+        elapsed = time.monotonic() - start
+    return summarize(recorder, elapsed)
+
+
+def main(args: argparse.Namespace) -> int:
+    run_id = uuid.uuid4().hex[:8]
+    print(f"Populando {args.users} usuários × {args.tasks} tarefas (run {run_id})...", file=sys.stderr)
+    emails = seed(run_id, args.users, args.tasks)
+    with SessionLocal() as db:
+        usuario_ids = db.scalars(select(Usuario.id).where(Usuario.email.in_(emails))).all()
+    asyncio.run(rebuild_counters(usuario_ids))
+
+    server = None
+    base_url = args.base_url
+    try:
+        if base_url is None:
+            base_url = f"http://127.0.0.1:{args.port}"
+            server = start_app(args.port, args.workers)
+        asyncio.run(wait_ready(base_url))
+        print(f"Carga em {base_url}: {args.concurrency} clientes por {args.duration:.0f}s...", file=sys.stderr)
+        result = asyncio.run(drive(base_url, emails, args.concurrency, args.duration, args.mix, args.seed))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+        if not args.keep:
+            cleanup(run_id)
+        asyncio.run(async_engine.dispose())
+
+    report = {
+        "run_id": run_id,
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "users": args.users,
+            "tasks_per_user": args.tasks,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "workers": args.workers,
+            "mix": args.mix,
+            "seed": args.seed,
+        },
+        **result,
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    print(output)
+    return 0 if report["errors"] == 0 else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20, help="Usuários populados (N)")
+    parser.add_argument("--tasks", type=int, default=100, help="Tarefas por usuário (M)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Clientes simultâneos")
+    parser.add_argument("--duration", type=float, default=30, help="Duração da carga em segundos")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"Pesos das operações (padrão {DEFAULT_MIX})")
+    parser.add_argument("--workers", type=int, default=1, help="Workers do uvicorn")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--base-url", default=None, help="Usa uma instância já rodando em vez de subir o uvicorn")
+    parser.add_argument("--seed", type=int, default=42, help="Semente das escolhas aleatórias")
+    parser.add_argument("--output", default=None, help="Arquivo para gravar o relatório JSON")
+    parser.add_argument("--keep", action="store_true", help="Mantém os dados populados no banco")
+    return parser
+
+
+if __name__ == "__main__":
+    sys.exit(main(build_parser().parse_args()))
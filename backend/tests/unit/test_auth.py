@@ -5,6 +5,10 @@ from api.core.security import (
     authenticate_user
 )
 from tests.factories.user_factory import UserFactory
+import threading
+import pytest
+from api.core import hashing
+from api.core.exceptions import ExceptionTooManyRequests
 
 
 class TestAuthService:
@@ -79,4 +83,38 @@ class TestAuthService:
         # Try to authenticate with non-existent user
         authenticated_user = authenticate_user(db_session, "nonexistent@email.com", "anypassword")
         
-        assert authenticated_user is False 
\ No newline at end of file
+        assert authenticated_user is False
+
+
+class TestPasswordHashingPool:
+    """Test password hashing dispatched off the event loop."""
+    
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_in_pool(self):
+        """Test async hashing round-trips through the worker pool."""
+        hashed = await hashing.hash_password("testpassword123")
+        
+        assert await hashing.verify_and_update_password("testpassword123", hashed) == (True, None)
+        assert (await hashing.verify_and_update_password("wrongpassword", hashed))[0] is False
+    
+    @pytest.mark.asyncio
+    async def test_rejects_when_saturated(self, monkeypatch):
+        """Test the pool answers 429 instead of queueing without bound."""
+        slots = threading.BoundedSemaphore(1)
+        slots.acquire()
+        monkeypatch.setattr(hashing, "_slots", slots)
+        
+        with pytest.raises(ExceptionTooManyRequests) as exc_info:
+            await hashing.hash_password("testpassword123")
+        
+        assert exc_info.value.status_code == 429
+    
+    def test_outdated_hash_needs_update(self):
+        """Test hashes below the configured cost are flagged for rehash."""
+        outdated = hashing.pwd_context.hash("testpassword123", rounds=4)
+        
+        valid, new_hash = hashing.pwd_context.verify_and_update("testpassword123", outdated)
+        
+        assert valid is True
+        assert new_hash is not None
+        assert not hashing.pwd_context.needs_update(new_hash)
@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, insert, update
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from api.models.base import Base, naive, now
+from api.models.task import Tarefa
+from api.schemas.task import TaskCreate, TaskFilter
+
+
+def datetime_defaults():
+    for table in Base.metadata.sorted_tables:
+        for column in table.columns:
+            if not isinstance(column.type, DateTime):
+                continue
+            for default in (column.default, column.onupdate):
+                if default is not None and default.is_callable:
+                    yield f"{table.name}.{column.name}", default.arg(None)
+
+
+def test_model_datetime_defaults_are_naive():
+    values = dict(datetime_defaults())
+    assert "tarefa.created_at" in values and "usuario.updated_at" in values
+    assert all(value.tzinfo is None for value in values.values()), values
+
+
+def test_client_datetimes_are_stored_as_sao_paulo_wall_time():
+    task = TaskCreate(titulo="t", descricao="d", status="PENDENTE", prioridade="ALTA", data_vencimento="2026-03-01T12:00:00Z")
+    assert task.data_vencimento == datetime(2026, 3, 1, 9, 0)
+    assert TaskFilter(data_vencimento_ate="2026-03-01T12:00:00+00:00").data_vencimento_ate == datetime(2026, 3, 1, 9, 0)
+    assert naive(datetime(2026, 3, 1, 9, 0)) == datetime(2026, 3, 1, 9, 0)
+
+
+def test_asyncpg_statements_bind_naive_datetimes():
+    dialect = asyncpg.dialect()
+    task = TaskCreate(titulo="t", descricao="d", status="PENDENTE", prioridade="ALTA", data_vencimento="2026-03-01T12:00:00-03:00")
+    statements = [
+        insert(Tarefa).values(titulo=task.titulo, data_vencimento=task.data_vencimento, created_at=now()),
+        update(Tarefa).values(updated_at=now()).where(Tarefa.data_vencimento < now()),
+    ]
+    for stmt in statements:
+        params = stmt.compile(dialect=dialect).construct_params()
+        datetimes = [value for value in params.values() if isinstance(value, datetime)]
+        assert datetimes and all(value.tzinfo is None for value in datetimes), params
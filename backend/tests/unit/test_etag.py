@@ -0,0 +1,24 @@
+from api.core.etag import etag_matches, make_etag
+
+
+class TestETag:
+    """Test weak ETag generation and If-None-Match comparison."""
+    
+    def test_make_etag_is_weak_and_stable(self):
+        """Test the same parts always produce the same weak ETag."""
+        etag = make_etag("user", 3)
+        
+        assert etag.startswith('W/"') and etag.endswith('"')
+        assert make_etag("user", 3) == etag
+        assert make_etag("user", 4) != etag
+    
+    def test_etag_matches(self):
+        """Test weak comparison against single values, lists and wildcard."""
+        etag = make_etag("user", 3)
+        
+        assert etag_matches(etag, etag)
+        assert etag_matches(etag.removeprefix("W/"), etag)
+        assert etag_matches(f'W/"other", {etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches(None, etag)
+        assert not etag_matches('W/"other"', etag)
@@ -0,0 +1,35 @@
+import argparse
+
+import pytest
+
+from tests.load.harness import Recorder, parse_mix, percentile, summarize
+
+
+def test_percentile_nearest_rank():
+    values = [i / 1000 for i in range(1, 101)]
+    assert percentile(values, 50) == 0.05
+    assert percentile(values, 99) == 0.099
+    assert percentile([0.2], 95) == 0.2
+
+
+def test_summarize_per_endpoint():
+    recorder = Recorder()
+    recorder.latencies["GET /tarefas"] = [0.01, 0.02, 0.03, 0.04]
+    recorder.latencies["POST /tarefas"] = [0.05]
+    recorder.errors["POST /tarefas"] = 1
+
+    report = summarize(recorder, elapsed=2)
+
+    assert report["requests"] == 5
+    assert report["errors"] == 1
+    assert report["throughput_rps"] == 2.5
+    listing = report["endpoints"]["GET /tarefas"]
+    assert listing["throughput_rps"] == 2.0
+    assert listing["p50_ms"] == 20.0
+    assert listing["max_ms"] == 40.0
+
+
+def test_parse_mix_rejects_unknown_operation():
+    assert parse_mix("list=3,create=1") == {"list": 3, "create": 1}
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_mix("list=3,export=1")
@@ -0,0 +1,34 @@
+from api.core.metrics import Counter, Histogram, Registry
+
+
+class TestMetrics:
+    """Test the Prometheus text rendering of counters and histograms."""
+    
+    def test_histogram_buckets_are_cumulative(self):
+        """Test observations land in the first bucket >= value and render cumulatively."""
+        histogram = Histogram("latency_seconds", "Latência.", ("route",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, ("/a",))
+        histogram.observe(0.1, ("/a",))
+        histogram.observe(0.5, ("/a",))
+        histogram.observe(3, ("/a",))
+        
+        lines = list(histogram.render())
+        
+        assert '# TYPE latency_seconds histogram' in lines
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{route="/a",le="1.0"} 3' in lines
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+        assert 'latency_seconds_count{route="/a"} 4' in lines
+        assert histogram.sum(("/a",)) == 3.65
+    
+    def test_registry_renders_counters(self):
+        """Test counters render with escaped labels and a trailing newline."""
+        registry = Registry()
+        counter = registry.register(Counter("requests_total", "Requisições.", ("route",)))
+        counter.inc(('/a"b',))
+        counter.inc(('/a"b',), amount=2)
+        
+        output = registry.render()
+        
+        assert 'requests_total{route="/a\\"b"} 3' in output
+        assert output.endswith("\n")
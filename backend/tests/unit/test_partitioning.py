@@ -0,0 +1,84 @@
+from datetime import date
+
+from sqlalchemy import Column, MetaData, Table
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from api.core import partitioning
+from api.models.task import SEARCH_OBJECTS, Tarefa, partition_table_args
+
+
+def test_hash_table_keys_on_usuario_id():
+    sql = partitioning.create_table_sql("hash")
+    assert "CONSTRAINT tarefa_particionada_pkey PRIMARY KEY (id, usuario_id)" in sql
+    assert sql.rstrip().endswith("PARTITION BY HASH (usuario_id)")
+    assert partitioning.hash_partitions_sql(4)[3] == (
+        "CREATE TABLE IF NOT EXISTS tarefa_particionada_p3 PARTITION OF tarefa_particionada "
+        "FOR VALUES WITH (MODULUS 4, REMAINDER 3)"
+    )
+
+
+def test_staging_table_has_every_model_column_plus_search():
+    sql = partitioning.create_table_sql("range")
+    for name in partitioning.COLUMNS:
+        assert f"\n    {name} " in sql
+    assert "busca tsvector GENERATED ALWAYS AS" in sql
+    assert "PARTITION BY RANGE (created_at)" in sql
+
+
+def test_range_partitions_are_monthly_with_default():
+    statements = partitioning.range_partitions_sql(date(2025, 11, 17), date(2026, 1, 1))
+    assert statements == [
+        "CREATE TABLE IF NOT EXISTS tarefa_particionada_2025_11 PARTITION OF tarefa_particionada "
+        "FOR VALUES FROM ('2025-11-01') TO ('2025-12-01')",
+        "CREATE TABLE IF NOT EXISTS tarefa_particionada_2025_12 PARTITION OF tarefa_particionada "
+        "FOR VALUES FROM ('2025-12-01') TO ('2026-01-01')",
+        "CREATE TABLE IF NOT EXISTS tarefa_particionada_2026_01 PARTITION OF tarefa_particionada "
+        "FOR VALUES FROM ('2026-01-01') TO ('2026-02-01')",
+        "CREATE TABLE IF NOT EXISTS tarefa_particionada_padrao PARTITION OF tarefa_particionada DEFAULT",
+    ]
+    assert partitioning.months_ahead_of(date(2026, 11, 30), 3) == date(2027, 2, 1)
+
+
+def test_indexes_cover_model_and_search_indexes():
+    model_indexes = {index.name for index in Tarefa.__table__.indexes}
+    search_indexes = {name for name in SEARCH_OBJECTS if name.startswith("ix_")}
+    assert set(partitioning.INDEXES) == model_indexes | search_indexes
+    assert partitioning.indexes_sql()[0].startswith(
+        "CREATE INDEX IF NOT EXISTS ix_tarefa_particionada_usuario_created_at ON tarefa_particionada "
+    )
+
+
+def test_renamed_objects_follow_the_table():
+    assert partitioning.renamed("ix_tarefa_usuario_busca", "tarefa_legado") == "ix_tarefa_legado_usuario_busca"
+    assert partitioning.renamed("tarefa_pkey", "tarefa_legado") == "tarefa_legado_pkey"
+    assert partitioning.PARTITION_OBJECTS.match("tarefa_p3")
+    assert partitioning.PARTITION_OBJECTS.match("tarefa_2026_01")
+    assert partitioning.PARTITION_OBJECTS.match("ix_tarefa_legado_usuario_busca") is None
+    assert partitioning.PARTITION_OBJECTS.match("tarefa_legado_pkey")
+    assert partitioning.PARTITION_OBJECTS.match("tarefa_arquivo") is None
+    assert partitioning.PARTITION_OBJECTS.match("tarefa_contador") is None
+
+
+def test_mirror_moves_rows_when_the_partition_key_changes():
+    function, trigger = partitioning.mirror_sql("tarefa", "tarefa_particionada", "created_at", "id, created_at")
+    assert "OLD.created_at IS DISTINCT FROM NEW.created_at" in function
+    assert "ON CONFLICT (id, created_at) DO UPDATE SET titulo = EXCLUDED.titulo" in function
+    assert "created_at = EXCLUDED" not in function
+    assert trigger.startswith("CREATE OR REPLACE TRIGGER tarefa_particionada_espelho AFTER INSERT OR UPDATE OR DELETE ON tarefa ")
+
+
+def test_partition_table_args_put_the_key_in_the_primary_key():
+    def ddl(strategy):
+        metadata = MetaData()
+        columns = [Column(column.name, column.type, primary_key=column.name in ("id", partitioning.PARTITION_KEYS.get(strategy)))
+                   for column in Tarefa.__table__.columns]
+        constraint, options = partition_table_args(strategy)
+        table = Table("tarefa", metadata, *columns, constraint, **options)
+        return str(CreateTable(table).compile(dialect=postgresql.dialect()))
+
+    assert partition_table_args("") == ()
+    assert "PRIMARY KEY (id, usuario_id)" in ddl("hash")
+    assert "PARTITION BY HASH (usuario_id)" in ddl("hash")
+    assert "PRIMARY KEY (id, created_at)" in ddl("range")
+    assert "PARTITION BY RANGE (created_at)" in ddl("range")
@@ -0,0 +1,68 @@
+import logging
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+
+from api.core.pool import instrumented_pool_class, pool_sizing, pool_status
+
+
+class TestPoolSizing:
+    """Test the per-worker split of the connection budget."""
+    
+    def test_budget_is_split_between_workers(self):
+        """Test eight workers share the budget instead of each taking the full pool."""
+        assert pool_sizing(50, 1) == {"pool_size": 25, "max_overflow": 25}
+        assert pool_sizing(50, 8) == {"pool_size": 3, "max_overflow": 3}
+        assert pool_sizing(4, 16) == {"pool_size": 1, "max_overflow": 0}
+    
+    def test_explicit_values_win(self):
+        """Test DB_POOL_SIZE / DB_MAX_OVERFLOW override the derived sizing."""
+        assert pool_sizing(50, 8, pool_size=5) == {"pool_size": 5, "max_overflow": 1}
+        assert pool_sizing(50, 8, max_overflow=0) == {"pool_size": 3, "max_overflow": 0}
+
+
+class TestInstrumentedPool:
+    """Test checkout statistics and warnings of the instrumented pool."""
+    
+    @pytest.fixture
+    def engine(self):
+        engine = create_engine(
+            "sqlite://",
+            poolclass=instrumented_pool_class(QueuePool, "teste", slow_checkout_seconds=0.01),
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        yield engine
+        engine.dispose()
+    
+    def test_records_checkouts(self, engine):
+        """Test each checkout is counted and the live counters are exposed."""
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            status = pool_status(engine.pool)
+            assert status["checked_out"] == 1
+        
+        status = pool_status(engine.pool)
+        assert status["checkouts"] == 1
+        assert status["checked_out"] == 0
+        assert status["size"] == 1
+    
+    def test_timeout_is_counted_and_logged(self, engine, caplog):
+        """Test a starved checkout fails fast, increments timeouts and logs a warning."""
+        with engine.connect():
+            with caplog.at_level(logging.WARNING, logger="api.core.pool"):
+                with pytest.raises(exc.TimeoutError):
+                    engine.connect()
+        
+        assert pool_status(engine.pool)["timeouts"] == 1
+        assert "estourou o timeout" in caplog.text
+    
+    def test_stats_survive_dispose(self, engine):
+        """Test the statistics live on the pool class, so dispose() does not reset them."""
+        with engine.connect():
+            pass
+        engine.dispose()
+        
+        assert pool_status(engine.pool)["checkouts"] == 1
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from api.core.replicas import ReplicaRouter, RoutingSession, connect_replica
+from api.models.user import Usuario
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def engines(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path}/primary.db")
+    replicas = [create_engine(f"sqlite:///{tmp_path}/replica{i}.db") for i in range(2)]
+    yield primary, replicas
+    for engine in [primary, *replicas]:
+        engine.dispose()
+
+
+class TestReplicaRouter:
+    """Test round-robin selection and health-based failover."""
+    
+    def test_round_robin_skips_unhealthy(self, engines):
+        """Test replicas alternate, a failed one leaves the rotation and returns after the retry window."""
+        primary, replicas = engines
+        timer = FakeTimer()
+        router = ReplicaRouter(primary, replicas, retry_seconds=30, timer=timer)
+        
+        assert [router.choose() for _ in range(4)] == [replicas[0], replicas[1], replicas[0], replicas[1]]
+        
+        router.mark_down(replicas[0])
+        assert {router.choose() for _ in range(4)} == {replicas[1]}
+        
+        router.mark_down(replicas[1])
+        assert router.choose() is primary
+        
+        timer.now = 31
+        assert router.choose() in replicas
+        assert router.healthy(replicas[0]) and router.healthy(replicas[1])
+
+
+class TestRoutingSession:
+    """Test which engine each statement of a session is sent to."""
+    
+    def make_session(self, engines):
+        primary, replicas = engines
+        return RoutingSession(router=ReplicaRouter(primary, replicas[:1], retry_seconds=30))
+    
+    def test_reads_use_one_replica(self, engines):
+        """Test plain SELECTs go to the replica chosen once for the session."""
+        primary, replicas = engines
+        session = self.make_session(engines)
+        
+        assert session.get_bind(clause=select(Usuario)) is replicas[0]
+        assert session.get_bind(clause=text("SELECT 1")) is replicas[0]
+    
+    def test_writes_pin_session_to_primary(self, engines):
+        """Test a write sends it and every later read of the session to the primary."""
+        primary, replicas = engines
+        session = self.make_session(engines)
+        
+        assert session.get_bind(clause=select(Usuario)) is replicas[0]
+        assert session.get_bind(clause=Usuario.__table__.update().values(nome="x")) is primary
+        assert session.get_bind(clause=select(Usuario)) is primary
+    
+    def test_select_for_update_uses_primary(self, engines):
+        """Test row locks are never taken on a replica."""
+        primary, _ = engines
+        session = self.make_session(engines)
+        
+        assert session.get_bind(clause=select(Usuario).with_for_update()) is primary
+
+
+def test_connect_replica_fails_over(tmp_path):
+    """Test a replica that refuses connections is marked down and the next one is used."""
+    async def scenario():
+        primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/primary.db")
+        broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/replica.db")
+        healthy = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/replica.db")
+        router = ReplicaRouter(primary.sync_engine, [broken.sync_engine, healthy.sync_engine], retry_seconds=30)
+        factory = async_sessionmaker(class_=AsyncSession, sync_session_class=RoutingSession, router=router)
+        try:
+            async with factory() as session:
+                await connect_replica(session)
+                assert session.sync_session.replica is healthy.sync_engine
+                assert (await session.execute(text("SELECT 1"))).scalar() == 1
+            assert not router.healthy(broken.sync_engine)
+        finally:
+            for engine in (primary, broken, healthy):
+                await engine.dispose()
+    
+    asyncio.run(scenario())
@@ -0,0 +1,29 @@
+import re
+import uuid
+
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from api.models.task import StatusTarefa, Tarefa
+from api.repositories.task import TaskRepository
+
+
+def postgres_sql(stmt) -> str:
+    return re.sub(r"\s+", " ", str(stmt.compile(dialect=asyncpg.dialect())))
+
+
+def test_postgres_status_update_locks_and_returns_previous_status():
+    repository = TaskRepository(None)
+    usuario_id, task_id = uuid.uuid4(), uuid.uuid4()
+    stmt = update(Tarefa).values(status=StatusTarefa.CONCLUIDA)
+    sql = postgres_sql(repository._status_update_stmt(stmt, usuario_id, repository._task_where(task_id, usuario_id)))
+
+    assert sql.startswith("UPDATE tarefa SET status=$1::status_tarefa")
+    # The subquery locks the selected rows and carries their status before the update
+    assert (
+        "FROM (SELECT tarefa.id AS id, tarefa.status AS status_anterior FROM tarefa "
+        "WHERE tarefa.id = $3::UUID AND tarefa.usuario_id = $4::UUID AND tarefa.flg_excluido = false FOR UPDATE) AS anterior"
+    ) in sql
+    # usuario_id repeated on the outer UPDATE so hash partitions can be pruned
+    assert "WHERE tarefa.id = anterior.id AND tarefa.usuario_id = $5::UUID RETURNING " in sql
+    assert sql.endswith(", anterior.status_anterior")
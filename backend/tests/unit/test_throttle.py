@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from api.core import throttle
+from api.core.settings import Settings
+from api.core.throttle import MemoryBuckets, login_buckets_for
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestMemoryBuckets:
+    """Test the in-process token buckets used by the login throttle."""
+    
+    def test_burst_then_refill(self):
+        """Test the bucket allows its burst, then one attempt per refill interval."""
+        timer = FakeTimer()
+        buckets = MemoryBuckets(timer=timer)
+        bucket = [("user:a", 1 / 12, 5)]  # 5 por minuto
+        
+        assert [asyncio.run(buckets.hit(bucket)) for _ in range(5)] == [0.0] * 5
+        assert asyncio.run(buckets.hit(bucket)) == 12.0
+        
+        timer.now = 12
+        assert asyncio.run(buckets.hit(bucket)) == 0.0
+        assert asyncio.run(buckets.hit(bucket)) > 0
+    
+    def test_rejected_attempt_consumes_nothing(self):
+        """Test a hit is all-or-nothing across the buckets it touches."""
+        timer = FakeTimer()
+        buckets = MemoryBuckets(timer=timer)
+        ip, user = ("ip:1", 1.0, 3), ("user:a", 1.0, 1)
+        
+        assert asyncio.run(buckets.hit([ip, user])) == 0.0
+        assert asyncio.run(buckets.hit([ip, user])) > 0
+        assert asyncio.run(buckets.hit([ip, ("user:b", 1.0, 1)])) == 0.0
+        assert asyncio.run(buckets.hit([ip, ("user:c", 1.0, 1)])) == 0.0
+        assert asyncio.run(buckets.hit([ip, ("user:d", 1.0, 1)])) > 0
+    
+    def test_keys_are_bounded(self):
+        """Test the least recently used keys are evicted past maxsize."""
+        buckets = MemoryBuckets(maxsize=2, timer=FakeTimer())
+        for key in ("a", "b", "c"):
+            asyncio.run(buckets.hit([(key, 1.0, 1)]))
+        
+        assert len(buckets) == 2
+
+
+def test_login_buckets_normalize_username():
+    """Test the per-user bucket ignores case and surrounding spaces."""
+    assert login_buckets_for(" Fulano@Example.com", "10.0.0.1")[1][0] == "user:fulano@example.com"
+
+
+def test_account_bucket_is_shared_across_ips(monkeypatch):
+    """Test attempts against one account from many IPs drain the same per-user bucket."""
+    monkeypatch.setattr(throttle.settings, "LOGIN_ATTEMPTS_PER_MINUTE_PER_USER", 2)
+    buckets = MemoryBuckets(timer=FakeTimer())
+    
+    waits = [asyncio.run(buckets.hit(login_buckets_for("fulano@example.com", f"10.0.0.{i}"))) for i in range(3)]
+    
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] > 0
+
+
+def test_zero_login_rate_is_rejected_at_startup(monkeypatch):
+    """Test a zero rate fails settings validation instead of dividing by zero on login."""
+    monkeypatch.setenv("LOGIN_ATTEMPTS_PER_MINUTE_PER_USER", "0")
+    with pytest.raises(ValidationError):
+        Settings()
@@ -0,0 +1,63 @@
+import uuid
+
+from api.core.cache import TTLCache, invalidate_user, user_cache
+from api.schemas.usuario import UsuarioRead
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    """Test the bounded TTL/LRU cache used for authenticated users."""
+    
+    def test_get_returns_cached_value(self):
+        """Test a value is returned while it is fresh."""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1)
+        
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+    
+    def test_entries_expire_after_ttl(self):
+        """Test entries are dropped once the TTL has elapsed."""
+        timer = FakeTimer()
+        cache = TTLCache(maxsize=10, ttl=60, timer=timer)
+        cache.set("a", 1)
+        
+        timer.now = 59
+        assert cache.get("a") == 1
+        
+        timer.now = 60
+        assert cache.get("a") is None
+        assert len(cache) == 0
+    
+    def test_least_recently_used_is_evicted(self):
+        """Test the cache never grows beyond maxsize."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+    
+    def test_invalidate_user(self):
+        """Test invalidate_user drops every entry of the given user."""
+        user_id = uuid.uuid4()
+        other_id = uuid.uuid4()
+        user_cache.set("user@example.com", UsuarioRead(id=user_id, nome="User", email="user@example.com"))
+        user_cache.set("other@example.com", UsuarioRead(id=other_id, nome="Other", email="other@example.com"))
+        
+        invalidate_user(str(user_id))
+        
+        assert user_cache.get("user@example.com") is None
+        assert user_cache.get("other@example.com") is not None
+        user_cache.clear()
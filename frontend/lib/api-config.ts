@@ -5,6 +5,7 @@ export const API_ENDPOINTS = {
     REGISTER: '/api/v1/auth/register',
     LOGIN: '/api/v1/auth/login',
     REFRESH: '/api/v1/auth/refresh',
+    LOGOUT: '/api/v1/auth/logout',
     ME: '/api/v1/auth/me',
   },
   TASKS: {
@@ -4,6 +4,7 @@ import { ApiError } from './api-errors'
 interface TokenResponse {
   access_token: string
   token_type: string
+  refresh_token?: string
 }
 
 interface ApiUser {
@@ -79,15 +80,19 @@ class AuthAPI {
     return this.getStoredToken()
   }
 
-  private setStoredToken(token: string): void {
+  private setStoredToken(token: string, refreshToken?: string): void {
     if (typeof window !== 'undefined') {
       localStorage.setItem('access_token', token)
+      if (refreshToken) {
+        localStorage.setItem('refresh_token', refreshToken)
+      }
     }
   }
 
   private removeStoredToken(): void {
     if (typeof window !== 'undefined') {
       localStorage.removeItem('access_token')
+      localStorage.removeItem('refresh_token')
     }
   }
 
@@ -101,7 +106,7 @@ class AuthAPI {
       body: formData,
     })
 
-    this.setStoredToken(token.access_token)
+    this.setStoredToken(token.access_token, token.refresh_token)
 
     // Buscar dados do usuário logado
     const user = await this.getCurrentUser()
@@ -136,11 +141,13 @@ class AuthAPI {
 
   async refreshToken(): Promise<void> {
     try {
+      // O refresh token vale uma vez: a resposta traz o próximo
+      const refreshToken = typeof window !== 'undefined' ? localStorage.getItem('refresh_token') : null
       const response = await this.request<TokenResponse>(
         API_ENDPOINTS.AUTH.REFRESH,
-        { method: 'POST' }
+        { method: 'POST', body: JSON.stringify({ refresh_token: refreshToken }) }
       )
-      this.setStoredToken(response.access_token)
+      this.setStoredToken(response.access_token, response.refresh_token)
     } catch (error) {
       this.logout()
       throw error
@@ -148,6 +155,10 @@ class AuthAPI {
   }
 
   logout(): void {
+    // Revoga os refresh tokens no servidor sem bloquear a saída local
+    if (this.getStoredToken()) {
+      this.request<void>(API_ENDPOINTS.AUTH.LOGOUT, { method: 'POST' }).catch(() => {})
+    }
     this.removeStoredToken()
   }
 